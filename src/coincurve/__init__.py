@@ -1,12 +1,20 @@
-from coincurve.context import GLOBAL_CONTEXT, Context
-from coincurve.keys import PrivateKey, PublicKey, PublicKeyXOnly
-from coincurve.utils import verify_signature
+from coincurve.context import GLOBAL_CONTEXT, Context, ContextPool
+from coincurve.ecdsa import Signature
+from coincurve.keys import PrivateKey, PublicKey, PublicKeyArray, PublicKeyXOnly
+from coincurve.signer import Signer
+from coincurve.utils import recover_many, verify_signature, verify_signatures_batch
 
 __all__ = [
     'GLOBAL_CONTEXT',
     'Context',
+    'ContextPool',
     'PrivateKey',
     'PublicKey',
+    'PublicKeyArray',
     'PublicKeyXOnly',
+    'Signature',
+    'Signer',
+    'recover_many',
     'verify_signature',
+    'verify_signatures_batch',
 ]
@@ -0,0 +1,356 @@
+import asyncio
+import os
+from collections import deque
+from time import perf_counter
+from typing import Dict, Optional
+from weakref import WeakKeyDictionary
+
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.keys import PrivateKey, PublicKey
+from coincurve.types import Hasher
+from coincurve.utils import sha256, verify_signature
+
+DEFAULT_LATENCY_BUDGET = 0.005
+DEFAULT_MAX_BATCH_SIZE = 1024
+INITIAL_BATCH_SIZE = 16
+# Weight given to the latest batch when updating the per-item cost estimate
+COST_SMOOTHING = 0.2
+
+
+def _batch(operation):
+    def run(items):
+        results = []
+        for args in items:
+            try:
+                results.append(operation(*args))
+            except Exception as e:
+                results.append(e)
+
+        return results
+
+    return run
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        func,
+        latency_budget: float = DEFAULT_LATENCY_BUDGET,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_concurrency: Optional[int] = None,
+        executor=None,
+    ):
+        """
+        Collect concurrent requests into batches that run off the event loop.
+
+        Requests submitted during the same iteration of the event loop, or while all batch
+        slots are busy, are grouped together. The batch size adapts so that the estimated
+        execution time of a batch stays within `latency_budget`.
+
+        :param func: A callable that takes a list of argument tuples and returns a list with one
+                     result per item, where exceptions are returned rather than raised.
+        :param latency_budget: The target execution time of a single batch, in seconds.
+        :param max_batch_size: The maximum number of requests in a single batch.
+        :param max_concurrency: The maximum number of batches running at the same time.
+                                By default, the number of CPUs is used.
+        :param executor: The executor that runs the batches. By default, the event
+                         loop's default executor is used.
+        """
+        if latency_budget <= 0:
+            raise ValueError('Latency budget must be positive.')
+        if max_batch_size < 1:
+            raise ValueError('Maximum batch size must be at least 1.')
+
+        self.func = func
+        self.latency_budget = latency_budget
+        self.max_batch_size = max_batch_size
+        self.max_concurrency: int = max_concurrency or os.cpu_count() or 1
+        self.executor = executor
+
+        self.batch_size = min(INITIAL_BATCH_SIZE, max_batch_size)
+        self.batches = 0
+        self.items = 0
+        self.last_batch_size = 0
+        self.item_cost: Optional[float] = None
+
+        self._pending: deque = deque()
+        self._in_flight = 0
+        self._scheduled = False
+        # The event loop only keeps weak references to tasks, so running batches must be kept alive here
+        self._tasks: set = set()
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        :return: The number of requests waiting for a batch.
+        """
+        return len(self._pending)
+
+    @property
+    def mean_batch_size(self) -> float:
+        """
+        :return: The average number of requests per batch so far.
+        """
+        return self.items / self.batches if self.batches else 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        :return: A snapshot of the queue depth and batch size metrics.
+        """
+        return {
+            'queue_depth': self.queue_depth,
+            'in_flight': self._in_flight,
+            'batch_size': self.batch_size,
+            'last_batch_size': self.last_batch_size,
+            'mean_batch_size': self.mean_batch_size,
+            'batches': self.batches,
+            'items': self.items,
+        }
+
+    async def submit(self, *args):
+        """
+        Queue a request and wait for its result.
+
+        :param args: The arguments of the request.
+        :return: The result of the request.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch, loop)
+
+        return await future
+
+    def _dispatch(self, loop):
+        self._scheduled = False
+
+        pending = self._pending
+        while pending and self._in_flight < self.max_concurrency:
+            batch = []
+            while pending and len(batch) < self.batch_size:
+                item = pending.popleft()
+                # The caller may have been cancelled while the request was queued
+                if not item[1].done():
+                    batch.append(item)
+
+            if not batch:
+                break
+
+            self._in_flight += 1
+            task = loop.create_task(self._run(loop, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _record(self, size: int, elapsed: float):
+        self.batches += 1
+        self.items += size
+        self.last_batch_size = size
+
+        cost = elapsed / size
+        self.item_cost = cost if self.item_cost is None else self.item_cost + COST_SMOOTHING * (cost - self.item_cost)
+        if self.item_cost > 0:
+            self.batch_size = max(1, min(self.max_batch_size, int(self.latency_budget / self.item_cost)))
+
+    async def _run(self, loop, batch):
+        try:
+            await self._run_batch(loop, batch)
+        finally:
+            self._in_flight -= 1
+
+            # Even if this batch was cancelled, the requests queued behind it are still waiting
+            if self._pending:
+                self._dispatch(loop)
+
+    async def _run_batch(self, loop, batch):
+        start = perf_counter()
+        try:
+            results = await loop.run_in_executor(self.executor, self.func, [args for args, _ in batch])
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+
+        self._record(len(batch), perf_counter() - start)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class AsyncEngine:
+    def __init__(
+        self,
+        latency_budget: float = DEFAULT_LATENCY_BUDGET,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_concurrency: Optional[int] = None,
+        executor=None,
+        context: Context = GLOBAL_CONTEXT,
+    ):
+        """
+        Awaitable operations that are micro-batched and run off the event loop.
+        Every kind of operation has its own `MicroBatcher`.
+
+        :param latency_budget: The target execution time of a single batch, in seconds.
+        :param max_batch_size: The maximum number of requests in a single batch.
+        :param max_concurrency: The maximum number of batches of each operation running at the same time.
+        :param executor: The executor that runs the batches. By default, the event
+                         loop's default executor is used.
+        :param context:
+        """
+        self.context = context
+
+        def batcher(operation):
+            return MicroBatcher(_batch(operation), latency_budget, max_batch_size, max_concurrency, executor)
+
+        self._verify = batcher(self._verify_one)
+        self._sign = batcher(PrivateKey.sign)
+        self._sign_schnorr = batcher(PrivateKey.sign_schnorr)
+        self._recover = batcher(self._recover_one)
+        self._ecdh = batcher(PrivateKey.ecdh)
+
+    def _verify_one(self, signature: bytes, message: bytes, public_key, hasher: Hasher) -> bool:
+        if isinstance(public_key, PublicKey):
+            return public_key.verify(signature, message, hasher)
+
+        return verify_signature(signature, message, public_key, hasher, self.context)
+
+    def _recover_one(self, signature: bytes, message: bytes, hasher: Hasher) -> PublicKey:
+        return PublicKey.from_signature_and_message(signature, message, hasher, self.context)
+
+    async def verify(self, signature: bytes, message: bytes, public_key, hasher: Hasher = sha256) -> bool:
+        """
+        :param signature: The DER-encoded ECDSA signature, or a `Signature` object.
+        :param message: The message that was supposedly signed.
+        :param public_key: The formatted public key or a `PublicKey` object.
+        :type public_key: bytes | PublicKey
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: A boolean indicating whether or not the signature is correct.
+        :raises ValueError: If the public key could not be parsed or was invalid, the message hash was
+                            not 32 bytes long, or the DER-encoded signature could not be parsed.
+        """
+        return await self._verify.submit(signature, message, public_key, hasher)
+
+    async def sign(self, private_key: PrivateKey, message: bytes, hasher: Hasher = sha256) -> bytes:
+        """
+        Create an ECDSA signature.
+
+        :param private_key: The private key with which to sign.
+        :param message: The message to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The ECDSA signature.
+        :raises ValueError: If the message hash was not 32 bytes long, the nonce generation
+                            function failed, or the private key was invalid.
+        """
+        return await self._sign.submit(private_key, message, hasher)
+
+    async def sign_schnorr(self, private_key: PrivateKey, message: bytes, aux_randomness: bytes = b'') -> bytes:
+        """
+        Create a Schnorr signature.
+
+        :param private_key: The private key with which to sign.
+        :param message: The message to sign.
+        :param aux_randomness: An optional 32 bytes of fresh randomness. By default (empty bytestring), this
+                               will be generated automatically. Set to `None` to disable this behavior.
+        :return: The Schnorr signature.
+        :raises ValueError: If the message was not 32 bytes long, the optional auxiliary random data was not
+                            32 bytes long, signing failed, or the signature was invalid.
+        """
+        return await self._sign_schnorr.submit(private_key, message, aux_randomness)
+
+    async def recover(self, signature: bytes, message: bytes, hasher: Hasher = sha256) -> PublicKey:
+        """
+        Recover an ECDSA public key from a recoverable signature.
+
+        :param signature: The recoverable ECDSA signature.
+        :param message: The message that was supposedly signed.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The public key that signed the message.
+        :raises ValueError: If the message hash was not 32 bytes long or recovery of the ECDSA public key failed.
+        """
+        return await self._recover.submit(signature, message, hasher)
+
+    async def ecdh(self, private_key: PrivateKey, public_key: bytes) -> bytes:
+        """
+        Compute an EC Diffie-Hellman secret in constant time.
+
+        :param private_key: The private key.
+        :param public_key: The formatted public key.
+        :return: The 32 byte shared secret.
+        :raises ValueError: If the public key could not be parsed or was invalid.
+        """
+        return await self._ecdh.submit(private_key, public_key)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        :return: A snapshot of the queue depth and batch size metrics of every operation.
+        """
+        return {
+            'verify': self._verify.metrics(),
+            'sign': self._sign.metrics(),
+            'sign_schnorr': self._sign_schnorr.metrics(),
+            'recover': self._recover.metrics(),
+            'ecdh': self._ecdh.metrics(),
+        }
+
+
+_engines: 'WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncEngine]' = WeakKeyDictionary()
+
+
+def get_engine() -> AsyncEngine:
+    """
+    :return: The default engine of the running event loop, which is created on first use.
+    """
+    loop = asyncio.get_running_loop()
+    engine = _engines.get(loop)
+    if engine is None:
+        engine = _engines[loop] = AsyncEngine()
+
+    return engine
+
+
+async def verify(signature: bytes, message: bytes, public_key, hasher: Hasher = sha256) -> bool:
+    """
+    Verify an ECDSA signature with the default engine. Refer to `AsyncEngine.verify`.
+    """
+    return await get_engine().verify(signature, message, public_key, hasher)
+
+
+async def sign(private_key: PrivateKey, message: bytes, hasher: Hasher = sha256) -> bytes:
+    """
+    Create an ECDSA signature with the default engine. Refer to `AsyncEngine.sign`.
+    """
+    return await get_engine().sign(private_key, message, hasher)
+
+
+async def sign_schnorr(private_key: PrivateKey, message: bytes, aux_randomness: bytes = b'') -> bytes:
+    """
+    Create a Schnorr signature with the default engine. Refer to `AsyncEngine.sign_schnorr`.
+    """
+    return await get_engine().sign_schnorr(private_key, message, aux_randomness)
+
+
+async def recover(signature: bytes, message: bytes, hasher: Hasher = sha256) -> PublicKey:
+    """
+    Recover an ECDSA public key with the default engine. Refer to `AsyncEngine.recover`.
+    """
+    return await get_engine().recover(signature, message, hasher)
+
+
+async def ecdh(private_key: PrivateKey, public_key: bytes) -> bytes:
+    """
+    Compute an EC Diffie-Hellman secret with the default engine. Refer to `AsyncEngine.ecdh`.
+    """
+    return await get_engine().ecdh(private_key, public_key)
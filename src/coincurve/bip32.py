@@ -0,0 +1,618 @@
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Sequence, Tuple, Union
+
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.flags import EC_COMPRESSED
+from coincurve.keys import PublicKey
+from coincurve.utils import sha256d, validate_secret
+
+from ._libsecp256k1 import ffi, lib
+
+HARDENED = 0x80000000
+DEFAULT_CACHE_SIZE = 1024
+
+MAINNET_PRIVATE = bytes.fromhex('0488ade4')
+MAINNET_PUBLIC = bytes.fromhex('0488b21e')
+TESTNET_PRIVATE = bytes.fromhex('04358394')
+TESTNET_PUBLIC = bytes.fromhex('043587cf')
+# Version bytes -> (private, testnet)
+VERSIONS = {
+    MAINNET_PRIVATE: (True, False),
+    MAINNET_PUBLIC: (False, False),
+    TESTNET_PRIVATE: (True, True),
+    TESTNET_PUBLIC: (False, True),
+}
+SERIALIZED_LENGTH = 78
+
+BASE58_ALPHABET = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+BASE58_INDEX = {char: i for i, char in enumerate(BASE58_ALPHABET)}
+
+Path = Union[str, Sequence[int]]
+
+
+def b58encode_check(data: bytes) -> str:
+    """
+    :param data: The data to encode.
+    :return: The Base58Check encoding of the data.
+    """
+    data += sha256d(data)[:4]
+    num = int.from_bytes(data, 'big')
+
+    encoded = bytearray()
+    while num:
+        num, remainder = divmod(num, 58)
+        encoded.append(BASE58_ALPHABET[remainder])
+
+    pad = len(data) - len(data.lstrip(b'\x00'))
+    return (BASE58_ALPHABET[:1] * pad + encoded[::-1]).decode('ascii')
+
+
+def b58decode_check(encoded: str) -> bytes:
+    """
+    :param encoded: The Base58Check encoded string.
+    :return: The decoded data, without the checksum.
+    :raises ValueError: If the string contained invalid characters or the checksum did not match.
+    """
+    num = 0
+    for char in encoded.encode('ascii'):
+        if char not in BASE58_INDEX:
+            raise ValueError(f'Invalid Base58 character: {chr(char)!r}')
+        num = num * 58 + BASE58_INDEX[char]
+
+    pad = len(encoded) - len(encoded.lstrip('1'))
+    data = b'\x00' * pad + num.to_bytes((num.bit_length() + 7) // 8, 'big')
+    if len(data) < 4 or sha256d(data[:-4])[:4] != data[-4:]:
+        raise ValueError('Invalid Base58Check checksum.')
+
+    return data[:-4]
+
+
+# Some OpenSSL builds no longer provide RIPEMD-160, which is only needed for key fingerprints
+_RIPEMD160_LEFT = (
+    tuple(range(16)),
+    (7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8),
+    (3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12),
+    (1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2),
+    (4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13),
+)
+_RIPEMD160_RIGHT = (
+    (5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12),
+    (6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2),
+    (15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13),
+    (8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14),
+    (12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11),
+)
+_RIPEMD160_LEFT_SHIFTS = (
+    (11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8),
+    (7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12),
+    (11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5),
+    (11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12),
+    (9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6),
+)
+_RIPEMD160_RIGHT_SHIFTS = (
+    (8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6),
+    (9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11),
+    (9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5),
+    (15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8),
+    (8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11),
+)
+_RIPEMD160_LEFT_CONSTANTS = (0, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+_RIPEMD160_RIGHT_CONSTANTS = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0)
+
+
+def _ripemd160_function(round_number: int, x: int, y: int, z: int) -> int:
+    if round_number == 0:
+        return x ^ y ^ z
+    if round_number == 1:
+        return (x & y) | (~x & z)
+    if round_number == 2:
+        return (x | ~y) ^ z
+    if round_number == 3:
+        return (x & z) | (y & ~z)
+    return x ^ (y | ~z)
+
+
+def _rotate_left(x: int, n: int) -> int:
+    x &= 0xFFFFFFFF
+    return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+
+def _ripemd160_python(data: bytes) -> bytes:
+    state = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+    padded = data + b'\x80' + b'\x00' * ((55 - len(data)) % 64) + (8 * len(data)).to_bytes(8, 'little')
+
+    for offset in range(0, len(padded), 64):
+        words = [int.from_bytes(padded[offset + i : offset + i + 4], 'little') for i in range(0, 64, 4)]
+        al, bl, cl, dl, el = state
+        ar, br, cr, dr, er = state
+        for round_number in range(5):
+            for j in range(16):
+                t = al + _ripemd160_function(round_number, bl, cl, dl)
+                t += words[_RIPEMD160_LEFT[round_number][j]] + _RIPEMD160_LEFT_CONSTANTS[round_number]
+                t = (_rotate_left(t, _RIPEMD160_LEFT_SHIFTS[round_number][j]) + el) & 0xFFFFFFFF
+                al, el, dl, cl, bl = el, dl, _rotate_left(cl, 10), bl, t
+
+                t = ar + _ripemd160_function(4 - round_number, br, cr, dr)
+                t += words[_RIPEMD160_RIGHT[round_number][j]] + _RIPEMD160_RIGHT_CONSTANTS[round_number]
+                t = (_rotate_left(t, _RIPEMD160_RIGHT_SHIFTS[round_number][j]) + er) & 0xFFFFFFFF
+                ar, er, dr, cr, br = er, dr, _rotate_left(cr, 10), br, t
+
+        state = [
+            (state[1] + cl + dr) & 0xFFFFFFFF,
+            (state[2] + dl + er) & 0xFFFFFFFF,
+            (state[3] + el + ar) & 0xFFFFFFFF,
+            (state[4] + al + br) & 0xFFFFFFFF,
+            (state[0] + bl + cr) & 0xFFFFFFFF,
+        ]
+
+    return b''.join(word.to_bytes(4, 'little') for word in state)
+
+
+def _ripemd160(data: bytes) -> bytes:
+    try:
+        return hashlib.new('ripemd160', data).digest()
+    except ValueError:
+        return _ripemd160_python(data)
+
+
+def hash160(data: bytes) -> bytes:
+    """
+    :return: The `ripemd160` of the `sha256` of the data, which identifies keys throughout Bitcoin.
+    """
+    return _ripemd160(hashlib.sha256(data).digest())
+
+
+def parse_path(path: Path) -> Tuple[int, ...]:
+    """
+    :param path: A derivation path such as `m/44'/0'/0'/0/1`, where hardened indices are marked with
+                 `'`, `h` or `H`, or a sequence of child indices, where hardened indices include `HARDENED`.
+    :return: The child indices.
+    :raises ValueError: If the path or any index was invalid.
+    """
+    if not isinstance(path, str):
+        indices = tuple(path)
+        for index in indices:
+            if not 0 <= index <= 0xFFFFFFFF:
+                raise ValueError(f'Invalid child index: {index}')
+        return indices
+
+    parts = path.split('/')
+    if parts[0] in {'m', 'M'}:
+        parts = parts[1:]
+
+    indices = []
+    for part in parts:
+        hardened = part[-1:] in {"'", 'h', 'H'}
+        digits = part[:-1] if hardened else part
+        if not digits.isdigit() or int(digits) >= HARDENED:
+            raise ValueError(f'Invalid derivation path component: {part!r}')
+        indices.append(int(digits) | (HARDENED if hardened else 0))
+
+    return tuple(indices)
+
+
+class NodeCache:
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """
+        A thread-safe LRU cache of derived nodes, keyed by their path from the node that owns the cache.
+
+        :param maxsize: The maximum number of cached nodes.
+        """
+        if maxsize < 1:
+            raise ValueError('Maximum size must be at least 1.')
+
+        self.maxsize = maxsize
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, path: Tuple[int, ...]):
+        with self._lock:
+            node = self._entries.get(path)
+            if node is not None:
+                self._entries.move_to_end(path)
+
+        return node
+
+    def put(self, path: Tuple[int, ...], node):
+        with self._lock:
+            self._entries[path] = node
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _check_range(start: int, stop: int, hardened: bool):
+    if not 0 <= start <= stop <= HARDENED:
+        raise ValueError(f'Child indices must satisfy 0 <= start <= stop <= {HARDENED}.')
+    if hardened and stop == HARDENED:
+        raise ValueError('Hardened child indices must be less than 2^31 before hardening.')
+
+
+class ExtendedKey(ABC):
+    __slots__ = ('_cache', 'chain_code', 'child_number', 'context', 'depth', 'parent_fingerprint', 'testnet')
+
+    def __init__(
+        self,
+        chain_code: bytes,
+        depth: int = 0,
+        parent_fingerprint: bytes = bytes(4),
+        child_number: int = 0,
+        testnet: bool = False,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        context: Context = GLOBAL_CONTEXT,
+    ):
+        if len(chain_code) != 32:
+            raise ValueError('Chain code must be 32 bytes long.')
+
+        self.chain_code = bytes(chain_code)
+        self.depth = depth
+        self.parent_fingerprint = bytes(parent_fingerprint)
+        self.child_number = child_number
+        self.testnet = testnet
+        self.context = context
+
+        self._cache: Optional[NodeCache] = NodeCache(cache_size) if cache_size else None
+
+    @property
+    @abstractmethod
+    def public_key(self) -> bytes:
+        """
+        The compressed public key.
+        """
+
+    @property
+    def fingerprint(self) -> bytes:
+        """
+        The first 4 bytes of the key identifier, used by children to refer to this key.
+        """
+        return hash160(self.public_key)[:4]
+
+    def child(self, index: int):
+        """
+        Derive a child key.
+
+        :param index: The child index, including `HARDENED` for hardened derivation.
+        :return: The child key.
+        :raises ValueError: If the index was invalid, or the derived key was invalid, which happens
+                            with a probability lower than 1 in 2^127.
+        """
+        if not 0 <= index <= 0xFFFFFFFF:
+            raise ValueError(f'Invalid child index: {index}')
+
+        return self._child(index)
+
+    @abstractmethod
+    def _child(self, index: int):
+        pass
+
+    def derive_path(self, path: Path):
+        """
+        Derive a descendant key, reusing the longest cached ancestor and caching every node derived along the way.
+
+        :param path: The path relative to this key. Refer to `parse_path`.
+        :return: The descendant key.
+        :raises ValueError: If the path was invalid or a derived key was invalid.
+        """
+        indices = parse_path(path)
+        cache = self._cache
+
+        node = self
+        start = 0
+        if cache is not None:
+            for end in range(len(indices), 0, -1):
+                cached = cache.get(indices[:end])
+                if cached is not None:
+                    node = cached
+                    start = end
+                    break
+
+        for end in range(start, len(indices)):
+            node = node.child(indices[end])
+            if cache is not None:
+                cache.put(indices[: end + 1], node)
+
+        return node
+
+    def _serialize(self, version: bytes, key: bytes) -> str:
+        return b58encode_check(
+            version
+            + bytes([self.depth])
+            + self.parent_fingerprint
+            + self.child_number.to_bytes(4, 'big')
+            + self.chain_code
+            + key
+        )
+
+    def _child_attributes(self, index: int) -> dict:
+        return {
+            'depth': self.depth + 1,
+            'parent_fingerprint': self.fingerprint,
+            'child_number': index,
+            'testnet': self.testnet,
+            'cache_size': 0,
+            'context': self.context,
+        }
+
+    def __str__(self):
+        return self.to_string()
+
+    @abstractmethod
+    def to_string(self) -> str:
+        """
+        :return: The Base58Check serialization, such as `xprv...` or `xpub...`.
+        """
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_string() == other.to_string()
+
+    def __hash__(self):
+        return hash(self.to_string())
+
+
+class ExtendedPrivateKey(ExtendedKey):
+    __slots__ = ('_public_key', 'secret')
+
+    def __init__(self, secret: bytes, chain_code: bytes, **kwargs):
+        """
+        A BIP 32 extended private key (xprv).
+
+        :param secret: The 32 byte secret.
+        :param chain_code: The 32 byte chain code.
+        :param depth: The number of derivations from the master key.
+        :param parent_fingerprint: The fingerprint of the parent key.
+        :param child_number: The index of this key within its parent.
+        :param testnet: Whether or not to use the testnet version bytes when serializing.
+        :param cache_size: The number of nodes cached by `derive_path`, or `0` to disable the cache.
+        :param context:
+        :raises ValueError: If the secret or chain code was invalid.
+        """
+        super().__init__(chain_code, **kwargs)
+        self.secret: bytes = validate_secret(secret)
+        self._public_key: Optional[bytes] = None
+
+    @classmethod
+    def from_seed(
+        cls, seed: bytes, testnet: bool = False, cache_size: int = DEFAULT_CACHE_SIZE, context: Context = GLOBAL_CONTEXT
+    ):
+        """
+        :param seed: The seed, usually 16 to 64 bytes long.
+        :param testnet: Whether or not to use the testnet version bytes when serializing.
+        :param cache_size: The number of nodes cached by `derive_path`, or `0` to disable the cache.
+        :param context:
+        :return: The master key.
+        :rtype: ExtendedPrivateKey
+        :raises ValueError: If the seed produced an invalid key.
+        """
+        digest = hmac.digest(b'Bitcoin seed', seed, 'sha512')
+        return cls(digest[:32], digest[32:], testnet=testnet, cache_size=cache_size, context=context)
+
+    @property
+    def public_key(self) -> bytes:
+        """
+        The compressed public key, derived from the secret on first access.
+        """
+        public_key = self._public_key
+        if public_key is None:
+            public_key = self._public_key = PublicKey.from_valid_secret(self.secret, self.context).format()
+
+        return public_key
+
+    def to_public(self):
+        """
+        :return: The extended public key (xpub) with the same position in the tree.
+        :rtype: ExtendedPublicKey
+        """
+        return ExtendedPublicKey(
+            self.public_key,
+            self.chain_code,
+            depth=self.depth,
+            parent_fingerprint=self.parent_fingerprint,
+            child_number=self.child_number,
+            testnet=self.testnet,
+            context=self.context,
+        )
+
+    def _child(self, index: int):
+        index_bytes = index.to_bytes(4, 'big')
+        if index & HARDENED:
+            digest = hmac.digest(self.chain_code, b'\x00' + self.secret + index_bytes, 'sha512')
+        else:
+            digest = hmac.digest(self.chain_code, self.public_key + index_bytes, 'sha512')
+
+        secret = ffi.new('unsigned char [32]', self.secret)
+        if not lib.secp256k1_ec_seckey_tweak_add(self.context.ctx, secret, digest):
+            raise ValueError(f'Child {index} is invalid.')
+
+        return ExtendedPrivateKey(bytes(secret), digest[32:], **self._child_attributes(index))
+
+    def derive_range(self, start: int, stop: int, hardened: bool = False) -> bytes:
+        """
+        Derive the secrets of a range of children in one pass, without creating an object for each of them.
+
+        :param start: The first child index.
+        :param stop: The child index after the last one.
+        :param hardened: Whether or not to derive the hardened children `start | HARDENED` to
+                         `(stop - 1) | HARDENED`.
+        :return: The 32 byte secrets concatenated together.
+        :raises ValueError: If the range or a derived key was invalid.
+        """
+        _check_range(start, stop, hardened)
+
+        # The HMAC state after the key and the data shared by every child is computed once
+        if hardened:
+            prefix = hmac.new(self.chain_code, b'\x00' + self.secret, 'sha512')
+            flag = HARDENED
+        else:
+            prefix = hmac.new(self.chain_code, self.public_key, 'sha512')
+            flag = 0
+
+        ctx = self.context.ctx
+        tweak_add = lib.secp256k1_ec_seckey_tweak_add
+        secret = self.secret
+
+        secrets = bytearray(32 * (stop - start))
+        output = ffi.from_buffer('unsigned char[]', secrets, require_writable=True)
+
+        for i, index in enumerate(range(start, stop)):
+            state = prefix.copy()
+            state.update((index | flag).to_bytes(4, 'big'))
+
+            child = output + i * 32
+            ffi.memmove(child, secret, 32)
+            if not tweak_add(ctx, child, state.digest()):
+                raise ValueError(f'Child {index | flag} is invalid.')
+
+        return bytes(secrets)
+
+    def to_string(self) -> str:
+        """
+        :return: The Base58Check serialization, starting with `xprv` or `tprv`.
+        """
+        return self._serialize(TESTNET_PRIVATE if self.testnet else MAINNET_PRIVATE, b'\x00' + self.secret)
+
+    def __repr__(self):
+        return f'ExtendedPrivateKey(depth={self.depth}, child_number={self.child_number})'
+
+
+class ExtendedPublicKey(ExtendedKey):
+    __slots__ = ('_point', 'public_key')
+
+    def __init__(self, public_key: bytes, chain_code: bytes, **kwargs):
+        """
+        A BIP 32 extended public key (xpub).
+
+        :param public_key: The formatted public key.
+        :param chain_code: The 32 byte chain code.
+        :param kwargs: Refer to `ExtendedPrivateKey`.
+        :raises ValueError: If the public key or chain code was invalid.
+        """
+        super().__init__(chain_code, **kwargs)
+
+        point = PublicKey(public_key, self.context)
+        self._point = point.public_key
+        self.public_key: bytes = point.format()
+
+    def _child(self, index: int):
+        if index & HARDENED:
+            raise ValueError('Hardened children cannot be derived from a public key.')
+
+        digest = hmac.digest(self.chain_code, self.public_key + index.to_bytes(4, 'big'), 'sha512')
+
+        ctx = self.context.ctx
+        point = ffi.new('secp256k1_pubkey *')
+        tweak_point = ffi.new('secp256k1_pubkey *')
+        summands = ffi.new('secp256k1_pubkey *[2]', (self._point, tweak_point))
+        if not lib.secp256k1_ec_pubkey_create(ctx, tweak_point, digest) or not lib.secp256k1_ec_pubkey_combine(
+            ctx, point, summands, 2
+        ):
+            raise ValueError(f'Child {index} is invalid.')
+
+        return ExtendedPublicKey(PublicKey(point, self.context).format(), digest[32:], **self._child_attributes(index))
+
+    def derive_range(self, start: int, stop: int) -> bytes:
+        """
+        Derive the compressed public keys of a range of children in one pass, without creating an object
+        for each of them, e.g. to scan addresses up to a gap limit.
+
+        :param start: The first child index.
+        :param stop: The child index after the last one, at most `HARDENED`.
+        :return: The 33 byte compressed public keys concatenated together.
+        :raises ValueError: If the range or a derived key was invalid.
+        """
+        _check_range(start, stop, False)
+
+        # The HMAC state after the key and the parent public key is computed once
+        prefix = hmac.new(self.chain_code, self.public_key, 'sha512')
+
+        ctx = self.context.ctx
+        pubkey_create = lib.secp256k1_ec_pubkey_create
+        pubkey_combine = lib.secp256k1_ec_pubkey_combine
+        pubkey_serialize = lib.secp256k1_ec_pubkey_serialize
+
+        public_keys = bytearray(33 * (stop - start))
+        output = ffi.from_buffer('unsigned char[]', public_keys, require_writable=True)
+        point = ffi.new('secp256k1_pubkey *')
+        tweak_point = ffi.new('secp256k1_pubkey *')
+        summands = ffi.new('secp256k1_pubkey *[2]', (self._point, tweak_point))
+        output_len = ffi.new('size_t *')
+
+        for i, index in enumerate(range(start, stop)):
+            state = prefix.copy()
+            state.update(index.to_bytes(4, 'big'))
+
+            # Multiplying the generator with its precomputed tables and adding the parent is
+            # faster than the generic multiplication within `secp256k1_ec_pubkey_tweak_add`.
+            if not pubkey_create(ctx, tweak_point, state.digest()) or not pubkey_combine(ctx, point, summands, 2):
+                raise ValueError(f'Child {index} is invalid.')
+
+            output_len[0] = 33
+            pubkey_serialize(ctx, output + i * 33, output_len, point, EC_COMPRESSED)
+
+        return bytes(public_keys)
+
+    def to_string(self) -> str:
+        """
+        :return: The Base58Check serialization, starting with `xpub` or `tpub`.
+        """
+        return self._serialize(TESTNET_PUBLIC if self.testnet else MAINNET_PUBLIC, self.public_key)
+
+    def __repr__(self):
+        return f'ExtendedPublicKey(depth={self.depth}, child_number={self.child_number})'
+
+
+def parse_extended_key(
+    encoded: str, cache_size: int = DEFAULT_CACHE_SIZE, context: Context = GLOBAL_CONTEXT
+) -> Union[ExtendedPrivateKey, ExtendedPublicKey]:
+    """
+    :param encoded: A Base58Check serialized extended key, starting with `xprv`, `xpub`, `tprv` or `tpub`.
+    :param cache_size: The number of nodes cached by `derive_path`, or `0` to disable the cache.
+    :param context:
+    :return: The extended private or public key.
+    :raises ValueError: If the serialization or the key was invalid.
+    """
+    data = b58decode_check(encoded)
+    if len(data) != SERIALIZED_LENGTH:
+        raise ValueError(f'Extended keys must be {SERIALIZED_LENGTH} bytes long.')
+
+    version = data[:4]
+    if version not in VERSIONS:
+        raise ValueError(f'Unknown extended key version: {version.hex()}')
+    private, testnet = VERSIONS[version]
+
+    depth = data[4]
+    parent_fingerprint = data[5:9]
+    child_number = int.from_bytes(data[9:13], 'big')
+    if not depth and (parent_fingerprint != bytes(4) or child_number):
+        raise ValueError('Master keys must have a zero parent fingerprint and child number.')
+
+    kwargs = {
+        'depth': depth,
+        'parent_fingerprint': parent_fingerprint,
+        'child_number': child_number,
+        'testnet': testnet,
+        'cache_size': cache_size,
+        'context': context,
+    }
+    chain_code = data[13:45]
+    key = data[45:]
+
+    if private:
+        if key[0]:
+            raise ValueError('Extended private keys must have a zero key prefix.')
+        return ExtendedPrivateKey(key[1:], chain_code, **kwargs)
+
+    if key[0] not in {2, 3}:
+        raise ValueError('Extended public keys must contain a compressed public key.')
+    return ExtendedPublicKey(key, chain_code, **kwargs)
@@ -0,0 +1,155 @@
+import sys
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import Optional
+
+from coincurve.context import STATIC_CTX, Context
+
+from ._libsecp256k1 import ffi, lib
+
+DEFAULT_MAXSIZE = 65536
+PUBLIC_KEY_STRUCT_SIZE = 64
+# Approximate memory used by one entry on top of its key: the cached struct
+# as a bytes object plus the bookkeeping of the ordered dictionary.
+ENTRY_OVERHEAD = sys.getsizeof(bytes(PUBLIC_KEY_STRUCT_SIZE)) + 100
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'evictions', 'currsize', 'maxsize', 'nbytes', 'max_bytes'))
+
+
+class PublicKeyCache:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, max_bytes: Optional[int] = None):
+        """
+        A thread-safe LRU cache of parsed public keys, keyed by their serialized form.
+
+        :param maxsize: The maximum number of cached public keys.
+        :param max_bytes: The approximate maximum memory used by the cached public keys. By default,
+                          only `maxsize` bounds the cache.
+        """
+        if maxsize < 1:
+            raise ValueError('Maximum size must be at least 1.')
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+    def parse(self, public_key, data, context: Context) -> bool:
+        """
+        Parse a formatted public key, copying the result from the cache when possible.
+
+        :param public_key: The `secp256k1_pubkey *` to which the parsed public key is written.
+        :param data: The formatted public key, as any buffer-protocol object.
+        :param context:
+        :return: A boolean indicating whether or not the public key could be parsed.
+        """
+        key = bytes(data)
+
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if parsed is not None:
+            ffi.memmove(public_key, parsed, PUBLIC_KEY_STRUCT_SIZE)
+            return True
+
+        if not lib.secp256k1_ec_pubkey_parse(STATIC_CTX, public_key, key, len(key)):
+            return False
+
+        parsed = bytes(ffi.buffer(public_key, PUBLIC_KEY_STRUCT_SIZE))
+        size = sys.getsizeof(key) + ENTRY_OVERHEAD
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = parsed
+                self.nbytes += size
+                self._evict()
+
+        return True
+
+    def _evict(self):
+        entries = self._entries
+        max_bytes = self.max_bytes
+        while len(entries) > self.maxsize or (max_bytes is not None and self.nbytes > max_bytes and entries):
+            key, _ = entries.popitem(last=False)
+            self.nbytes -= sys.getsizeof(key) + ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Remove every cached public key and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.nbytes = 0
+
+    def info(self) -> CacheInfo:
+        """
+        :return: The hit, miss and eviction counts along with the current and maximum sizes.
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._entries), self.maxsize, self.nbytes, self.max_bytes
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_public_key_cache: Optional[PublicKeyCache] = None
+
+
+def enable_public_key_cache(maxsize: int = DEFAULT_MAXSIZE, max_bytes: Optional[int] = None) -> PublicKeyCache:
+    """
+    Cache parsed public keys in `verify_signature`, `verify_signatures_batch`, `PublicKey`
+    and `PrivateKey.ecdh`. Any previously enabled cache is replaced.
+
+    :param maxsize: The maximum number of cached public keys.
+    :param max_bytes: The approximate maximum memory used by the cached public keys.
+    :return: The new cache.
+    """
+    global _public_key_cache
+    _public_key_cache = PublicKeyCache(maxsize, max_bytes)
+    return _public_key_cache
+
+
+def disable_public_key_cache():
+    """
+    Stop caching parsed public keys and drop the current cache.
+    """
+    global _public_key_cache
+    _public_key_cache = None
+
+
+def get_public_key_cache() -> Optional[PublicKeyCache]:
+    """
+    :return: The enabled cache, if any.
+    """
+    return _public_key_cache
+
+
+def parse_public_key(public_key, data, context: Context) -> bool:
+    """
+    Parse a formatted public key, through the public key cache if it is enabled.
+
+    :param public_key: The `secp256k1_pubkey *` to which the parsed public key is written.
+    :param data: The formatted public key, as any buffer-protocol object.
+    :param context:
+    :return: A boolean indicating whether or not the public key could be parsed.
+    """
+    cache = _public_key_cache
+    if cache is None:
+        if not isinstance(data, bytes):
+            data = ffi.from_buffer('unsigned char[]', data)
+
+        return lib.secp256k1_ec_pubkey_parse(STATIC_CTX, public_key, data, len(data))
+
+    return cache.parse(public_key, data, context)
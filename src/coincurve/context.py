@@ -1,11 +1,17 @@
-from os import urandom
-from threading import Lock
+import os
+from threading import Event, Lock, Thread, local
 from typing import Optional
+from weakref import WeakSet
 
 from coincurve.flags import CONTEXT_FLAGS, CONTEXT_NONE
 
 from ._libsecp256k1 import ffi, lib
 
+# Operations that involve no secret data, such as verifying signatures, parsing or serializing public
+# keys and signatures, and arithmetic on public keys, need neither a randomized context nor exclusive
+# access to one, so they always use `secp256k1_context_static` no matter which context is given.
+STATIC_CTX = lib.secp256k1_context_static
+
 
 class Context:
     def __init__(self, seed: Optional[bytes] = None, flag=CONTEXT_NONE, name: str = ''):
@@ -13,23 +19,243 @@ class Context:
             raise ValueError(f'{flag} is an invalid context flag.')
         self._lock = Lock()
 
-        self.ctx = ffi.gc(lib.secp256k1_context_create(flag), lib.secp256k1_context_destroy)
-        self.reseed(seed)
+        # The context is only created and randomized on first use, so that importing the
+        # package does not pay for it.
+        self._ctx = None
+        self._flag = flag
+        self._seed = seed
 
         self.name = name
 
+    @property
+    def ctx(self):
+        """
+        The underlying `secp256k1_context *`, created and randomized on first access.
+        """
+        ctx = self._ctx
+        if ctx is None:
+            with self._lock:
+                ctx = self._ctx
+                if ctx is None:
+                    ctx = ffi.gc(lib.secp256k1_context_create(self._flag), lib.secp256k1_context_destroy)
+                    self._randomize(ctx, self._seed)
+                    self._seed = None
+                    self._ctx = ctx
+
+        return ctx
+
     def reseed(self, seed: Optional[bytes] = None):
         """
         Protects against certain possible future side-channel timing attacks.
         """
         with self._lock:
-            seed = urandom(32) if not seed or len(seed) != 32 else seed
-            res = lib.secp256k1_context_randomize(self.ctx, ffi.new('unsigned char [32]', seed))
-            if not res:
-                raise ValueError('secp256k1_context_randomize')
+            if self._ctx is None:
+                self._seed = seed
+                return
+
+            self._randomize(self._ctx, seed)
+
+    @staticmethod
+    def _randomize(ctx, seed: Optional[bytes]):
+        seed = os.urandom(32) if not seed or len(seed) != 32 else seed
+        res = lib.secp256k1_context_randomize(ctx, ffi.new('unsigned char [32]', seed))
+        if not res:
+            raise ValueError('secp256k1_context_randomize')
+
+    def clone(self, name: str = ''):
+        """
+        Create an independent copy of this context, including its current randomization.
+
+        :param name: The name of the new context.
+        :return: The cloned context.
+        :rtype: Context
+        """
+        ctx = self.ctx
+        context = Context.__new__(Context)
+        context._lock = Lock()
+        context._flag = self._flag
+        context._seed = None
+
+        with self._lock:
+            context._ctx = ffi.gc(lib.secp256k1_context_clone(ctx), lib.secp256k1_context_destroy)
+
+        context.name = name
+        return context
+
+    def __repr__(self):
+        return self.name or super().__repr__()
+
+
+class StaticContext(Context):
+    def __init__(self, name: str = ''):
+        """
+        A wrapper around `secp256k1_context_static`, which is never created, destroyed or randomized.
+
+        It may only be passed to operations that do not involve secret data, such as verifying
+        signatures and parsing or serializing public keys and signatures. Those use the static
+        context regardless, so this is only useful for objects that never touch a secret.
+        Signing or any other operation on secret data raises a `ValueError`, as libsecp256k1
+        would abort the process instead.
+
+        :param name: The name of the context.
+        """
+        self._lock = Lock()
+        self._ctx = STATIC_CTX
+        self._flag = CONTEXT_NONE
+        self._seed = None
+
+        self.name = name
+
+    @property
+    def ctx(self):
+        """
+        :raises ValueError: Always, as the static context cannot be used for operations on secret data.
+        """
+        raise ValueError('The static context cannot be used for signing or other operations on secret data.')
+
+    def reseed(self, seed: Optional[bytes] = None):
+        """
+        :raises ValueError: Always, as the static context cannot be randomized.
+        """
+        raise ValueError('The static context cannot be randomized.')
+
+    def clone(self, name: str = ''):
+        """
+        :raises ValueError: Always, as the static context cannot be cloned.
+        """
+        raise ValueError('The static context cannot be cloned.')
+
+
+class _ContextSlot:
+    __slots__ = ('__weakref__', 'context')
+
+    def __init__(self, context: Context):
+        self.context = context
+
+
+class ContextPool:
+    def __init__(self, reseed_interval: Optional[float] = None, name: str = ''):
+        """
+        Hand out a separate context to every thread, so that threads never contend for a context.
+
+        Every thread's context is cloned from a template context and then randomized on its own.
+        Reseeding never randomizes a context that may be in use: a freshly cloned and randomized
+        context is swapped in for every thread instead, and operations already running finish
+        with the previous one.
+
+        Verification, parsing and serialization never need a per-thread context, as they always
+        use the static context.
+
+        :param reseed_interval: The number of seconds between reseeds by a background thread.
+                                By default, contexts are only reseeded by calling `reseed`.
+        :param name: The prefix of the names of the contexts.
+        """
+        if reseed_interval is not None and reseed_interval <= 0:
+            raise ValueError('Reseed interval must be positive.')
+
+        self.reseed_interval = reseed_interval
+        self.name = name
+
+        self._template = Context(name=name)
+        self._local = local()
+        # The slots of the threads that are still alive, for reseeding.
+        self._slots: WeakSet = WeakSet()
+        self._slots_lock = Lock()
+
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        if reseed_interval is not None:
+            self._start()
+
+        _pools.add(self)
+
+    def _start(self):
+        self._thread = Thread(target=self._reseed_periodically, name='coincurve-reseed', daemon=True)
+        self._thread.start()
+
+    def _new_context(self) -> Context:
+        context = self._template.clone(name=self.name)
+        context.reseed()
+        return context
+
+    @property
+    def context(self) -> Context:
+        """
+        The context of the current thread, for signing and any other operation on secret data.
+        """
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            slot = self._local.slot = _ContextSlot(self._new_context())
+            with self._slots_lock:
+                self._slots.add(slot)
+
+        return slot.context
+
+    def reseed(self):
+        """
+        Swap a freshly randomized context in for every thread, without waiting for operations in progress.
+        """
+        with self._slots_lock:
+            slots = list(self._slots)
+
+        for slot in slots:
+            # Rebinding the attribute is atomic, and a thread that already holds the previous
+            # context keeps it alive until it is done with it.
+            slot.context = self._new_context()
+
+    def _reseed_periodically(self):
+        while not self._stop.wait(self.reseed_interval):
+            self.reseed()
+
+    def close(self):
+        """
+        Stop the background reseeding, if any.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def __repr__(self):
         return self.name or super().__repr__()
 
 
 GLOBAL_CONTEXT = Context(name='GLOBAL_CONTEXT')
+STATIC_CONTEXT = StaticContext(name='STATIC_CONTEXT')
+
+_pools: WeakSet = WeakSet()
+
+
+def _reseed_after_fork():
+    # Another thread may have been holding the lock at the time of the fork, and the
+    # child must not share the parent's randomization. A context that was never used
+    # has no randomization yet, and will get its own on first use.
+    GLOBAL_CONTEXT._lock = Lock()
+    if GLOBAL_CONTEXT._ctx is not None:
+        GLOBAL_CONTEXT.reseed()
+
+    # Only the forking thread survives, and with it none of the background reseeding threads. Every
+    # pool whose thread had not been joined by `close` gets a new one, even if it was being stopped,
+    # as whoever was stopping it did not survive the fork either.
+    for pool in list(_pools):
+        pool._slots_lock = Lock()
+        pool._template._lock = Lock()
+        pool._stop = Event()
+        running = pool._thread is not None
+        pool._thread = None
+        pool.reseed()
+
+        if running:
+            pool._start()
+        else:
+            pool._stop.set()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
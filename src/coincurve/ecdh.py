@@ -0,0 +1,109 @@
+from hashlib import sha256 as _sha256
+from typing import List
+
+from coincurve.cache import parse_public_key
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.types import Hasher
+from coincurve.utils import sha256
+
+from ._libsecp256k1 import ffi, lib
+
+# Hashers for the shared point, which they receive in compressed format (33 bytes)
+
+
+def raw_x(point: bytes) -> bytes:
+    """
+    :return: The 32 byte x coordinate of the shared point, without hashing.
+    """
+    return point[1:]
+
+
+def sha256_x(point: bytes) -> bytes:
+    """
+    :return: The `sha256` of the x coordinate of the shared point.
+    """
+    return _sha256(point[1:]).digest()
+
+
+def x963_kdf(length: int = 32, shared_info: bytes = b'', hash_function=_sha256) -> Hasher:
+    """
+    Create a hasher implementing the ANSI X9.63 key derivation function over the
+    x coordinate of the shared point.
+
+    :param length: The number of bytes to derive.
+    :param shared_info: Optional data shared by both parties.
+    :param hash_function: A `hashlib` constructor. By default, `sha256` is used.
+    :return: The hasher.
+    """
+
+    def kdf(point: bytes) -> bytes:
+        z = point[1:]
+        output = b''.join(
+            hash_function(z + counter.to_bytes(4, 'big') + shared_info).digest()
+            for counter in range(1, -(-length // hash_function().digest_size) + 1)
+        )
+        return output[:length]
+
+    return kdf
+
+
+def _copy_compressed_point(output, x32, y32, data):
+    # Other hashers run in Python, so `secp256k1_ecdh` (whose multiplication is constant time,
+    # unlike `secp256k1_ec_pubkey_tweak_mul`) only writes out the compressed shared point.
+    output[0] = 0x02 | (y32[31] & 1)
+    ffi.memmove(output + 1, x32, 32)
+    return 1
+
+
+_copy_compressed_point_callback = None
+
+
+def _get_copy_compressed_point():
+    # The callback is only created on first use, as it needs executable memory that hardened
+    # platforms may refuse to allocate, which must not break importing the package.
+    global _copy_compressed_point_callback
+    if _copy_compressed_point_callback is None:
+        _copy_compressed_point_callback = ffi.callback('secp256k1_ecdh_hash_function', _copy_compressed_point)
+
+    return _copy_compressed_point_callback
+
+
+def ecdh_many(secret: bytes, public_keys, hasher: Hasher = sha256, context: Context = GLOBAL_CONTEXT) -> List[bytes]:
+    """
+    Compute EC Diffie-Hellman secrets against many public keys in constant time.
+
+    :param secret: The private key secret.
+    :param public_keys: A sequence of formatted public keys or parsed `secp256k1_pubkey *`.
+    :param hasher: The hash function applied to the compressed shared point. By default, the
+                   `sha256` algorithm is used, which runs natively within `secp256k1_ecdh`.
+                   If `None`, the compressed shared point is returned.
+    :param context:
+    :return: The shared secrets.
+    :raises ValueError: If a public key could not be parsed or was invalid, or the secret was invalid.
+    """
+    ctx = context.ctx
+    native = hasher is sha256
+    ecdh = lib.secp256k1_ecdh
+    hashfp = ffi.NULL if native else _get_copy_compressed_point()
+
+    point = ffi.new('secp256k1_pubkey *')
+    output = ffi.new('unsigned char [33]')
+
+    shared_secrets = []
+    for public_key in public_keys:
+        if isinstance(public_key, ffi.CData):
+            ffi.memmove(point, public_key, 64)
+        elif not parse_public_key(point, public_key, context):
+            raise ValueError('The public key could not be parsed or is invalid.')
+
+        if not ecdh(ctx, output, point, secret, hashfp, ffi.NULL):
+            raise ValueError('The private key was invalid.')
+
+        if native:
+            shared_secrets.append(bytes(ffi.buffer(output, 32)))
+            continue
+
+        shared_point = bytes(ffi.buffer(output, 33))
+        shared_secrets.append(hasher(shared_point) if hasher is not None else shared_point)
+
+    return shared_secrets
@@ -1,6 +1,8 @@
-from coincurve.context import GLOBAL_CONTEXT, Context
+from typing import List, Optional, Tuple
+
+from coincurve.context import GLOBAL_CONTEXT, STATIC_CTX, Context
 from coincurve.types import Hasher
-from coincurve.utils import bytes_to_int, int_to_bytes, sha256
+from coincurve.utils import GROUP_ORDER, as_buffer, as_output_buffer, bytes_to_int, int_to_bytes, sha256
 
 from ._libsecp256k1 import ffi, lib
 
@@ -12,14 +14,24 @@ def cdata_to_der(cdata, context: Context = GLOBAL_CONTEXT) -> bytes:
     der = ffi.new('unsigned char[%d]' % MAX_SIG_LENGTH)
     der_length = ffi.new('size_t *', MAX_SIG_LENGTH)
 
-    lib.secp256k1_ecdsa_signature_serialize_der(context.ctx, der, der_length, cdata)
+    lib.secp256k1_ecdsa_signature_serialize_der(STATIC_CTX, der, der_length, cdata)
 
     return bytes(ffi.buffer(der, der_length[0]))
 
 
+def cdata_to_der_into(cdata, out, context: Context = GLOBAL_CONTEXT) -> int:
+    der = as_output_buffer(out, 0)
+    der_length = ffi.new('size_t *', len(der))
+
+    if not lib.secp256k1_ecdsa_signature_serialize_der(STATIC_CTX, der, der_length, cdata):
+        raise ValueError('Output buffer is too small for the DER-encoded signature.')
+
+    return der_length[0]
+
+
 def der_to_cdata(der: bytes, context: Context = GLOBAL_CONTEXT):
     cdata = ffi.new('secp256k1_ecdsa_signature *')
-    parsed = lib.secp256k1_ecdsa_signature_parse_der(context.ctx, cdata, der, len(der))
+    parsed = lib.secp256k1_ecdsa_signature_parse_der(STATIC_CTX, cdata, as_buffer(der), len(der))
 
     if not parsed:
         raise ValueError('The DER-encoded signature could not be parsed.')
@@ -33,7 +45,7 @@ def recover(message: bytes, recover_sig, hasher: Hasher = sha256, context: Conte
         raise ValueError('Message hash must be 32 bytes long.')
     pubkey = ffi.new('secp256k1_pubkey *')
 
-    recovered = lib.secp256k1_ecdsa_recover(context.ctx, pubkey, recover_sig, msg_hash)
+    recovered = lib.secp256k1_ecdsa_recover(STATIC_CTX, pubkey, recover_sig, as_buffer(msg_hash))
     if recovered:
         return pubkey
     raise ValueError('failed to recover ECDSA public key')
@@ -43,11 +55,21 @@ def serialize_recoverable(recover_sig, context: Context = GLOBAL_CONTEXT) -> byt
     output = ffi.new('unsigned char[%d]' % CDATA_SIG_LENGTH)
     recid = ffi.new('int *')
 
-    lib.secp256k1_ecdsa_recoverable_signature_serialize_compact(context.ctx, output, recid, recover_sig)
+    lib.secp256k1_ecdsa_recoverable_signature_serialize_compact(STATIC_CTX, output, recid, recover_sig)
 
     return bytes(ffi.buffer(output, CDATA_SIG_LENGTH)) + int_to_bytes(recid[0])
 
 
+def serialize_recoverable_into(recover_sig, out, context: Context = GLOBAL_CONTEXT) -> int:
+    output = as_output_buffer(out, CDATA_SIG_LENGTH + 1)
+    recid = ffi.new('int *')
+
+    lib.secp256k1_ecdsa_recoverable_signature_serialize_compact(STATIC_CTX, output, recid, recover_sig)
+    output[CDATA_SIG_LENGTH] = recid[0]
+
+    return CDATA_SIG_LENGTH + 1
+
+
 def deserialize_recoverable(serialized: bytes, context: Context = GLOBAL_CONTEXT):
     if len(serialized) != 65:
         raise ValueError('Serialized signature must be 65 bytes long.')
@@ -59,42 +81,38 @@ def deserialize_recoverable(serialized: bytes, context: Context = GLOBAL_CONTEXT
 
     recover_sig = ffi.new('secp256k1_ecdsa_recoverable_signature *')
 
-    parsed = lib.secp256k1_ecdsa_recoverable_signature_parse_compact(context.ctx, recover_sig, ser_sig, rec_id)
+    parsed = lib.secp256k1_ecdsa_recoverable_signature_parse_compact(
+        STATIC_CTX, recover_sig, as_buffer(ser_sig), rec_id
+    )
     if not parsed:
         raise ValueError('Failed to parse recoverable signature.')
 
     return recover_sig
 
 
-"""
-Warning:
-    The functions below may change and are not tested!
-"""
-
-
-def serialize_compact(raw_sig, context: Context = GLOBAL_CONTEXT):  # no cov
+def serialize_compact(raw_sig, context: Context = GLOBAL_CONTEXT) -> bytes:
     output = ffi.new('unsigned char[%d]' % CDATA_SIG_LENGTH)
 
-    res = lib.secp256k1_ecdsa_signature_serialize_compact(context.ctx, output, raw_sig)
+    res = lib.secp256k1_ecdsa_signature_serialize_compact(STATIC_CTX, output, raw_sig)
     if not res:
         raise ValueError('secp256k1_ecdsa_signature_serialize_compact')
 
     return bytes(ffi.buffer(output, CDATA_SIG_LENGTH))
 
 
-def deserialize_compact(ser_sig: bytes, context: Context = GLOBAL_CONTEXT):  # no cov
+def deserialize_compact(ser_sig: bytes, context: Context = GLOBAL_CONTEXT):
     if len(ser_sig) != 64:
-        raise Exception('invalid signature length')
+        raise ValueError('Compact signature must be 64 bytes long.')
 
     raw_sig = ffi.new('secp256k1_ecdsa_signature *')
-    res = lib.secp256k1_ecdsa_signature_parse_compact(context.ctx, raw_sig, ser_sig)
+    res = lib.secp256k1_ecdsa_signature_parse_compact(STATIC_CTX, raw_sig, as_buffer(ser_sig))
     if not res:
         raise ValueError('secp256k1_ecdsa_signature_parse_compact')
 
     return raw_sig
 
 
-def signature_normalize(raw_sig, context: Context = GLOBAL_CONTEXT):  # no cov
+def signature_normalize(raw_sig, context: Context = GLOBAL_CONTEXT):
     """
     Check and optionally convert a signature to a normalized lower-S form.
 
@@ -104,14 +122,329 @@ def signature_normalize(raw_sig, context: Context = GLOBAL_CONTEXT):  # no cov
     """
     sigout = ffi.new('secp256k1_ecdsa_signature *')
 
-    res = lib.secp256k1_ecdsa_signature_normalize(context.ctx, sigout, raw_sig)
+    res = lib.secp256k1_ecdsa_signature_normalize(STATIC_CTX, sigout, raw_sig)
 
     return not not res, sigout
 
 
-def recoverable_convert(recover_sig, context: Context = GLOBAL_CONTEXT):  # no cov
+def recoverable_convert(recover_sig, context: Context = GLOBAL_CONTEXT):
     normal_sig = ffi.new('secp256k1_ecdsa_signature *')
 
-    lib.secp256k1_ecdsa_recoverable_signature_convert(context.ctx, normal_sig, recover_sig)
+    lib.secp256k1_ecdsa_recoverable_signature_convert(STATIC_CTX, normal_sig, recover_sig)
 
     return normal_sig
+
+
+def parse_der_lax(der: bytes) -> Optional[bytes]:
+    """
+    Parse a DER-like ECDSA signature that may violate strict DER, as found in early Bitcoin blocks.
+    This is a port of `ecdsa_signature_parse_der_lax` from the libsecp256k1 contrib directory.
+
+    :param der: The encoded signature.
+    :return: The 64 byte compact signature, or `None` if the encoding could not be parsed. An `r` or `s`
+             value that is out of range results in a signature of all zeros, which never verifies.
+    """
+    der = bytes(der)
+    length = len(der)
+    pos = 0
+
+    # Sequence tag and length, which is ignored
+    if pos == length or der[pos] != 0x30:
+        return None
+    pos += 1
+
+    if pos == length:
+        return None
+    lenbyte = der[pos]
+    pos += 1
+    if lenbyte & 0x80:
+        lenbyte -= 0x80
+        if lenbyte > length - pos:
+            return None
+        pos += lenbyte
+
+    integers = []
+    for _ in range(2):
+        # Integer tag and length
+        if pos == length or der[pos] != 0x02:
+            return None
+        pos += 1
+
+        if pos == length:
+            return None
+        lenbyte = der[pos]
+        pos += 1
+        if lenbyte & 0x80:
+            lenbyte -= 0x80
+            if lenbyte > length - pos:
+                return None
+            while lenbyte > 0 and der[pos] == 0:
+                pos += 1
+                lenbyte -= 1
+            if lenbyte >= 4:
+                return None
+            int_length = int.from_bytes(der[pos : pos + lenbyte], 'big')
+            pos += lenbyte
+        else:
+            int_length = lenbyte
+
+        if int_length > length - pos:
+            return None
+
+        integers.append(der[pos : pos + int_length].lstrip(b'\x00'))
+        pos += int_length
+
+    r, s = integers
+    if len(r) > 32 or len(s) > 32:
+        return bytes(CDATA_SIG_LENGTH)
+
+    compact = r.rjust(32, b'\x00') + s.rjust(32, b'\x00')
+    if compact[:32] >= GROUP_ORDER or compact[32:] >= GROUP_ORDER:
+        return bytes(CDATA_SIG_LENGTH)
+
+    return compact
+
+
+def der_to_compact_many(
+    signatures, lax: bool = False, normalize: bool = False, context: Context = GLOBAL_CONTEXT
+) -> Tuple[bytes, List[int]]:
+    """
+    Convert many DER-encoded signatures to the compact encoding in a single pass.
+
+    :param signatures: A sequence of DER-encoded signatures.
+    :param lax: Whether or not to accept encodings that violate strict DER. Refer to `parse_der_lax`.
+    :param normalize: Whether or not to convert the signatures to lower-S form.
+    :param context:
+    :return: The 64 byte compact signatures concatenated together, in which the signatures that could not
+             be parsed are replaced by zeros, and the indices of those signatures.
+    """
+    count = len(signatures)
+    output = bytearray(CDATA_SIG_LENGTH * count)
+    out = ffi.from_buffer('unsigned char[]', output, require_writable=True)
+
+    ctx = STATIC_CTX
+    signature_parse_der = lib.secp256k1_ecdsa_signature_parse_der
+    signature_parse_compact = lib.secp256k1_ecdsa_signature_parse_compact
+    signature_serialize_compact = lib.secp256k1_ecdsa_signature_serialize_compact
+    signature_normalize = lib.secp256k1_ecdsa_signature_normalize
+    sig = ffi.new('secp256k1_ecdsa_signature *')
+
+    failed = []
+    for i, der in enumerate(signatures):
+        # Strict parsing is much faster and succeeds for almost every signature.
+        if not signature_parse_der(ctx, sig, as_buffer(der), len(der)):
+            compact = parse_der_lax(der) if lax else None
+            if compact is None or not signature_parse_compact(ctx, sig, compact):
+                failed.append(i)
+                continue
+
+        if normalize:
+            signature_normalize(ctx, sig, sig)
+
+        signature_serialize_compact(ctx, out + i * CDATA_SIG_LENGTH, sig)
+
+    return bytes(output), failed
+
+
+def compact_to_der_many(data, context: Context = GLOBAL_CONTEXT) -> Tuple[List[bytes], List[int]]:
+    """
+    Convert many compact signatures to the DER encoding in a single pass.
+
+    :param data: The 64 byte compact signatures concatenated together, as any buffer-protocol object.
+    :param context:
+    :return: The DER-encoded signatures, in which the signatures that could not be parsed are replaced by
+             empty bytestrings, and the indices of those signatures.
+    :raises ValueError: If the length of `data` is not a multiple of 64.
+    """
+    buffer = ffi.from_buffer('unsigned char[]', data)
+    if len(buffer) % CDATA_SIG_LENGTH:
+        raise ValueError('Packed compact signatures must be 64 bytes each.')
+
+    ctx = STATIC_CTX
+    signature_parse_compact = lib.secp256k1_ecdsa_signature_parse_compact
+    signature_serialize_der = lib.secp256k1_ecdsa_signature_serialize_der
+    sig = ffi.new('secp256k1_ecdsa_signature *')
+    der = ffi.new('unsigned char[%d]' % MAX_SIG_LENGTH)
+    der_length = ffi.new('size_t *')
+    buffer_der = ffi.buffer(der)
+
+    signatures = []
+    failed = []
+    for i in range(len(buffer) // CDATA_SIG_LENGTH):
+        if not signature_parse_compact(ctx, sig, buffer + i * CDATA_SIG_LENGTH):
+            signatures.append(b'')
+            failed.append(i)
+            continue
+
+        der_length[0] = MAX_SIG_LENGTH
+        signature_serialize_der(ctx, der, der_length, sig)
+        signatures.append(buffer_der[: der_length[0]])
+
+    return signatures, failed
+
+
+def normalize_many(data, context: Context = GLOBAL_CONTEXT) -> Tuple[bytes, List[int], List[int]]:
+    """
+    Convert many compact signatures to lower-S form in a single pass.
+
+    :param data: The 64 byte compact signatures concatenated together, as any buffer-protocol object.
+    :param context:
+    :return: The normalized signatures concatenated together, in which the signatures that could not be
+             parsed are left as they were, the indices of the signatures that were not already in lower-S
+             form, and the indices of the signatures that could not be parsed.
+    :raises ValueError: If the length of `data` is not a multiple of 64.
+    """
+    buffer = ffi.from_buffer('unsigned char[]', data)
+    if len(buffer) % CDATA_SIG_LENGTH:
+        raise ValueError('Packed compact signatures must be 64 bytes each.')
+
+    output = bytearray(buffer)
+    out = ffi.from_buffer('unsigned char[]', output, require_writable=True)
+
+    ctx = STATIC_CTX
+    signature_parse_compact = lib.secp256k1_ecdsa_signature_parse_compact
+    signature_serialize_compact = lib.secp256k1_ecdsa_signature_serialize_compact
+    signature_normalize = lib.secp256k1_ecdsa_signature_normalize
+    sig = ffi.new('secp256k1_ecdsa_signature *')
+
+    normalized = []
+    failed = []
+    for i in range(len(buffer) // CDATA_SIG_LENGTH):
+        offset = i * CDATA_SIG_LENGTH
+        if not signature_parse_compact(ctx, sig, buffer + offset):
+            failed.append(i)
+        elif signature_normalize(ctx, sig, sig):
+            signature_serialize_compact(ctx, out + offset, sig)
+            normalized.append(i)
+
+    return bytes(output), normalized, failed
+
+
+class Signature:
+    __slots__ = ('_cdata', '_der', '_recoverable', 'context')
+
+    def __init__(self, der: bytes, context: Context = GLOBAL_CONTEXT):
+        """
+        An ECDSA signature that is parsed on first use and then kept in parsed form, so that
+        verifying it repeatedly or against several public keys parses it only once.
+
+        :param der: The DER-encoded signature, as any buffer-protocol object.
+        :param context:
+        """
+        self._der = bytes(der)
+        self._cdata = None
+        self._recoverable = None
+        self.context = context
+
+    @classmethod
+    def _from_cdata(cls, cdata, recoverable=None, context: Context = GLOBAL_CONTEXT):
+        signature = cls.__new__(cls)
+        signature._der = None
+        signature._cdata = cdata
+        signature._recoverable = recoverable
+        signature.context = context
+        return signature
+
+    @classmethod
+    def from_compact(cls, data: bytes, context: Context = GLOBAL_CONTEXT):
+        """
+        :param data: The 64 byte compact signature, the concatenation of `r` and `s`.
+        :param context:
+        :return: The signature.
+        :rtype: Signature
+        :raises ValueError: If the signature was not 64 bytes long or could not be parsed.
+        """
+        return cls._from_cdata(deserialize_compact(data, context), context=context)
+
+    @classmethod
+    def from_recoverable(cls, data: bytes, context: Context = GLOBAL_CONTEXT):
+        """
+        :param data: The 65 byte recoverable signature, the compact signature followed by the recovery id.
+        :param context:
+        :return: The signature.
+        :rtype: Signature
+        :raises ValueError: If the signature was not 65 bytes long or could not be parsed.
+        """
+        recover_sig = deserialize_recoverable(data, context)
+        return cls._from_cdata(recoverable_convert(recover_sig, context), recover_sig, context)
+
+    @property
+    def cdata(self):
+        """
+        The parsed `secp256k1_ecdsa_signature *`.
+
+        :raises ValueError: If the DER-encoded signature could not be parsed.
+        """
+        cdata = self._cdata
+        if cdata is None:
+            cdata = self._cdata = der_to_cdata(self._der, self.context)
+
+        return cdata
+
+    @property
+    def recoverable_cdata(self):
+        """
+        The parsed `secp256k1_ecdsa_recoverable_signature *`, if the signature is recoverable.
+        """
+        return self._recoverable
+
+    @property
+    def recovery_id(self) -> Optional[int]:
+        """
+        The recovery id, if the signature is recoverable.
+        """
+        if self._recoverable is None:
+            return None
+
+        return serialize_recoverable(self._recoverable, self.context)[64]
+
+    @property
+    def is_low_s(self) -> bool:
+        """
+        Whether or not the `s` value is in the lower half of the group order, as required by the
+        verification functions of libsecp256k1.
+        """
+        return not lib.secp256k1_ecdsa_signature_normalize(STATIC_CTX, ffi.NULL, self.cdata)
+
+    def normalize(self):
+        """
+        :return: The signature with its `s` value in the lower half of the group order. If it already
+                 was, the signature itself is returned.
+        :rtype: Signature
+        """
+        normalized, cdata = signature_normalize(self.cdata, self.context)
+        if not normalized:
+            return self
+
+        return self._from_cdata(cdata, context=self.context)
+
+    def to_der(self) -> bytes:
+        """
+        :return: The DER-encoded signature.
+        """
+        if self._der is None:
+            self._der = cdata_to_der(self._cdata, self.context)
+
+        return self._der
+
+    def to_compact(self) -> bytes:
+        """
+        :return: The 64 byte compact signature.
+        """
+        return serialize_compact(self.cdata, self.context)
+
+    def to_recoverable(self) -> bytes:
+        """
+        :return: The 65 byte recoverable signature.
+        :raises ValueError: If the signature is not recoverable.
+        """
+        if self._recoverable is None:
+            raise ValueError('The signature is not recoverable.')
+
+        return serialize_recoverable(self._recoverable, self.context)
+
+    def __bytes__(self) -> bytes:
+        return self.to_der()
+
+    def __eq__(self, other) -> bool:
+        return self.to_compact() == other.to_compact()
@@ -1,29 +1,60 @@
+import operator
 import os
-from typing import Optional, Tuple
-
-from asn1crypto.keys import ECDomainParameters, ECPointBitString, ECPrivateKey, PrivateKeyAlgorithm, PrivateKeyInfo
-
-from coincurve.context import GLOBAL_CONTEXT, Context
-from coincurve.ecdsa import cdata_to_der, der_to_cdata, deserialize_recoverable, recover, serialize_recoverable
+from itertools import repeat
+from typing import List, Optional, Sequence, Tuple
+
+from coincurve.cache import PUBLIC_KEY_STRUCT_SIZE, parse_public_key
+from coincurve.context import GLOBAL_CONTEXT, STATIC_CTX, Context
+from coincurve.ecdh import ecdh_many
+from coincurve.ecdsa import (
+    CDATA_SIG_LENGTH,
+    Signature,
+    cdata_to_der,
+    cdata_to_der_into,
+    deserialize_recoverable,
+    recover,
+    serialize_recoverable,
+    serialize_recoverable_into,
+)
 from coincurve.flags import EC_COMPRESSED, EC_UNCOMPRESSED
 from coincurve.types import Hasher, Nonce
 from coincurve.utils import (
     DEFAULT_NONCE,
+    GROUP_ORDER_INT,
+    PUBLIC_KEY_LENGTHS,
+    as_buffer,
+    as_output_buffer,
     bytes_to_int,
     der_to_pem,
     get_valid_secret,
+    get_valid_secrets,
     hex_to_bytes,
     int_to_bytes_padded,
+    iter_pem_blocks,
+    linear_combination,
     pad_scalar,
+    parse_public_keys,
+    parse_signature,
     pem_to_der,
+    serialize_public_keys,
     sha256,
     validate_secret,
 )
 
 from ._libsecp256k1 import ffi, lib
 
+# The PKCS#8 encoding of a secp256k1 private key, as produced by `PrivateKey.to_der` and OpenSSL, is
+# fixed apart from the secret and the uncompressed public key that follow these prefixes.
+PKCS8_PREFIX = bytes.fromhex('308184020100301006072a8648ce3d020106052b8104000a046d306b0201010420')
+PKCS8_PUBLIC_KEY_PREFIX = bytes.fromhex('a144034200')
+PKCS8_LENGTH = len(PKCS8_PREFIX) + 32 + len(PKCS8_PUBLIC_KEY_PREFIX) + 65
+# The same encoding without the optional public key
+PKCS8_PREFIX_NO_PUBLIC_KEY = bytes.fromhex('303e020100301006072a8648ce3d020106052b8104000a042730250201010420')
+
 
 class PrivateKey:
+    __slots__ = ('_public_key', '_public_key_xonly', 'context', 'secret')
+
     def __init__(self, secret: Optional[bytes] = None, context: Context = GLOBAL_CONTEXT):
         """
         :param secret: The secret used to initialize the private key.
@@ -31,8 +62,30 @@ class PrivateKey:
         """
         self.secret: bytes = validate_secret(secret) if secret is not None else get_valid_secret()
         self.context = context
-        self.public_key: PublicKey = PublicKey.from_valid_secret(self.secret, self.context)
-        self.public_key_xonly: PublicKeyXOnly = PublicKeyXOnly.from_valid_secret(self.secret, self.context)
+        self._public_key: Optional[PublicKey] = None
+        self._public_key_xonly: Optional[PublicKeyXOnly] = None
+
+    @property
+    def public_key(self) -> 'PublicKey':
+        """
+        The public key, derived from the secret on first access.
+        """
+        public_key = self._public_key
+        if public_key is None:
+            public_key = self._public_key = PublicKey.from_valid_secret(self.secret, self.context)
+
+        return public_key
+
+    @property
+    def public_key_xonly(self) -> 'PublicKeyXOnly':
+        """
+        The x-only public key, derived from the secret on first access.
+        """
+        public_key_xonly = self._public_key_xonly
+        if public_key_xonly is None:
+            public_key_xonly = self._public_key_xonly = PublicKeyXOnly.from_valid_secret(self.secret, self.context)
+
+        return public_key_xonly
 
     def sign(self, message: bytes, hasher: Hasher = sha256, custom_nonce: Nonce = DEFAULT_NONCE) -> bytes:
         """
@@ -47,6 +100,25 @@ class PrivateKey:
         :raises ValueError: If the message hash was not 32 bytes long, the nonce generation
                             function failed, or the private key was invalid.
         """
+        return cdata_to_der(self._sign(message, hasher, custom_nonce), self.context)
+
+    def sign_into(self, out, message: bytes, hasher: Hasher = sha256, custom_nonce: Nonce = DEFAULT_NONCE) -> int:
+        """
+        Create an ECDSA signature, writing it into a caller-provided buffer.
+
+        :param out: A writable buffer, such as a `bytearray` or `memoryview`. The DER encoding
+                    is at most 72 bytes long.
+        :param message: The message to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :param custom_nonce: Custom nonce data in the form `(nonce_function, input_data)`. Refer to `sign`.
+        :return: The number of bytes written.
+        :raises ValueError: If the message hash was not 32 bytes long, the nonce generation
+                            function failed, the private key was invalid, or `out` was too small.
+        """
+        return cdata_to_der_into(self._sign(message, hasher, custom_nonce), out, self.context)
+
+    def _sign(self, message: bytes, hasher: Hasher, custom_nonce: Nonce):
         msg_hash = hasher(message) if hasher is not None else message
         if len(msg_hash) != 32:
             raise ValueError('Message hash must be 32 bytes long.')
@@ -54,12 +126,14 @@ class PrivateKey:
         signature = ffi.new('secp256k1_ecdsa_signature *')
         nonce_fn, nonce_data = custom_nonce
 
-        signed = lib.secp256k1_ecdsa_sign(self.context.ctx, signature, msg_hash, self.secret, nonce_fn, nonce_data)
+        signed = lib.secp256k1_ecdsa_sign(
+            self.context.ctx, signature, as_buffer(msg_hash), self.secret, nonce_fn, nonce_data
+        )
 
         if not signed:
             raise ValueError('The nonce generation function failed, or the private key was invalid.')
 
-        return cdata_to_der(signature, self.context)
+        return signature
 
     def sign_schnorr(self, message: bytes, aux_randomness: bytes = b'') -> bytes:
         """Create a Schnorr signature.
@@ -71,6 +145,26 @@ class PrivateKey:
         :raises ValueError: If the message was not 32 bytes long, the optional auxiliary random data was not
                             32 bytes long, signing failed, or the signature was invalid.
         """
+        signature = ffi.new('unsigned char[64]')
+        self._sign_schnorr(signature, message, aux_randomness)
+
+        return bytes(ffi.buffer(signature))
+
+    def sign_schnorr_into(self, out, message: bytes, aux_randomness: bytes = b'') -> int:
+        """Create a Schnorr signature, writing it into a caller-provided buffer.
+
+        :param out: A writable buffer of at least 64 bytes, such as a `bytearray` or `memoryview`.
+        :param message: The message to sign.
+        :param aux_randomness: An optional 32 bytes of fresh randomness. Refer to `sign_schnorr`.
+        :return: The number of bytes written, which is always 64.
+        :raises ValueError: If the message was not 32 bytes long, the optional auxiliary random data was not
+                            32 bytes long, signing failed, the signature was invalid, or `out` was too small.
+        """
+        self._sign_schnorr(as_output_buffer(out, 64), message, aux_randomness)
+
+        return 64
+
+    def _sign_schnorr(self, signature, message: bytes, aux_randomness: bytes):
         if len(message) != 32:
             raise ValueError('Message must be 32 bytes long.')
         elif aux_randomness == b'':
@@ -79,13 +173,16 @@ class PrivateKey:
             aux_randomness = ffi.NULL
         elif len(aux_randomness) != 32:
             raise ValueError('Auxiliary random data must be 32 bytes long.')
+        else:
+            aux_randomness = as_buffer(aux_randomness)
+
+        message = as_buffer(message)
 
         keypair = ffi.new('secp256k1_keypair *')
         res = lib.secp256k1_keypair_create(self.context.ctx, keypair, self.secret)
         if not res:
             raise ValueError('Secret was invalid')
 
-        signature = ffi.new('unsigned char[64]')
         res = lib.secp256k1_schnorrsig_sign32(self.context.ctx, signature, message, keypair, aux_randomness)
         if not res:
             raise ValueError('Signing failed')
@@ -96,8 +193,6 @@ class PrivateKey:
         if not res:
             raise ValueError('Invalid signature')
 
-        return bytes(ffi.buffer(signature))
-
     def sign_recoverable(self, message: bytes, hasher: Hasher = sha256, custom_nonce: Nonce = DEFAULT_NONCE) -> bytes:
         """
         Create a recoverable ECDSA signature.
@@ -111,6 +206,29 @@ class PrivateKey:
         :raises ValueError: If the message hash was not 32 bytes long, the nonce generation
                             function failed, or the private key was invalid.
         """
+        return serialize_recoverable(self._sign_recoverable(message, hasher, custom_nonce), self.context)
+
+    def sign_recoverable_into(
+        self, out, message: bytes, hasher: Hasher = sha256, custom_nonce: Nonce = DEFAULT_NONCE
+    ) -> int:
+        """
+        Create a recoverable ECDSA signature, writing it into a caller-provided buffer.
+
+        :param out: A writable buffer of at least 65 bytes, such as a `bytearray` or `memoryview`.
+        :param message: The message to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :param custom_nonce: Custom nonce data in the form `(nonce_function, input_data)`. Refer to
+                             `sign_recoverable`.
+        :return: The number of bytes written, which is always 65.
+        :raises ValueError: If the message hash was not 32 bytes long, the nonce generation
+                            function failed, the private key was invalid, or `out` was too small.
+        """
+        # Reject a small buffer before doing any signing work.
+        as_output_buffer(out, CDATA_SIG_LENGTH + 1)
+        return serialize_recoverable_into(self._sign_recoverable(message, hasher, custom_nonce), out, self.context)
+
+    def _sign_recoverable(self, message: bytes, hasher: Hasher, custom_nonce: Nonce):
         msg_hash = hasher(message) if hasher is not None else message
         if len(msg_hash) != 32:
             raise ValueError('Message hash must be 32 bytes long.')
@@ -119,15 +237,15 @@ class PrivateKey:
         nonce_fn, nonce_data = custom_nonce
 
         signed = lib.secp256k1_ecdsa_sign_recoverable(
-            self.context.ctx, signature, msg_hash, self.secret, nonce_fn, nonce_data
+            self.context.ctx, signature, as_buffer(msg_hash), self.secret, nonce_fn, nonce_data
         )
 
         if not signed:
             raise ValueError('The nonce generation function failed, or the private key was invalid.')
 
-        return serialize_recoverable(signature, self.context)
+        return signature
 
-    def ecdh(self, public_key: bytes) -> bytes:
+    def ecdh(self, public_key, hasher: Hasher = sha256) -> bytes:
         """
         Compute an EC Diffie-Hellman secret in constant time.
 
@@ -135,15 +253,36 @@ class PrivateKey:
             This prevents malleability by returning `sha256(compressed_public_key)` instead of the `x` coordinate
             directly. See #9.
 
-        :param public_key: The formatted public key.
-        :return: The 32 byte shared secret.
+        :param public_key: The formatted public key, or a `PublicKey` object.
+        :type public_key: bytes | PublicKey
+        :param hasher: The hash function applied to the compressed shared point. By default, the
+                       `sha256` algorithm is used, which runs natively within libsecp256k1. If `None`,
+                       the compressed shared point is returned. Refer to `coincurve.ecdh` for other
+                       variants such as the raw `x` coordinate or a KDF.
+        :return: The shared secret, which is 32 bytes long by default.
         :raises ValueError: If the public key could not be parsed or was invalid.
         """
-        secret = ffi.new('unsigned char [32]')
+        if isinstance(public_key, PublicKey):
+            public_key = public_key.public_key
 
-        lib.secp256k1_ecdh(self.context.ctx, secret, PublicKey(public_key).public_key, self.secret, ffi.NULL, ffi.NULL)
+        return ecdh_many(self.secret, (public_key,), hasher, self.context)[0]
+
+    def ecdh_many(self, public_keys, hasher: Hasher = sha256) -> List[bytes]:
+        """
+        Compute EC Diffie-Hellman secrets against many peers in constant time.
 
-        return bytes(ffi.buffer(secret, 32))
+        :param public_keys: A sequence of formatted public keys or `PublicKey` objects.
+        :type public_keys: Sequence[bytes | PublicKey]
+        :param hasher: The hash function applied to the compressed shared point. Refer to `ecdh`.
+        :return: The shared secrets, in the same order as `public_keys`.
+        :raises ValueError: If a public key could not be parsed or was invalid.
+        """
+        return ecdh_many(
+            self.secret,
+            [pk.public_key if isinstance(pk, PublicKey) else pk for pk in public_keys],
+            hasher,
+            self.context,
+        )
 
     def add(self, scalar: bytes, update: bool = False):
         """
@@ -219,26 +358,46 @@ class PrivateKey:
         """
         :return: The private key encoded in DER format.
         """
-        pk = ECPrivateKey(
-            {
-                'version': 'ecPrivkeyVer1',
-                'private_key': self.to_int(),
-                'public_key': ECPointBitString(self.public_key.format(compressed=False)),
-            }
-        )
+        return b''.join((PKCS8_PREFIX, self.secret, PKCS8_PUBLIC_KEY_PREFIX, self.public_key.format(compressed=False)))
 
-        return PrivateKeyInfo(
-            {
-                'version': 0,
-                'private_key_algorithm': PrivateKeyAlgorithm(
-                    {
-                        'algorithm': 'ec',
-                        'parameters': ECDomainParameters(name='named', value='1.3.132.0.10'),
-                    }
-                ),
-                'private_key': pk,
-            }
-        ).dump()
+    @classmethod
+    def generate_many(
+        cls, n: int, public_keys: bool = False, compressed: bool = True, context: Context = GLOBAL_CONTEXT
+    ) -> Tuple[bytes, Optional[bytes]]:
+        """
+        Generate many private keys without creating an object for each of them.
+
+        :param n: The number of private keys.
+        :param public_keys: Whether or not to also derive the formatted public keys.
+        :param compressed: Whether or to use the compressed format for the public keys.
+        :param context:
+        :return: The 32 byte secrets concatenated together, and the formatted public keys concatenated
+                 together in the same order if `public_keys` is `True`, otherwise `None`.
+        """
+        secrets = get_valid_secrets(n, context)
+        if not public_keys:
+            return secrets, None
+
+        length = 33 if compressed else 65
+        flags = EC_COMPRESSED if compressed else EC_UNCOMPRESSED
+        serialized = bytearray(length * n)
+
+        ctx = context.ctx
+        pubkey_create = lib.secp256k1_ec_pubkey_create
+        pubkey_serialize = lib.secp256k1_ec_pubkey_serialize
+        secrets_buffer = ffi.from_buffer('unsigned char[]', secrets)
+        output = ffi.from_buffer('unsigned char[]', serialized, require_writable=True)
+        public_key = ffi.new('secp256k1_pubkey *')
+        output_len = ffi.new('size_t *')
+
+        for i in range(n):
+            if not pubkey_create(ctx, public_key, secrets_buffer + i * 32):  # no cov
+                raise ValueError('Invalid secret.')
+
+            output_len[0] = length
+            pubkey_serialize(ctx, output + i * length, output_len, public_key, flags)
+
+        return secrets, bytes(serialized)
 
     @classmethod
     def from_hex(cls, hexed: str, context: Context = GLOBAL_CONTEXT):
@@ -268,9 +427,22 @@ class PrivateKey:
         :return: The private key.
         :rtype: PrivateKey
         """
-        return PrivateKey(
-            int_to_bytes_padded(PrivateKeyInfo.load(pem_to_der(pem)).native['private_key']['private_key']), context
-        )
+        return PrivateKey.from_der(pem_to_der(pem), context)
+
+    @classmethod
+    def iter_pem(cls, stream, context: Context = GLOBAL_CONTEXT):
+        """
+        Read private keys one at a time from a stream of concatenated PEM blocks, such as a
+        file opened in binary mode, without loading all of it into memory.
+
+        :param stream: An iterable of lines.
+        :param context:
+        :return: A generator of the private keys.
+        :rtype: Iterator[PrivateKey]
+        :raises ValueError: If the last PEM block was not terminated.
+        """
+        for der in iter_pem_blocks(stream):
+            yield PrivateKey.from_der(der, context)
 
     @classmethod
     def from_der(cls, der: bytes, context: Context = GLOBAL_CONTEXT):
@@ -280,35 +452,51 @@ class PrivateKey:
         :return: The private key.
         :rtype: PrivateKey
         """
+        secret_end = len(PKCS8_PREFIX) + 32
+        if (
+            len(der) == PKCS8_LENGTH
+            and der.startswith(PKCS8_PREFIX)
+            and der.startswith(PKCS8_PUBLIC_KEY_PREFIX, secret_end)
+        ):
+            return PrivateKey(der[len(PKCS8_PREFIX) : secret_end], context)
+        elif len(der) == len(PKCS8_PREFIX_NO_PUBLIC_KEY) + 32 and der.startswith(PKCS8_PREFIX_NO_PUBLIC_KEY):
+            return PrivateKey(der[len(PKCS8_PREFIX_NO_PUBLIC_KEY) :], context)
+
+        # Any other encoding, such as one with explicit parameters or a shorter secret. The
+        # ASN.1 parser is only imported here as it dominates the import time of the package.
+        from asn1crypto.keys import PrivateKeyInfo
+
         return PrivateKey(int_to_bytes_padded(PrivateKeyInfo.load(der).native['private_key']['private_key']), context)
 
     def _update_public_key(self):
-        created = lib.secp256k1_ec_pubkey_create(self.context.ctx, self.public_key.public_key, self.secret)
-
-        if not created:
-            raise ValueError('Invalid secret.')
+        # The public keys are derived again from the new secret when next accessed.
+        self._public_key = None
+        self._public_key_xonly = None
 
     def __eq__(self, other) -> bool:
         return self.secret == other.secret
 
 
 class PublicKey:
+    __slots__ = ('context', 'public_key')
+
     def __init__(self, data, context: Context = GLOBAL_CONTEXT):
         """
         :param data: The formatted public key. This class supports parsing
                      compressed (33 bytes, header byte `0x02` or `0x03`),
                      uncompressed (65 bytes, header byte `0x04`), or
                      hybrid (65 bytes, header byte `0x06` or `0x07`) format public keys.
+                     Any buffer-protocol object, such as a `bytearray` or `memoryview`, is accepted.
         :type data: bytes
         :param context:
         :raises ValueError: If the public key could not be parsed or was invalid.
         """
-        if not isinstance(data, bytes):
+        if isinstance(data, ffi.CData):
             self.public_key = data
         else:
             public_key = ffi.new('secp256k1_pubkey *')
 
-            parsed = lib.secp256k1_ec_pubkey_parse(context.ctx, public_key, data, len(data))
+            parsed = parse_public_key(public_key, data, context)
 
             if not parsed:
                 raise ValueError('The public key could not be parsed or is invalid.')
@@ -340,6 +528,99 @@ class PublicKey:
 
         return PublicKey(public_key, context)
 
+    @classmethod
+    def linear_combination(cls, scalars: Sequence[bytes], points, context: Context = GLOBAL_CONTEXT):
+        """
+        Compute `scalars[0] * points[0] + scalars[1] * points[1] + ...` in one pass, in variable time. Large
+        inputs use the bucket (Pippenger) method, which costs far fewer point operations per term than
+        separate multiplications.
+
+        !!! warning
+            Only use this with public scalars, as the computation time depends on their values.
+
+        :param scalars: The 32 byte scalars, each less than the group order. Zero scalars are allowed.
+        :param points: A `PublicKeyArray`, or a sequence of `PublicKey` objects or formatted public keys.
+        :param context:
+        :return: The public key.
+        :rtype: PublicKey
+        :raises ValueError: If the inputs did not have the same, non-zero number of items, a scalar was
+                            invalid, a public key could not be parsed or was invalid, or the result was
+                            the point at infinity.
+        """
+        if not isinstance(points, PublicKeyArray):
+            points = PublicKeyArray(points, context)
+
+        count = len(points)
+        if not count or len(scalars) != count:
+            raise ValueError('There must be as many scalars as points, and at least one of each.')
+
+        if any(len(scalar) != 32 for scalar in scalars):
+            raise ValueError('Scalars must be 32 bytes long.')
+
+        public_key = ffi.new('secp256k1_pubkey *')
+        if not linear_combination(public_key, b''.join(scalars), points._public_keys, context):
+            raise ValueError('The linear combination is the point at infinity.')
+
+        return PublicKey(public_key, context)
+
+    @classmethod
+    def iter_sequence(
+        cls, start_secret: bytes, step: int = 1, count: Optional[int] = None, context: Context = GLOBAL_CONTEXT
+    ):
+        """
+        Derive the public keys of the secrets `start_secret`, `start_secret + step`, `start_secret + 2 * step`
+        and so on. Only the first key costs a multiplication, every following key is the sum of the
+        previous one and `step * G`. For many keys at once, `PublicKeyArray.from_sequence` is faster.
+
+        :param start_secret: The first private key secret.
+        :param step: The difference between consecutive secrets, modulo the group order.
+        :param count: The number of public keys. By default, the sequence never ends.
+        :param context:
+        :return: An iterator of public keys.
+        :rtype: Iterator[PublicKey]
+        :raises ValueError: If the first secret was invalid or `step` was a multiple of the group order.
+                            While iterating, if a secret of the sequence is zero.
+        """
+        first, step_point = cls._sequence_start(start_secret, step, context)
+        return cls._iter_sequence(first, step_point, count, context)
+
+    @classmethod
+    def _iter_sequence(cls, first, step_point, count: Optional[int], context: Context):
+        ctx = STATIC_CTX
+        pubkey_combine = lib.secp256k1_ec_pubkey_combine
+        summands = ffi.new('secp256k1_pubkey *[2]', (first, step_point))
+
+        if count is not None and count < 1:
+            return
+
+        yield PublicKey(first, context)
+
+        # The pointer array does not own the previous key, which the caller may already have dropped
+        previous = first
+        remaining = repeat(None) if count is None else repeat(None, count - 1)
+        for _ in remaining:
+            # The sum must not overwrite its summand, as the previous key is still referenced
+            public_key = ffi.new('secp256k1_pubkey *')
+            summands[0] = previous
+            if not pubkey_combine(ctx, public_key, summands, 2):
+                raise ValueError('The sequence reached a secret of zero.')
+
+            previous = public_key
+            yield PublicKey(public_key, context)
+
+    @staticmethod
+    def _sequence_start(start_secret: bytes, step: int, context: Context):
+        step %= GROUP_ORDER_INT
+        if not step:
+            raise ValueError('The step must not be a multiple of the group order.')
+
+        first = ffi.new('secp256k1_pubkey *')
+        step_point = ffi.new('secp256k1_pubkey *')
+        lib.secp256k1_ec_pubkey_create(context.ctx, first, validate_secret(start_secret))
+        lib.secp256k1_ec_pubkey_create(context.ctx, step_point, int_to_bytes_padded(step))
+
+        return first, step_point
+
     @classmethod
     def from_valid_secret(cls, secret: bytes, context: Context = GLOBAL_CONTEXT):
         public_key = ffi.new('secp256k1_pubkey *')
@@ -371,18 +652,25 @@ class PublicKey:
         """
         Recover an ECDSA public key from a recoverable signature.
 
-        :param signature: The recoverable ECDSA signature.
+        :param signature: The recoverable ECDSA signature, or a recoverable `Signature` object.
+        :type signature: bytes | Signature
         :param message: The message that was supposedly signed.
         :param hasher: The hash function to use, which must return 32 bytes. By default,
                        the `sha256` algorithm is used. If `None`, no hashing occurs.
         :param context:
         :return: The public key that signed the message.
         :rtype: PublicKey
-        :raises ValueError: If the message hash was not 32 bytes long or recovery of the ECDSA public key failed.
+        :raises ValueError: If the message hash was not 32 bytes long, the signature was not recoverable,
+                            or recovery of the ECDSA public key failed.
         """
-        return PublicKey(
-            recover(message, deserialize_recoverable(signature, context=context), hasher=hasher, context=context)
-        )
+        if isinstance(signature, Signature):
+            recover_sig = signature.recoverable_cdata
+            if recover_sig is None:
+                raise ValueError('The signature is not recoverable.')
+        else:
+            recover_sig = deserialize_recoverable(signature, context=context)
+
+        return PublicKey(recover(message, recover_sig, hasher=hasher, context=context))
 
     @classmethod
     def combine_keys(cls, public_keys, context: Context = GLOBAL_CONTEXT):
@@ -399,7 +687,7 @@ class PublicKey:
         public_key = ffi.new('secp256k1_pubkey *')
 
         combined = lib.secp256k1_ec_pubkey_combine(
-            context.ctx, public_key, [pk.public_key for pk in public_keys], len(public_keys)
+            STATIC_CTX, public_key, [pk.public_key for pk in public_keys], len(public_keys)
         )
 
         if not combined:
@@ -419,11 +707,33 @@ class PublicKey:
         output_len = ffi.new('size_t *', length)
 
         lib.secp256k1_ec_pubkey_serialize(
-            self.context.ctx, serialized, output_len, self.public_key, EC_COMPRESSED if compressed else EC_UNCOMPRESSED
+            STATIC_CTX, serialized, output_len, self.public_key, EC_COMPRESSED if compressed else EC_UNCOMPRESSED
         )
 
         return bytes(ffi.buffer(serialized, length))
 
+    def format_into(self, out, compressed: bool = True) -> int:
+        """
+        Format the public key, writing it into a caller-provided buffer.
+
+        :param out: A writable buffer, such as a `bytearray` or `memoryview`.
+        :param compressed: Whether or to use the compressed format.
+        :return: The number of bytes written, which is 33, or 65 if `compressed` is `False`.
+        :raises ValueError: If `out` was too small.
+        """
+        length = 33 if compressed else 65
+        output_len = ffi.new('size_t *', length)
+
+        lib.secp256k1_ec_pubkey_serialize(
+            STATIC_CTX,
+            as_output_buffer(out, length),
+            output_len,
+            self.public_key,
+            EC_COMPRESSED if compressed else EC_UNCOMPRESSED,
+        )
+
+        return length
+
     def point(self) -> Tuple[int, int]:
         """
         :return: The public key as a coordinate point.
@@ -433,7 +743,9 @@ class PublicKey:
 
     def verify(self, signature: bytes, message: bytes, hasher: Hasher = sha256) -> bool:
         """
-        :param signature: The ECDSA signature.
+        :param signature: The DER-encoded ECDSA signature, or a `Signature` object, which is only parsed once
+                          no matter how many times it is verified.
+        :type signature: bytes | Signature
         :param message: The message that was supposedly signed.
         :param hasher: The hash function to use, which must return 32 bytes. By default,
                        the `sha256` algorithm is used. If `None`, no hashing occurs.
@@ -444,7 +756,11 @@ class PublicKey:
         if len(msg_hash) != 32:
             raise ValueError('Message hash must be 32 bytes long.')
 
-        verified = lib.secp256k1_ecdsa_verify(self.context.ctx, der_to_cdata(signature), msg_hash, self.public_key)
+        sig = parse_signature(signature, self.context)
+        if sig is None:
+            raise ValueError('The DER-encoded signature could not be parsed.')
+
+        verified = lib.secp256k1_ecdsa_verify(STATIC_CTX, sig, as_buffer(msg_hash), self.public_key)
 
         # A performance hack to avoid global bool() lookup.
         return not not verified
@@ -463,7 +779,7 @@ class PublicKey:
 
         new_key = ffi.new('secp256k1_pubkey *', self.public_key[0])
 
-        success = lib.secp256k1_ec_pubkey_tweak_add(self.context.ctx, new_key, scalar)
+        success = lib.secp256k1_ec_pubkey_tweak_add(STATIC_CTX, new_key, scalar)
 
         if not success:
             raise ValueError('The tweak was out of range, or the resulting public key is invalid.')
@@ -487,7 +803,7 @@ class PublicKey:
 
         new_key = ffi.new('secp256k1_pubkey *', self.public_key[0])
 
-        lib.secp256k1_ec_pubkey_tweak_mul(self.context.ctx, new_key, scalar)
+        lib.secp256k1_ec_pubkey_tweak_mul(STATIC_CTX, new_key, scalar)
 
         if update:
             self.public_key = new_key
@@ -509,7 +825,7 @@ class PublicKey:
         new_key = ffi.new('secp256k1_pubkey *')
 
         combined = lib.secp256k1_ec_pubkey_combine(
-            self.context.ctx, new_key, [pk.public_key for pk in [self, *public_keys]], len(public_keys) + 1
+            STATIC_CTX, new_key, [pk.public_key for pk in [self, *public_keys]], len(public_keys) + 1
         )
 
         if not combined:
@@ -525,20 +841,335 @@ class PublicKey:
         return self.format(compressed=False) == other.format(compressed=False)
 
 
+class PublicKeyArray:
+    __slots__ = ('_public_keys', 'context')
+
+    def __init__(self, public_keys=(), context: Context = GLOBAL_CONTEXT):
+        """
+        A compact array of public keys stored as one contiguous buffer of `secp256k1_pubkey` structs.
+
+        Holding many keys this way costs 64 bytes per key rather than a Python object, a cffi
+        wrapper and a finalizer for each of them.
+
+        :param public_keys: A sequence of `PublicKey` objects or formatted public keys.
+        :type public_keys: Sequence[PublicKey | bytes]
+        :param context:
+        :raises ValueError: If a public key could not be parsed or was invalid.
+        """
+        count = len(public_keys)
+        structs = ffi.new('secp256k1_pubkey[]', count)
+
+        for i, public_key in enumerate(public_keys):
+            if isinstance(public_key, PublicKey):
+                ffi.memmove(structs + i, public_key.public_key, PUBLIC_KEY_STRUCT_SIZE)
+            elif not parse_public_key(structs + i, public_key, context):
+                raise ValueError(f'The public key at index {i} could not be parsed or is invalid.')
+
+        self._public_keys = structs
+        self.context = context
+
+    @classmethod
+    def _from_structs(cls, structs, context: Context):
+        array = cls.__new__(cls)
+        array._public_keys = structs
+        array.context = context
+        return array
+
+    @classmethod
+    def from_packed(cls, data, compressed: bool = True, context: Context = GLOBAL_CONTEXT):
+        """
+        Parse formatted public keys that are concatenated together.
+
+        :param data: The public keys, as any buffer-protocol object.
+        :param compressed: Whether the public keys are in the compressed (33 bytes) or the
+                           uncompressed (65 bytes) format.
+        :param context:
+        :return: The public key array.
+        :rtype: PublicKeyArray
+        :raises ValueError: If the length of `data` is not a multiple of the key size or a public
+                            key could not be parsed or was invalid.
+        """
+        array, invalid = cls.parse(data, 33 if compressed else 65, context)
+        if invalid:
+            raise ValueError(f'The public key at index {invalid[0]} could not be parsed or is invalid.')
+
+        return array
+
+    @classmethod
+    def parse(cls, data, key_length: int = 33, context: Context = GLOBAL_CONTEXT):
+        """
+        Parse formatted public keys that are concatenated together, skipping the invalid ones.
+
+        :param data: The public keys, as any buffer-protocol object.
+        :param key_length: The length of every public key: 32 (x-only, as defined by BIP 340),
+                           33 (compressed) or 65 (uncompressed or hybrid).
+        :param context:
+        :return: The public key array holding every valid key in order, and the indices of the keys
+                 that could not be parsed or were invalid.
+        :rtype: Tuple[PublicKeyArray, List[int]]
+        :raises ValueError: If `key_length` was not supported or the length of `data` was not a multiple of it.
+        """
+        if key_length not in PUBLIC_KEY_LENGTHS:
+            raise ValueError('Public key length must be 32 (x-only), 33 (compressed) or 65 (uncompressed).')
+        if len(data) % key_length:
+            raise ValueError(f'Packed public keys must be a multiple of {key_length} bytes long.')
+
+        structs = ffi.new('secp256k1_pubkey[]', len(data) // key_length)
+        invalid = parse_public_keys(structs, data, key_length, context)
+
+        if invalid:
+            valid = ffi.new('secp256k1_pubkey[]', len(structs) - len(invalid))
+            skip = set(invalid)
+            j = 0
+            for i in range(len(structs)):
+                if i not in skip:
+                    valid[j] = structs[i]
+                    j += 1
+
+            structs = valid
+
+        return cls._from_structs(structs, context), invalid
+
+    @classmethod
+    def from_sequence(cls, start_secret: bytes, count: int, step: int = 1, context: Context = GLOBAL_CONTEXT):
+        """
+        Derive the public keys of the secrets `start_secret`, `start_secret + step`, ... up to
+        `start_secret + (count - 1) * step`, each of which is the sum of the previous key and `step * G`.
+        This is several times faster than deriving every key from its secret.
+
+        :param start_secret: The first private key secret.
+        :param count: The number of public keys.
+        :param step: The difference between consecutive secrets, modulo the group order.
+        :param context:
+        :return: The public key array.
+        :rtype: PublicKeyArray
+        :raises ValueError: If the first secret was invalid, `step` was a multiple of the group order
+                            or a secret of the sequence was zero.
+        """
+        first, step_point = PublicKey._sequence_start(start_secret, step, context)
+
+        ctx = STATIC_CTX
+        pubkey_combine = lib.secp256k1_ec_pubkey_combine
+        structs = ffi.new('secp256k1_pubkey[]', count)
+        summands = ffi.new('secp256k1_pubkey *[2]', (first, step_point))
+
+        if count:
+            structs[0] = first[0]
+
+        for i in range(1, count):
+            summands[0] = structs + (i - 1)
+            if not pubkey_combine(ctx, structs + i, summands, 2):
+                raise ValueError(f'The secret at index {i} of the sequence is zero.')
+
+        return cls._from_structs(structs, context)
+
+    @classmethod
+    def from_buffer(cls, data, context: Context = GLOBAL_CONTEXT):
+        """
+        Load public keys exported by `buffer`.
+
+        !!! warning
+            Structs are loaded as they are. Only all-zero structs, which would make libsecp256k1 abort
+            the process, are rejected. Any other data that did not come from `buffer` yields garbage keys.
+
+        :param data: The raw `secp256k1_pubkey` structs, as any buffer-protocol object.
+        :param context:
+        :return: The public key array.
+        :rtype: PublicKeyArray
+        :raises ValueError: If the length of `data` is not a multiple of the struct size, or a struct
+                            was all zeros.
+        """
+        buffer = ffi.from_buffer('unsigned char[]', data)
+        if len(buffer) % PUBLIC_KEY_STRUCT_SIZE:
+            raise ValueError(f'Public key structs must be a multiple of {PUBLIC_KEY_STRUCT_SIZE} bytes long.')
+
+        count = len(buffer) // PUBLIC_KEY_STRUCT_SIZE
+        structs = ffi.new('secp256k1_pubkey[]', count)
+        ffi.memmove(structs, buffer, len(buffer))
+
+        raw = ffi.buffer(structs)
+        empty = bytes(PUBLIC_KEY_STRUCT_SIZE)
+        for i in range(count):
+            if raw[i * PUBLIC_KEY_STRUCT_SIZE : (i + 1) * PUBLIC_KEY_STRUCT_SIZE] == empty:
+                raise ValueError(f'The public key struct at index {i} is empty.')
+
+        return cls._from_structs(structs, context)
+
+    def buffer(self) -> memoryview:
+        """
+        Export the raw `secp256k1_pubkey` structs without copying them.
+
+        !!! warning
+            The structs are an opaque, platform-dependent representation. Use `format` for storage
+            or transmission and only load the buffer with `from_buffer` on the same machine.
+
+        :return: A writable view of the 64 byte structs concatenated together.
+        """
+        return memoryview(ffi.buffer(self._public_keys))
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return self.buffer()
+
+    def format(self, compressed: bool = True) -> bytes:
+        """
+        Format every public key.
+
+        :param compressed: Whether or to use the compressed format.
+        :return: The formatted public keys concatenated together, 33 bytes each, or 65 bytes each if
+                 `compressed` is `False`.
+        """
+        serialized = bytearray((33 if compressed else 65) * len(self._public_keys))
+        self.format_into(serialized, compressed)
+
+        return bytes(serialized)
+
+    def format_into(self, out, compressed: bool = True) -> int:
+        """
+        Format every public key, writing them into a caller-provided buffer.
+
+        :param out: A writable buffer, such as a `bytearray` or `memoryview`.
+        :param compressed: Whether or to use the compressed format.
+        :return: The number of bytes written.
+        :raises ValueError: If `out` was too small.
+        """
+        return serialize_public_keys(out, self._public_keys, 33 if compressed else 65, context=self.context)
+
+    def format_xonly(self) -> bytes:
+        """
+        Format every public key as a BIP 340 x-only public key, dropping the parity of the y coordinate.
+
+        :return: The 32 byte x coordinates concatenated together.
+        """
+        serialized = bytearray(32 * len(self._public_keys))
+        serialize_public_keys(serialized, self._public_keys, 32, context=self.context)
+
+        return bytes(serialized)
+
+    def combine(self) -> PublicKey:
+        """
+        Add every public key together.
+
+        :return: The combined public key.
+        :raises ValueError: If the array was empty or the sum of the public keys was invalid.
+        """
+        count = len(self._public_keys)
+        structs = self._public_keys
+        pointers = ffi.new('secp256k1_pubkey *[]', [structs + i for i in range(count)])
+        public_key = ffi.new('secp256k1_pubkey *')
+
+        if not count or not lib.secp256k1_ec_pubkey_combine(STATIC_CTX, public_key, pointers, count):
+            raise ValueError('The sum of the public keys is invalid.')
+
+        return PublicKey(public_key, self.context)
+
+    def add(self, scalars: bytes, update: bool = False):
+        """
+        Add scalars to the public keys.
+
+        :param scalars: A single scalar that is added to every public key, or one 32 byte scalar
+                        per public key concatenated together.
+        :param update: Whether or not to update and return the array in-place.
+        :return: The new array, or the modified array if `update` is `True`.
+        :rtype: PublicKeyArray
+        :raises ValueError: If the length of `scalars` was invalid, a tweak was out of range or a resulting
+                            public key was invalid.
+        """
+        return self._tweak(lib.secp256k1_ec_pubkey_tweak_add, scalars, update)
+
+    def multiply(self, scalars: bytes, update: bool = False):
+        """
+        Multiply the public keys by scalars.
+
+        :param scalars: A single scalar by which every public key is multiplied, or one 32 byte
+                        scalar per public key concatenated together.
+        :param update: Whether or not to update and return the array in-place.
+        :return: The new array, or the modified array if `update` is `True`.
+        :rtype: PublicKeyArray
+        :raises ValueError: If the length of `scalars` was invalid or a scalar was out of range.
+        """
+        return self._tweak(lib.secp256k1_ec_pubkey_tweak_mul, scalars, update)
+
+    def _tweak(self, tweak, scalars: bytes, update: bool):
+        count = len(self._public_keys)
+        if len(scalars) == 32 * count and count > 1:
+            buffer = ffi.from_buffer('unsigned char[]', scalars)
+            tweaks = (buffer + offset for offset in range(0, 32 * count, 32))
+        elif len(scalars) <= 32:
+            tweaks = repeat(pad_scalar(bytes(scalars)), count)
+        else:
+            raise ValueError(
+                f'Scalars must be a single scalar of up to 32 bytes, or {count} concatenated 32 byte scalars.'
+            )
+
+        # The tweaks are applied to a copy so that a failure leaves the array untouched.
+        structs = ffi.new('secp256k1_pubkey[]', count)
+        ffi.memmove(structs, self._public_keys, count * PUBLIC_KEY_STRUCT_SIZE)
+
+        ctx = STATIC_CTX
+        for i, scalar in enumerate(tweaks):
+            if not tweak(ctx, structs + i, scalar):
+                raise ValueError(f'The tweak at index {i} was out of range, or the resulting public key is invalid.')
+
+        if update:
+            self._public_keys = structs
+            return self
+
+        return self._from_structs(structs, self.context)
+
+    def __len__(self) -> int:
+        return len(self._public_keys)
+
+    def __getitem__(self, index):
+        structs = self._public_keys
+
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(structs)))
+            new_structs = ffi.new('secp256k1_pubkey[]', len(indices))
+            if indices.step == 1:
+                ffi.memmove(new_structs, structs + indices.start, len(indices) * PUBLIC_KEY_STRUCT_SIZE)
+            else:
+                for i, j in enumerate(indices):
+                    new_structs[i] = structs[j]
+
+            return self._from_structs(new_structs, self.context)
+
+        try:
+            index = operator.index(index)
+        except TypeError:
+            raise TypeError(f'Indices must be integers or slices, not {type(index).__name__}.') from None
+
+        count = len(structs)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('Public key index out of range.')
+
+        return PublicKey(ffi.new('secp256k1_pubkey *', structs[index]), self.context)
+
+    def __iter__(self):
+        for i in range(len(self._public_keys)):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        return self.format(compressed=False) == other.format(compressed=False)
+
+
 class PublicKeyXOnly:
+    __slots__ = ('context', 'parity', 'public_key')
+
     def __init__(self, data, parity: bool = False, context: Context = GLOBAL_CONTEXT):
         """A BIP340 `x-only` public key.
 
-        :param data: The formatted public key.
+        :param data: The formatted public key, as any buffer-protocol object.
         :type data: bytes
         :param parity: Whether the encoded point is the negation of the public key.
         :param context:
         """
-        if not isinstance(data, bytes):
+        if isinstance(data, ffi.CData):
             self.public_key = data
         else:
             public_key = ffi.new('secp256k1_xonly_pubkey *')
-            parsed = lib.secp256k1_xonly_pubkey_parse(context.ctx, public_key, data)
+            parsed = len(data) == 32 and lib.secp256k1_xonly_pubkey_parse(STATIC_CTX, public_key, as_buffer(data))
             if not parsed:
                 raise ValueError('The public key could not be parsed or is invalid.')
 
@@ -586,12 +1217,25 @@ class PublicKeyXOnly:
         """
         output32 = ffi.new('unsigned char [32]')
 
-        res = lib.secp256k1_xonly_pubkey_serialize(self.context.ctx, output32, self.public_key)
+        res = lib.secp256k1_xonly_pubkey_serialize(STATIC_CTX, output32, self.public_key)
         if not res:
             raise ValueError('Public key in self.public_key must be valid')
 
         return bytes(ffi.buffer(output32, 32))
 
+    def format_into(self, out) -> int:
+        """Serialize the public key, writing it into a caller-provided buffer.
+
+        :param out: A writable buffer of at least 32 bytes, such as a `bytearray` or `memoryview`.
+        :return: The number of bytes written, which is always 32.
+        :raises ValueError: If `out` was too small.
+        """
+        res = lib.secp256k1_xonly_pubkey_serialize(STATIC_CTX, as_output_buffer(out, 32), self.public_key)
+        if not res:
+            raise ValueError('Public key in self.public_key must be valid')
+
+        return 32
+
     def verify(self, signature: bytes, message: bytes) -> bool:
         """Verify a Schnorr signature over a given message.
 
@@ -603,9 +1247,65 @@ class PublicKeyXOnly:
             raise ValueError('Signature must be 32 bytes long.')
 
         return not not lib.secp256k1_schnorrsig_verify(
-            self.context.ctx, signature, message, len(message), self.public_key
+            STATIC_CTX, as_buffer(signature), as_buffer(message), len(message), self.public_key
         )
 
+    @classmethod
+    def verify_batch(
+        cls,
+        signatures: Sequence[bytes],
+        messages: Sequence[bytes],
+        public_keys,
+        find_invalid: bool = False,
+        context: Context = GLOBAL_CONTEXT,
+    ) -> Tuple[bool, List[int]]:
+        """Verify a batch of Schnorr signatures, producing a single accept/reject result.
+
+        Verification stops at the first invalid item unless `find_invalid` is set, in which
+        case every item is checked so that all of the bad entries can be reported.
+
+        :param signatures: A sequence of 64-byte Schnorr signatures.
+        :param messages: A sequence of messages that were supposedly signed.
+        :param public_keys: A sequence of x-only public keys, either as `PublicKeyXOnly`
+                            objects or serialized as 32 bytes.
+        :type public_keys: Sequence[PublicKeyXOnly | bytes]
+        :param find_invalid: Whether or not to check every item after a failure to find all invalid entries.
+        :param context:
+        :return: A boolean indicating whether or not every signature is correct, and the indices of
+                 the invalid entries (only the first one unless `find_invalid` is `True`).
+        :raises ValueError: If the inputs do not have the same number of items.
+        """
+        count = len(signatures)
+        if len(messages) != count or len(public_keys) != count:
+            raise ValueError('The number of signatures, messages and public keys must be the same.')
+
+        ctx = STATIC_CTX
+        xonly_pubkey_parse = lib.secp256k1_xonly_pubkey_parse
+        schnorrsig_verify = lib.secp256k1_schnorrsig_verify
+        parsed = ffi.new('secp256k1_xonly_pubkey *')
+
+        invalid = []
+        for i, (signature, message, public_key) in enumerate(zip(signatures, messages, public_keys)):
+            if isinstance(public_key, PublicKeyXOnly):
+                public_key = public_key.public_key
+            elif len(public_key) != 32 or not xonly_pubkey_parse(ctx, parsed, as_buffer(public_key)):
+                public_key = None
+            else:
+                public_key = parsed
+
+            signature = as_buffer(signature)
+            message = as_buffer(message)
+            if (
+                public_key is None
+                or len(signature) != 64
+                or not schnorrsig_verify(ctx, signature, message, len(message), public_key)
+            ):
+                invalid.append(i)
+                if not find_invalid:
+                    break
+
+        return not invalid, invalid
+
     def tweak_add(self, scalar: bytes):
         """Add a scalar to the public key.
 
@@ -617,14 +1317,14 @@ class PublicKeyXOnly:
         scalar = pad_scalar(scalar)
 
         out_pubkey = ffi.new('secp256k1_pubkey *')
-        res = lib.secp256k1_xonly_pubkey_tweak_add(self.context.ctx, out_pubkey, self.public_key, scalar)
+        res = lib.secp256k1_xonly_pubkey_tweak_add(STATIC_CTX, out_pubkey, self.public_key, scalar)
         if not res:
             raise ValueError('The tweak was out of range, or the resulting public key would be invalid')
 
         pk_parity = ffi.new('int *')
-        lib.secp256k1_xonly_pubkey_from_pubkey(self.context.ctx, self.public_key, pk_parity, out_pubkey)
+        lib.secp256k1_xonly_pubkey_from_pubkey(STATIC_CTX, self.public_key, pk_parity, out_pubkey)
         self.parity = not not pk_parity[0]
 
     def __eq__(self, other) -> bool:
-        res = lib.secp256k1_xonly_pubkey_cmp(self.context.ctx, self.public_key, other.public_key)
+        res = lib.secp256k1_xonly_pubkey_cmp(STATIC_CTX, self.public_key, other.public_key)
         return res == 0
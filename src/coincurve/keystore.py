@@ -0,0 +1,297 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Optional
+
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.flags import EC_COMPRESSED
+from coincurve.keys import PrivateKey
+from coincurve.types import Hasher, Nonce
+from coincurve.utils import DEFAULT_NONCE, sha256
+
+from ._libsecp256k1 import ffi, lib
+
+# The file starts with a header, followed by fixed-width records of the secret and the compressed
+# public key, and ends with an open-addressing hash table mapping x coordinates to records:
+#
+#   magic (4) | version (1) | reserved (3) | record count (8) | index slot count (8) | reserved (8)
+MAGIC = b'CCKS'
+VERSION = 1
+HEADER = struct.Struct('<4sB3xQQ8x')
+SECRET_LENGTH = 32
+PUBLIC_KEY_LENGTH = 33
+RECORD_LENGTH = SECRET_LENGTH + PUBLIC_KEY_LENGTH
+# Every index slot holds the position of a record plus one, or zero when empty
+INDEX_ENTRY = struct.Struct('<I')
+MAX_KEYS = 2**32 - 2
+
+
+def _index_slots(count: int) -> int:
+    # A power of two at least twice the number of records keeps the probe sequences short
+    slots = 1
+    while slots < 2 * count:
+        slots <<= 1
+
+    return slots
+
+
+def _slot(x: bytes, mask: int) -> int:
+    # The x coordinates are uniformly distributed, so their leading bytes are already a good hash
+    return int.from_bytes(x[:8], 'little') & mask
+
+
+class KeyStore:
+    def __init__(self, path, context: Context = GLOBAL_CONTEXT):
+        """
+        A read-only, memory-mapped file of private keys indexed by their public keys.
+
+        Opening a key store only maps the file and reads its header, no matter how many keys it
+        holds. Keys are read from the mapping on demand, and lookups by public key go through the
+        on-disk index. Create key stores with `KeyStore.create`.
+
+        :param path: The path of the key store file.
+        :param context:
+        :raises ValueError: If the file is not a valid key store.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mmap) < HEADER.size:
+                raise ValueError('The file is not a key store.')
+
+            magic, version, count, slots = HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError('The file is not a key store.')
+            if version != VERSION:
+                raise ValueError(f'Unsupported key store version: {version}')
+
+            index_offset = HEADER.size + count * RECORD_LENGTH
+            if slots & (slots - 1) or len(self._mmap) != index_offset + slots * INDEX_ENTRY.size:
+                raise ValueError('The key store is truncated or corrupt.')
+
+            # An index with fewer slots than `_index_slots` allows was not written by `create`
+            if not slots or slots < 2 * count:
+                raise ValueError('The key store is truncated or corrupt.')
+        except ValueError:
+            self._mmap.close()
+            raise
+
+        self.path = path
+        self.context = context
+
+        self._count = count
+        self._mask = slots - 1
+        self._index_offset = index_offset
+
+    @classmethod
+    def create(cls, path, secrets, context: Context = GLOBAL_CONTEXT):
+        """
+        Write a new key store, replacing any existing file.
+
+        :param path: The path of the key store file.
+        :param secrets: The 32 byte secrets concatenated together, as any buffer-protocol object, such as
+                        the output of `PrivateKey.generate_many`.
+        :param context:
+        :return: The opened key store.
+        :rtype: KeyStore
+        :raises ValueError: If the length of `secrets` was not a multiple of 32, there were too many keys,
+                            a secret was invalid or two secrets were the same.
+        """
+        secrets = memoryview(secrets).cast('B')
+        if len(secrets) % SECRET_LENGTH:
+            raise ValueError('Secrets must be concatenated 32 byte secrets.')
+
+        count = len(secrets) // SECRET_LENGTH
+        if count > MAX_KEYS:
+            raise ValueError(f'A key store can hold at most {MAX_KEYS} keys.')
+
+        slots = _index_slots(count)
+
+        # Write to a temporary file next to the target, so that a failure leaves any existing key store
+        # untouched. The file is only readable by its owner, as it holds the secrets.
+        directory, name = os.path.split(os.path.abspath(path))
+        fd, temporary = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                cls._write(f, secrets, count, slots, context)
+
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        return cls(path, context)
+
+    @staticmethod
+    def _write(f, secrets: memoryview, count: int, slots: int, context: Context):
+        mask = slots - 1
+        index = array('I', bytes(slots * INDEX_ENTRY.size))
+
+        ctx = context.ctx
+        pubkey_create = lib.secp256k1_ec_pubkey_create
+        pubkey_serialize = lib.secp256k1_ec_pubkey_serialize
+        secrets_buffer = ffi.from_buffer('unsigned char[]', secrets)
+        public_key = ffi.new('secp256k1_pubkey *')
+        output = ffi.new('unsigned char [%d]' % PUBLIC_KEY_LENGTH)
+        output_len = ffi.new('size_t *')
+
+        f.write(HEADER.pack(MAGIC, VERSION, count, slots))
+
+        for i in range(count):
+            secret = secrets_buffer + i * SECRET_LENGTH
+            if not pubkey_create(ctx, public_key, secret):
+                raise ValueError(f'The secret at index {i} is invalid.')
+
+            output_len[0] = PUBLIC_KEY_LENGTH
+            pubkey_serialize(ctx, output, output_len, public_key, EC_COMPRESSED)
+            serialized = bytes(ffi.buffer(output, PUBLIC_KEY_LENGTH))
+
+            # Records are indexed by their x coordinate, which is shared by every public key format.
+            # A secret and its negation share it as well, so only identical secrets are rejected.
+            x = serialized[1:]
+            slot = _slot(x, mask)
+            while index[slot]:
+                other = (index[slot] - 1) * SECRET_LENGTH
+                if secrets[other : other + SECRET_LENGTH] == secrets[i * SECRET_LENGTH : (i + 1) * SECRET_LENGTH]:
+                    raise ValueError(f'The secret at index {i} is a duplicate.')
+                slot = (slot + 1) & mask
+            index[slot] = i + 1
+
+            f.write(secrets[i * SECRET_LENGTH : (i + 1) * SECRET_LENGTH])
+            f.write(serialized)
+
+        if sys.byteorder != 'little':  # no cov
+            index.byteswap()
+        f.write(index.tobytes())
+
+    def find(self, public_key) -> Optional[int]:
+        """
+        Look up the position of a key through the index.
+
+        :param public_key: The formatted public key, either compressed, uncompressed or x-only.
+        :return: The position of the key, or `None` if the key store does not hold it.
+        :raises ValueError: If the index refers to a record that does not exist.
+        """
+        public_key = bytes(public_key)
+        length = len(public_key)
+        if length == 32:
+            x = public_key
+            compressed = None
+        elif length == PUBLIC_KEY_LENGTH:
+            x = public_key[1:]
+            compressed = public_key
+        elif length == 65 and public_key[0] == 4:
+            x = public_key[1:33]
+            compressed = bytes([2 | (public_key[64] & 1)]) + x
+        else:
+            return None
+
+        mapping = self._mmap
+        unpack_entry = INDEX_ENTRY.unpack_from
+        index_offset = self._index_offset
+        mask = self._mask
+        count = self._count
+        slot = _slot(x, mask)
+        # An index written by `create` always has empty slots, but a corrupt one may have none
+        for _ in range(mask + 1):
+            entry = unpack_entry(mapping, index_offset + slot * INDEX_ENTRY.size)[0]
+            if not entry:
+                return None
+            if entry > count:
+                raise ValueError('The key store index is corrupt.')
+
+            offset = HEADER.size + (entry - 1) * RECORD_LENGTH + SECRET_LENGTH
+            stored = mapping[offset : offset + PUBLIC_KEY_LENGTH]
+            if stored[1:] == x and (compressed is None or stored == compressed):
+                return entry - 1
+
+            slot = (slot + 1) & mask
+
+        return None
+
+    def _offset(self, position: int) -> int:
+        if not 0 <= position < self._count:
+            raise IndexError('Key store position out of range.')
+
+        return HEADER.size + position * RECORD_LENGTH
+
+    def secret(self, position: int) -> bytes:
+        """
+        :param position: The position of the key.
+        :return: The 32 byte secret.
+        :raises IndexError: If the position was out of range.
+        """
+        offset = self._offset(position)
+        return self._mmap[offset : offset + SECRET_LENGTH]
+
+    def public_key(self, position: int) -> bytes:
+        """
+        :param position: The position of the key.
+        :return: The compressed public key.
+        :raises IndexError: If the position was out of range.
+        """
+        offset = self._offset(position) + SECRET_LENGTH
+        return self._mmap[offset : offset + PUBLIC_KEY_LENGTH]
+
+    def public_key_xonly(self, position: int) -> bytes:
+        """
+        :param position: The position of the key.
+        :return: The x-only public key.
+        :raises IndexError: If the position was out of range.
+        """
+        offset = self._offset(position) + SECRET_LENGTH + 1
+        return self._mmap[offset : offset + 32]
+
+    def private_key(self, public_key) -> PrivateKey:
+        """
+        :param public_key: The formatted public key, either compressed, uncompressed or x-only.
+        :return: The private key.
+        :rtype: PrivateKey
+        :raises KeyError: If the key store does not hold the key.
+        """
+        position = self.find(public_key)
+        if position is None:
+            raise KeyError(public_key)
+
+        return PrivateKey(self.secret(position), self.context)
+
+    def sign(self, public_key, message: bytes, hasher: Hasher = sha256, custom_nonce: Nonce = DEFAULT_NONCE) -> bytes:
+        """
+        Create an ECDSA signature with the key of a public key. Refer to `PrivateKey.sign`.
+
+        :raises KeyError: If the key store does not hold the key.
+        """
+        return self.private_key(public_key).sign(message, hasher, custom_nonce)
+
+    def sign_schnorr(self, public_key, message: bytes, aux_randomness: bytes = b'') -> bytes:
+        """
+        Create a Schnorr signature with the key of a public key. Refer to `PrivateKey.sign_schnorr`.
+
+        :raises KeyError: If the key store does not hold the key.
+        """
+        return self.private_key(public_key).sign_schnorr(message, aux_randomness)
+
+    def close(self):
+        """
+        Unmap the file. Keys may no longer be read afterwards.
+        """
+        self._mmap.close()
+
+    def __contains__(self, public_key) -> bool:
+        return self.find(public_key) is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f'KeyStore({os.fspath(self.path)!r})'
@@ -0,0 +1,401 @@
+import os
+from threading import Lock
+from typing import Optional, Sequence
+
+from coincurve.cache import parse_public_key
+from coincurve.context import GLOBAL_CONTEXT, STATIC_CTX, Context
+from coincurve.keys import PrivateKey, PublicKey, PublicKeyXOnly
+from coincurve.utils import as_buffer, validate_secret
+
+from ._libsecp256k1 import ffi, lib
+
+# MuSig2 multi-signatures (BIP327) producing BIP340 Schnorr signatures, through the musig module
+# of libsecp256k1. A signing session goes through these steps:
+#
+#   1. Aggregate the public keys of all signers once with `KeyAggregation`, which may be reused
+#      by any number of sessions.
+#   2. Every signer generates a `SecretNonce` and shares its public nonce. Nonces may be generated
+#      ahead of time, before the message or even the other signers are known.
+#   3. The public nonces are combined with `aggregate_nonces`, which anyone may do.
+#   4. Every signer creates a partial signature with `Session.sign`.
+#   5. The partial signatures are combined with `Session.aggregate` into a signature that verifies
+#      against `KeyAggregation.public_key_xonly` like any other Schnorr signature.
+PUBLIC_NONCE_LENGTH = 66
+PARTIAL_SIGNATURE_LENGTH = 32
+
+
+def _keypair(private_key, context: Context):
+    if isinstance(private_key, PrivateKey):
+        private_key = private_key.secret
+
+    keypair = ffi.new('secp256k1_keypair *')
+    if not lib.secp256k1_keypair_create(context.ctx, keypair, validate_secret(private_key)):
+        raise ValueError('Secret was invalid')
+
+    return keypair
+
+
+def _parse_public_nonce(public_nonce: bytes, context: Context):
+    nonce = ffi.new('secp256k1_musig_pubnonce *')
+    parsed = len(public_nonce) == PUBLIC_NONCE_LENGTH and lib.secp256k1_musig_pubnonce_parse(
+        STATIC_CTX, nonce, as_buffer(public_nonce)
+    )
+    if not parsed:
+        raise ValueError('The public nonce could not be parsed or is invalid.')
+
+    return nonce
+
+
+def _parse_partial_signature(partial_signature: bytes, context: Context):
+    signature = ffi.new('secp256k1_musig_partial_sig *')
+    parsed = len(partial_signature) == PARTIAL_SIGNATURE_LENGTH and lib.secp256k1_musig_partial_sig_parse(
+        STATIC_CTX, signature, as_buffer(partial_signature)
+    )
+    if not parsed:
+        raise ValueError('The partial signature could not be parsed or is invalid.')
+
+    return signature
+
+
+class KeyAggregation:
+    __slots__ = ('_cache', 'context', 'public_keys')
+
+    def __init__(self, public_keys: Sequence, sort: bool = False, context: Context = GLOBAL_CONTEXT):
+        """
+        The aggregate of the public keys of the signers, and the key aggregation cache of libsecp256k1.
+
+        Aggregating keys costs one multiplication per signer, so aggregate every set of signers once
+        and reuse the result for all of their sessions. The cache is never modified after creation,
+        which also makes it safe to share between threads.
+
+        :param public_keys: The `PublicKey` objects or formatted public keys of the signers. The order
+                            matters, and the same key may appear more than once.
+        :param sort: Whether or not to sort the public keys by their compressed format first, as with
+                     the `KeySort` algorithm of BIP327, so that every signer gets the same aggregate
+                     regardless of the order in which keys were collected.
+        :param context:
+        :raises ValueError: If there were no public keys, or a public key could not be parsed or was invalid.
+        """
+        if not public_keys:
+            raise ValueError('At least one public key is required.')
+
+        formatted = [
+            public_key.format() if isinstance(public_key, PublicKey) else bytes(public_key)
+            for public_key in public_keys
+        ]
+        count = len(formatted)
+
+        structs = ffi.new('secp256k1_pubkey[]', count)
+        for i, data in enumerate(formatted):
+            if not parse_public_key(structs + i, data, context):
+                raise ValueError(f'The public key at index {i} could not be parsed or is invalid.')
+
+        # Normalize to the compressed format before sorting, like BIP327 does
+        formatted = [PublicKey(structs + i, context).format() for i in range(count)]
+        order = sorted(range(count), key=formatted.__getitem__) if sort else range(count)
+
+        self._cache = ffi.new('secp256k1_musig_keyagg_cache *')
+        pointers = ffi.new('secp256k1_pubkey *[]', [structs + i for i in order])
+        if not lib.secp256k1_musig_pubkey_agg(STATIC_CTX, ffi.NULL, self._cache, pointers, count):
+            raise ValueError('The public keys could not be aggregated.')
+
+        self.context = context
+        self.public_keys = tuple(formatted[i] for i in order)
+
+    @property
+    def public_key(self) -> PublicKey:
+        """
+        The aggregate public key, including any tweaks, as a full point for further tweaking.
+        """
+        public_key = ffi.new('secp256k1_pubkey *')
+        lib.secp256k1_musig_pubkey_get(STATIC_CTX, public_key, self._cache)
+
+        return PublicKey(public_key, self.context)
+
+    @property
+    def public_key_xonly(self) -> PublicKeyXOnly:
+        """
+        The aggregate x-only public key, including any tweaks, which verifies the final signatures.
+        """
+        public_key = self.public_key
+        xonly_pubkey = ffi.new('secp256k1_xonly_pubkey *')
+        parity = ffi.new('int *')
+        lib.secp256k1_xonly_pubkey_from_pubkey(STATIC_CTX, xonly_pubkey, parity, public_key.public_key)
+
+        return PublicKeyXOnly(xonly_pubkey, parity=not not parity[0], context=self.context)
+
+    def tweak_add(self, tweak: bytes, xonly: bool = False) -> 'KeyAggregation':
+        """
+        Tweak the aggregate public key, such as for BIP32 derivation or Taproot commitments.
+
+        :param tweak: The 32 byte tweak.
+        :param xonly: Whether to add the tweak to the x-only aggregate public key, as BIP341 Taproot
+                      output keys do, rather than to the full point.
+        :return: A new key aggregation, leaving this one untouched for other sessions.
+        :rtype: KeyAggregation
+        :raises ValueError: If the tweak was invalid or the result was the point at infinity.
+        """
+        if len(tweak) != 32:
+            raise ValueError('Tweak must be 32 bytes long.')
+
+        tweaked = self.copy()
+        tweak_add = lib.secp256k1_musig_pubkey_xonly_tweak_add if xonly else lib.secp256k1_musig_pubkey_ec_tweak_add
+        if not tweak_add(STATIC_CTX, ffi.NULL, tweaked._cache, as_buffer(tweak)):
+            raise ValueError('The tweak was invalid.')
+
+        return tweaked
+
+    def copy(self) -> 'KeyAggregation':
+        """
+        :return: An independent copy of the key aggregation.
+        :rtype: KeyAggregation
+        """
+        copied = KeyAggregation.__new__(KeyAggregation)
+        copied._cache = ffi.new('secp256k1_musig_keyagg_cache *')
+        ffi.memmove(copied._cache, self._cache, ffi.sizeof('secp256k1_musig_keyagg_cache'))
+        copied.context = self.context
+        copied.public_keys = self.public_keys
+
+        return copied
+
+    def __repr__(self):
+        return f'KeyAggregation({len(self.public_keys)} public keys)'
+
+
+class SecretNonce:
+    __slots__ = ('_lock', '_secnonce', 'context', 'public_key', 'public_nonce')
+
+    def __init__(self, secnonce, public_nonce: bytes, public_key: bytes, context: Context):
+        """
+        The secret half of a MuSig2 nonce. Create them with `SecretNonce.generate`.
+
+        Nonces are not tied to a session, so a signer may generate them in advance and use each one
+        in any later session. However, every secret nonce signs exactly once: signing twice with the
+        same nonce would reveal the private key, so it is erased by `Session.sign` and can never be
+        serialized.
+
+        :param secnonce: The `secp256k1_musig_secnonce *`.
+        :param public_nonce: The 66 byte public nonce.
+        :param public_key: The compressed public key of the signer.
+        :param context:
+        """
+        self._secnonce = secnonce
+        self._lock = Lock()
+        self.public_nonce = public_nonce
+        self.public_key = public_key
+        self.context = context
+
+    @classmethod
+    def generate(
+        cls,
+        private_key,
+        message: Optional[bytes] = None,
+        key_aggregation: Optional[KeyAggregation] = None,
+        extra_input: Optional[bytes] = None,
+        context: Optional[Context] = None,
+    ) -> 'SecretNonce':
+        """
+        Generate a nonce from fresh randomness. The optional inputs add defense in depth against weak
+        randomness, and leaving them out allows generating nonces before a session starts.
+
+        :param private_key: The private key of the signer, or its secret.
+        :type private_key: PrivateKey | bytes
+        :param message: The 32 byte message to be signed, if already known.
+        :param key_aggregation: The key aggregation of the signers, if already known.
+        :param extra_input: Any other 32 bytes of data, such as a session identifier.
+        :param context: By default, the context of `private_key`, if any, is used.
+        :return: The secret nonce.
+        :rtype: SecretNonce
+        :raises ValueError: If the secret was invalid, or the message or extra input was not 32 bytes long.
+        """
+        if isinstance(private_key, PrivateKey):
+            context = context or private_key.context
+            private_key = private_key.secret
+
+        context = context or GLOBAL_CONTEXT
+        secret = validate_secret(private_key)
+
+        if message is not None and len(message) != 32:
+            raise ValueError('Message must be 32 bytes long.')
+        if extra_input is not None and len(extra_input) != 32:
+            raise ValueError('Extra input must be 32 bytes long.')
+
+        public_key = PublicKey.from_valid_secret(secret, context)
+        secnonce = ffi.new('secp256k1_musig_secnonce *')
+        pubnonce = ffi.new('secp256k1_musig_pubnonce *')
+        # Consumed and erased by the nonce generation
+        session_secret = ffi.new('unsigned char [32]', os.urandom(32))
+
+        res = lib.secp256k1_musig_nonce_gen(
+            context.ctx,
+            secnonce,
+            pubnonce,
+            session_secret,
+            secret,
+            public_key.public_key,
+            ffi.NULL if message is None else as_buffer(message),
+            ffi.NULL if key_aggregation is None else key_aggregation._cache,
+            ffi.NULL if extra_input is None else as_buffer(extra_input),
+        )
+        if not res:
+            raise ValueError('Nonce generation failed')
+
+        serialized = ffi.new('unsigned char [%d]' % PUBLIC_NONCE_LENGTH)
+        lib.secp256k1_musig_pubnonce_serialize(STATIC_CTX, serialized, pubnonce)
+
+        return cls(secnonce, bytes(ffi.buffer(serialized)), public_key.format(), context)
+
+    @property
+    def used(self) -> bool:
+        """
+        Whether or not the nonce was already used to sign.
+        """
+        return self._secnonce is None
+
+    def _take(self):
+        with self._lock:
+            secnonce, self._secnonce = self._secnonce, None
+
+        if secnonce is None:
+            raise ValueError('The secret nonce was already used.')
+
+        return secnonce
+
+    def __repr__(self):
+        return f'SecretNonce({self.public_nonce.hex()})'
+
+
+def aggregate_nonces(public_nonces: Sequence[bytes], context: Context = GLOBAL_CONTEXT) -> bytes:
+    """
+    Combine the public nonces of all signers into the aggregate nonce of a session.
+
+    :param public_nonces: The 66 byte public nonces.
+    :param context:
+    :return: The 66 byte aggregate nonce.
+    :raises ValueError: If there were no public nonces, or a public nonce could not be parsed or was invalid.
+    """
+    if not public_nonces:
+        raise ValueError('At least one public nonce is required.')
+
+    # The array of pointers does not keep the parsed nonces alive
+    parsed = [_parse_public_nonce(public_nonce, context) for public_nonce in public_nonces]
+    nonces = ffi.new('secp256k1_musig_pubnonce *[]', parsed)
+    aggnonce = ffi.new('secp256k1_musig_aggnonce *')
+    if not lib.secp256k1_musig_nonce_agg(STATIC_CTX, aggnonce, nonces, len(nonces)):
+        raise ValueError('The public nonces could not be aggregated.')
+
+    serialized = ffi.new('unsigned char [%d]' % PUBLIC_NONCE_LENGTH)
+    lib.secp256k1_musig_aggnonce_serialize(STATIC_CTX, serialized, aggnonce)
+
+    return bytes(ffi.buffer(serialized))
+
+
+class Session:
+    __slots__ = ('_session', 'context', 'key_aggregation', 'message')
+
+    def __init__(self, key_aggregation: KeyAggregation, aggregate_nonce: bytes, message: bytes):
+        """
+        A signing session of one message by the signers of a key aggregation.
+
+        :param key_aggregation: The key aggregation of the signers.
+        :param aggregate_nonce: The 66 byte aggregate nonce returned by `aggregate_nonces`.
+        :param message: The 32 byte message to sign.
+        :raises ValueError: If the aggregate nonce could not be parsed or the message was not 32 bytes long.
+        """
+        if len(message) != 32:
+            raise ValueError('Message must be 32 bytes long.')
+
+        context = key_aggregation.context
+        aggnonce = ffi.new('secp256k1_musig_aggnonce *')
+        parsed = len(aggregate_nonce) == PUBLIC_NONCE_LENGTH and lib.secp256k1_musig_aggnonce_parse(
+            STATIC_CTX, aggnonce, as_buffer(aggregate_nonce)
+        )
+        if not parsed:
+            raise ValueError('The aggregate nonce could not be parsed or is invalid.')
+
+        self._session = ffi.new('secp256k1_musig_session *')
+        if not lib.secp256k1_musig_nonce_process(
+            STATIC_CTX, self._session, aggnonce, as_buffer(message), key_aggregation._cache
+        ):
+            raise ValueError('The session could not be created.')
+
+        self.key_aggregation = key_aggregation
+        self.message = message
+        self.context = context
+
+    def sign(self, private_key, secret_nonce: SecretNonce) -> bytes:
+        """
+        Create the partial signature of a signer, which uses up its secret nonce.
+
+        :param private_key: The private key of the signer, or its secret.
+        :type private_key: PrivateKey | bytes
+        :param secret_nonce: The secret nonce of the signer, whose public nonce is part of the
+                             aggregate nonce of this session.
+        :return: The 32 byte partial signature.
+        :raises ValueError: If the secret was invalid, the secret nonce was generated for another key
+                            or was already used.
+        """
+        context = self.context
+        keypair = _keypair(private_key, context)
+
+        public_key = ffi.new('secp256k1_pubkey *')
+        lib.secp256k1_keypair_pub(context.ctx, public_key, keypair)
+        if PublicKey(public_key, context).format() != secret_nonce.public_key:
+            raise ValueError('The secret nonce was generated for another key.')
+
+        partial_signature = ffi.new('secp256k1_musig_partial_sig *')
+        res = lib.secp256k1_musig_partial_sign(
+            context.ctx, partial_signature, secret_nonce._take(), keypair, self.key_aggregation._cache, self._session
+        )
+        if not res:
+            raise ValueError('Signing failed')
+
+        serialized = ffi.new('unsigned char [%d]' % PARTIAL_SIGNATURE_LENGTH)
+        lib.secp256k1_musig_partial_sig_serialize(STATIC_CTX, serialized, partial_signature)
+
+        return bytes(ffi.buffer(serialized))
+
+    def verify(self, partial_signature: bytes, public_nonce: bytes, public_key) -> bool:
+        """
+        Verify the partial signature of a signer, to identify who caused an invalid signature.
+
+        :param partial_signature: The 32 byte partial signature.
+        :param public_nonce: The 66 byte public nonce of the signer.
+        :param public_key: The `PublicKey` object or formatted public key of the signer.
+        :return: A boolean indicating whether or not the partial signature is valid.
+        :raises ValueError: If the partial signature, the public nonce or the public key could not be
+                            parsed or was invalid.
+        """
+        context = self.context
+        if not isinstance(public_key, PublicKey):
+            public_key = PublicKey(public_key, context)
+
+        return not not lib.secp256k1_musig_partial_sig_verify(
+            STATIC_CTX,
+            _parse_partial_signature(partial_signature, context),
+            _parse_public_nonce(public_nonce, context),
+            public_key.public_key,
+            self.key_aggregation._cache,
+            self._session,
+        )
+
+    def aggregate(self, partial_signatures: Sequence[bytes]) -> bytes:
+        """
+        Combine the partial signatures of all signers into the final signature.
+
+        :param partial_signatures: The 32 byte partial signatures.
+        :return: The 64 byte Schnorr signature of the message, valid for `KeyAggregation.public_key_xonly`
+                 if all partial signatures were valid.
+        :raises ValueError: If there were no partial signatures, or a partial signature could not be parsed.
+        """
+        if not partial_signatures:
+            raise ValueError('At least one partial signature is required.')
+
+        context = self.context
+        parsed = [_parse_partial_signature(signature, context) for signature in partial_signatures]
+        signatures = ffi.new('secp256k1_musig_partial_sig *[]', parsed)
+        signature = ffi.new('unsigned char [64]')
+        if not lib.secp256k1_musig_partial_sig_agg(STATIC_CTX, signature, self._session, signatures, len(signatures)):
+            raise ValueError('The partial signatures could not be aggregated.')
+
+        return bytes(ffi.buffer(signature))
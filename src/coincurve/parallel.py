@@ -0,0 +1,497 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from multiprocessing import shared_memory
+from threading import local
+from typing import List, Optional, Sequence, Tuple
+
+from coincurve.cache import parse_public_key
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.ecdsa import MAX_SIG_LENGTH, Signature, cdata_to_der, deserialize_recoverable, recover
+from coincurve.keys import PublicKey
+from coincurve.types import Hasher
+from coincurve.utils import as_buffer, chunk_data, sha256, verify_signatures_batch
+
+from ._libsecp256k1 import ffi, lib
+
+DEFAULT_CHUNK_SIZE = 256
+
+# Fixed-width records used to exchange batches with worker processes through shared memory.
+# Variable-length fields are stored in a slot prefixed by a single length byte.
+SIGNATURE_SLOT = 1 + MAX_SIG_LENGTH
+PUBLIC_KEY_SLOT = 1 + 65
+VERIFY_RECORD = SIGNATURE_SLOT + 32 + PUBLIC_KEY_SLOT
+SIGN_RECORD = 32 + 32
+RECOVER_RECORD = 65 + 32
+# A status byte followed by the raw `secp256k1_pubkey` struct, which is only meaningful within one build
+RECOVERED_SLOT = 1 + 64
+
+VERIFY_INVALID = 0
+VERIFY_VALID = 1
+VERIFY_UNPARSABLE = 2
+
+
+def _sign_chunk(secrets, messages, hasher: Hasher, context: Context) -> List[bytes]:
+    ctx = context.ctx
+    ecdsa_sign = lib.secp256k1_ecdsa_sign
+    signature = ffi.new('secp256k1_ecdsa_signature *')
+
+    signatures = []
+    for secret, message in zip(secrets, messages):
+        msg_hash = as_buffer(hasher(message) if hasher is not None else message)
+        if len(msg_hash) != 32:
+            raise ValueError('Message hash must be 32 bytes long.')
+
+        secret = as_buffer(getattr(secret, 'secret', secret))
+        if not ecdsa_sign(ctx, signature, msg_hash, secret, ffi.NULL, ffi.NULL):
+            raise ValueError('The nonce generation function failed, or the private key was invalid.')
+
+        signatures.append(cdata_to_der(signature, context))
+
+    return signatures
+
+
+def _recover_chunk(signatures, messages, hasher: Hasher, context: Context) -> List[PublicKey]:
+    return [
+        PublicKey(recover(message, deserialize_recoverable(signature, context), hasher, context), context)
+        for signature, message in zip(signatures, messages)
+    ]
+
+
+def _ecdh_chunk(secrets, public_keys, context: Context) -> List[bytes]:
+    ctx = context.ctx
+    ecdh = lib.secp256k1_ecdh
+    parsed = ffi.new('secp256k1_pubkey *')
+    output = ffi.new('unsigned char [32]')
+
+    shared_secrets = []
+    for secret, public_key in zip(secrets, public_keys):
+        if isinstance(public_key, PublicKey):
+            public_key = public_key.public_key
+        elif not parse_public_key(parsed, public_key, context):
+            raise ValueError('The public key could not be parsed or is invalid.')
+        else:
+            public_key = parsed
+
+        if not ecdh(ctx, output, public_key, getattr(secret, 'secret', secret), ffi.NULL, ffi.NULL):
+            raise ValueError('The private key was invalid.')
+
+        shared_secrets.append(bytes(ffi.buffer(output, 32)))
+
+    return shared_secrets
+
+
+class ParallelEngine:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        context: Context = GLOBAL_CONTEXT,
+    ):
+        """
+        Run batches of operations on a pool of threads. The underlying library calls release
+        the GIL, so the work scales with the number of cores. Every worker thread operates on
+        its own clone of `context`, and results are always returned in input order.
+
+        :param workers: The number of worker threads. By default, the number of CPUs is used.
+        :param chunk_size: The number of items handed to a worker at a time.
+        :param context: The context from which every worker's context is cloned.
+        """
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be at least 1.')
+
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.context = context
+
+        self._local = local()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='coincurve')
+
+    def _worker_context(self) -> Context:
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            # A fresh seed per worker, so that threads do not share the blinding of the parent context
+            context = self.context.clone(name='worker')
+            context.reseed()
+            self._local.context = context
+
+        return context
+
+    def _map(self, func, *columns) -> list:
+        count = len(columns[0])
+        if any(len(column) != count for column in columns):
+            raise ValueError('All inputs must have the same number of items.')
+
+        def run(*chunk):
+            return func(*chunk, self._worker_context())
+
+        chunked = [list(chunk_data(column, self.chunk_size)) for column in columns]
+        return list(self._executor.map(run, *chunked))
+
+    def verify(
+        self,
+        signatures: Sequence[bytes],
+        messages: Sequence[bytes],
+        public_keys: Sequence[bytes],
+        hasher: Hasher = sha256,
+    ) -> Tuple[List[bool], List[int]]:
+        """
+        Verify ECDSA signatures in parallel.
+
+        :param signatures: A sequence of DER-encoded ECDSA signatures or `Signature` objects.
+        :param messages: A sequence of messages that were supposedly signed.
+        :param public_keys: A sequence of formatted public keys.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: A list of booleans indicating whether or not each signature is correct, and the
+                 indices of the items whose public key or DER-encoded signature could not be parsed.
+        :raises ValueError: If the inputs do not have the same number of items or a message hash was not 32 bytes long.
+        """
+
+        def verify_chunk(chunk_signatures, chunk_messages, chunk_public_keys, context):
+            return verify_signatures_batch(chunk_signatures, chunk_messages, chunk_public_keys, hasher, context)
+
+        results = []
+        failed = []
+        for offset, (chunk_results, chunk_failed) in zip(
+            range(0, len(signatures), self.chunk_size), self._map(verify_chunk, signatures, messages, public_keys)
+        ):
+            results.extend(chunk_results)
+            failed.extend(offset + i for i in chunk_failed)
+
+        return results, failed
+
+    def sign(self, secrets: Sequence[bytes], messages: Sequence[bytes], hasher: Hasher = sha256) -> List[bytes]:
+        """
+        Create ECDSA signatures in parallel.
+
+        :param secrets: A sequence of private key secrets or `PrivateKey` objects.
+        :param messages: A sequence of messages to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The DER-encoded ECDSA signatures.
+        :raises ValueError: If the inputs do not have the same number of items, a message hash was
+                            not 32 bytes long, or a private key was invalid.
+        """
+
+        def sign_chunk(chunk_secrets, chunk_messages, context):
+            return _sign_chunk(chunk_secrets, chunk_messages, hasher, context)
+
+        return list(chain.from_iterable(self._map(sign_chunk, secrets, messages)))
+
+    def recover(
+        self, signatures: Sequence[bytes], messages: Sequence[bytes], hasher: Hasher = sha256
+    ) -> List[PublicKey]:
+        """
+        Recover ECDSA public keys from recoverable signatures in parallel.
+
+        :param signatures: A sequence of recoverable ECDSA signatures.
+        :param messages: A sequence of messages that were supposedly signed.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The public keys that signed the messages.
+        :raises ValueError: If the inputs do not have the same number of items, a message hash was
+                            not 32 bytes long, or recovery of an ECDSA public key failed.
+        """
+
+        def recover_chunk(chunk_signatures, chunk_messages, context):
+            return _recover_chunk(chunk_signatures, chunk_messages, hasher, context)
+
+        public_keys = list(chain.from_iterable(self._map(recover_chunk, signatures, messages)))
+        for public_key in public_keys:
+            public_key.context = self.context
+
+        return public_keys
+
+    def ecdh(self, secrets: Sequence[bytes], public_keys: Sequence[bytes]) -> List[bytes]:
+        """
+        Compute EC Diffie-Hellman secrets in parallel.
+
+        :param secrets: A sequence of private key secrets or `PrivateKey` objects.
+        :param public_keys: A sequence of formatted public keys or `PublicKey` objects.
+        :return: The 32 byte shared secrets.
+        :raises ValueError: If the inputs do not have the same number of items, or a public key
+                            could not be parsed or was invalid.
+        """
+        return list(chain.from_iterable(self._map(_ecdh_chunk, secrets, public_keys)))
+
+    def close(self):
+        """
+        Shut down the worker threads.
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _run_shared(func, name: str, start: int, stop: int, count: int):
+    # Workers share the parent's resource tracker, so attaching does not take ownership of the segment.
+    shm = shared_memory.SharedMemory(name=name)
+    data = ffi.from_buffer('unsigned char[]', shm.buf)
+    try:
+        return func(data, start, stop, count, GLOBAL_CONTEXT.ctx)
+    finally:
+        ffi.release(data)
+        shm.close()
+
+
+def _verify_shared(data, start: int, stop: int, count: int, ctx):
+    pubkey = ffi.new('secp256k1_pubkey *')
+    sig = ffi.new('secp256k1_ecdsa_signature *')
+    results = count * VERIFY_RECORD
+
+    for i in range(start, stop):
+        offset = i * VERIFY_RECORD
+        msg_offset = offset + SIGNATURE_SLOT
+        pubkey_offset = msg_offset + 32
+
+        if not lib.secp256k1_ec_pubkey_parse(
+            ctx, pubkey, data + pubkey_offset + 1, data[pubkey_offset]
+        ) or not lib.secp256k1_ecdsa_signature_parse_der(ctx, sig, data + offset + 1, data[offset]):
+            data[results + i] = VERIFY_UNPARSABLE
+        elif lib.secp256k1_ecdsa_verify(ctx, sig, data + msg_offset, pubkey):
+            data[results + i] = VERIFY_VALID
+        else:
+            data[results + i] = VERIFY_INVALID
+
+
+def _sign_shared(data, start: int, stop: int, count: int, ctx):
+    signature = ffi.new('secp256k1_ecdsa_signature *')
+    der_length = ffi.new('size_t *')
+    results = count * SIGN_RECORD
+
+    for i in range(start, stop):
+        offset = i * SIGN_RECORD
+        if not lib.secp256k1_ecdsa_sign(ctx, signature, data + offset + 32, data + offset, ffi.NULL, ffi.NULL):
+            raise ValueError('The nonce generation function failed, or the private key was invalid.')
+
+        output = results + i * SIGNATURE_SLOT
+        der_length[0] = MAX_SIG_LENGTH
+        lib.secp256k1_ecdsa_signature_serialize_der(ctx, data + output + 1, der_length, signature)
+        data[output] = der_length[0]
+
+
+def _recover_shared(data, start: int, stop: int, count: int, ctx):
+    recover_sig = ffi.new('secp256k1_ecdsa_recoverable_signature *')
+    results = count * RECOVER_RECORD
+
+    for i in range(start, stop):
+        offset = i * RECOVER_RECORD
+        output = results + i * RECOVERED_SLOT
+        rec_id = data[offset + 64]
+
+        data[output] = (
+            rec_id <= 3
+            and lib.secp256k1_ecdsa_recoverable_signature_parse_compact(ctx, recover_sig, data + offset, rec_id)
+            and lib.secp256k1_ecdsa_recover(
+                ctx, ffi.cast('secp256k1_pubkey *', data + output + 1), recover_sig, data + offset + 65
+            )
+        )
+
+
+class ProcessEngine:
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, mp_context=None):
+        """
+        Run batches of operations on a pool of processes, to scale past a single interpreter.
+
+        Inputs and outputs are exchanged through a `multiprocessing.shared_memory` segment of
+        fixed-width records rather than pickled objects. Worker processes use their own
+        `GLOBAL_CONTEXT`, which is reseeded in every child after a fork.
+
+        :param workers: The number of worker processes. By default, the number of CPUs is used.
+        :param chunk_size: The number of items handed to a worker at a time.
+        :param mp_context: The `multiprocessing` context used to start the workers.
+        """
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be at least 1.')
+
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context)
+
+    def _run(self, func, shm: shared_memory.SharedMemory, count: int):
+        futures = [
+            self._executor.submit(_run_shared, func, shm.name, start, min(start + self.chunk_size, count), count)
+            for start in range(0, count, self.chunk_size)
+        ]
+        for future in futures:
+            future.result()
+
+    def verify(
+        self,
+        signatures: Sequence[bytes],
+        messages: Sequence[bytes],
+        public_keys: Sequence[bytes],
+        hasher: Hasher = sha256,
+    ) -> Tuple[List[bool], List[int]]:
+        """
+        Verify ECDSA signatures in worker processes. Messages are hashed in the calling process.
+
+        :param signatures: A sequence of DER-encoded ECDSA signatures or `Signature` objects.
+        :param messages: A sequence of messages that were supposedly signed.
+        :param public_keys: A sequence of formatted public keys.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: A list of booleans indicating whether or not each signature is correct, and the
+                 indices of the items whose public key or DER-encoded signature could not be parsed.
+        :raises ValueError: If the inputs do not have the same number of items or a message hash was not 32 bytes long.
+        """
+        count = len(signatures)
+        if len(messages) != count or len(public_keys) != count:
+            raise ValueError('All inputs must have the same number of items.')
+        if not count:
+            return [], []
+
+        shm = shared_memory.SharedMemory(create=True, size=count * (VERIFY_RECORD + 1))
+        try:
+            buf = shm.buf
+            for i, (signature, message, public_key) in enumerate(zip(signatures, messages, public_keys)):
+                msg_hash = hasher(message) if hasher is not None else message
+                if len(msg_hash) != 32:
+                    raise ValueError('Message hash must be 32 bytes long.')
+
+                if isinstance(signature, Signature):
+                    signature = signature.to_der()
+
+                if len(signature) > MAX_SIG_LENGTH or len(public_key) > 65:
+                    # Oversized items cannot be parsed, and empty slots are reported as such.
+                    signature = public_key = b''
+
+                offset = i * VERIFY_RECORD
+                msg_offset = offset + SIGNATURE_SLOT
+                pubkey_offset = msg_offset + 32
+                buf[offset] = len(signature)
+                buf[offset + 1 : offset + 1 + len(signature)] = signature
+                buf[msg_offset:pubkey_offset] = msg_hash
+                buf[pubkey_offset] = len(public_key)
+                buf[pubkey_offset + 1 : pubkey_offset + 1 + len(public_key)] = public_key
+
+            self._run(_verify_shared, shm, count)
+
+            statuses = bytes(buf[count * VERIFY_RECORD : count * (VERIFY_RECORD + 1)])
+            del buf
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return (
+            [status == VERIFY_VALID for status in statuses],
+            [i for i, status in enumerate(statuses) if status == VERIFY_UNPARSABLE],
+        )
+
+    def sign(self, secrets: Sequence[bytes], messages: Sequence[bytes], hasher: Hasher = sha256) -> List[bytes]:
+        """
+        Create ECDSA signatures in worker processes. Messages are hashed in the calling process.
+
+        :param secrets: A sequence of private key secrets or `PrivateKey` objects.
+        :param messages: A sequence of messages to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The DER-encoded ECDSA signatures.
+        :raises ValueError: If the inputs do not have the same number of items, a message hash was
+                            not 32 bytes long, or a private key was invalid.
+        """
+        count = len(secrets)
+        if len(messages) != count:
+            raise ValueError('All inputs must have the same number of items.')
+        if not count:
+            return []
+
+        shm = shared_memory.SharedMemory(create=True, size=count * (SIGN_RECORD + SIGNATURE_SLOT))
+        try:
+            buf = shm.buf
+            for i, (secret, message) in enumerate(zip(secrets, messages)):
+                secret = getattr(secret, 'secret', secret)
+                msg_hash = hasher(message) if hasher is not None else message
+                if len(msg_hash) != 32:
+                    raise ValueError('Message hash must be 32 bytes long.')
+                if len(secret) != 32:
+                    raise ValueError('Secret must be 32 bytes long.')
+
+                offset = i * SIGN_RECORD
+                buf[offset : offset + 32] = secret
+                buf[offset + 32 : offset + SIGN_RECORD] = msg_hash
+
+            self._run(_sign_shared, shm, count)
+
+            signatures = []
+            for output in range(count * SIGN_RECORD, count * (SIGN_RECORD + SIGNATURE_SLOT), SIGNATURE_SLOT):
+                signatures.append(bytes(buf[output + 1 : output + 1 + buf[output]]))
+        finally:
+            # Secrets must not linger in shared memory, even if signing failed or was interrupted.
+            buf = None
+            shm.buf[: count * SIGN_RECORD] = bytes(count * SIGN_RECORD)
+            shm.close()
+            shm.unlink()
+
+        return signatures
+
+    def recover(
+        self, signatures: Sequence[bytes], messages: Sequence[bytes], hasher: Hasher = sha256
+    ) -> List[PublicKey]:
+        """
+        Recover ECDSA public keys from recoverable signatures in worker processes.
+        Messages are hashed in the calling process.
+
+        :param signatures: A sequence of recoverable ECDSA signatures.
+        :param messages: A sequence of messages that were supposedly signed.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The public keys that signed the messages.
+        :raises ValueError: If the inputs do not have the same number of items, a message hash was
+                            not 32 bytes long, or recovery of an ECDSA public key failed.
+        """
+        count = len(signatures)
+        if len(messages) != count:
+            raise ValueError('All inputs must have the same number of items.')
+        if not count:
+            return []
+
+        shm = shared_memory.SharedMemory(create=True, size=count * (RECOVER_RECORD + RECOVERED_SLOT))
+        try:
+            buf = shm.buf
+            for i, (signature, message) in enumerate(zip(signatures, messages)):
+                msg_hash = hasher(message) if hasher is not None else message
+                if len(msg_hash) != 32:
+                    raise ValueError('Message hash must be 32 bytes long.')
+                if len(signature) != 65:
+                    raise ValueError('Serialized signature must be 65 bytes long.')
+
+                offset = i * RECOVER_RECORD
+                buf[offset : offset + 65] = signature
+                buf[offset + 65 : offset + RECOVER_RECORD] = msg_hash
+
+            self._run(_recover_shared, shm, count)
+
+            public_keys = []
+            for output in range(count * RECOVER_RECORD, count * (RECOVER_RECORD + RECOVERED_SLOT), RECOVERED_SLOT):
+                if not buf[output]:
+                    raise ValueError('failed to recover ECDSA public key')
+
+                public_key = ffi.new('secp256k1_pubkey *')
+                ffi.memmove(public_key, buf[output + 1 : output + RECOVERED_SLOT], 64)
+                public_keys.append(PublicKey(public_key))
+
+            del buf
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return public_keys
+
+    def close(self):
+        """
+        Shut down the worker processes.
+        """
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,153 @@
+import os
+from random import random
+from typing import Optional
+
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.ecdsa import CDATA_SIG_LENGTH, MAX_SIG_LENGTH
+from coincurve.keys import PrivateKey
+from coincurve.types import Hasher, Nonce
+from coincurve.utils import DEFAULT_NONCE, as_buffer, int_to_bytes, sha256, validate_secret
+
+from ._libsecp256k1 import ffi, lib
+
+
+class Signer:
+    def __init__(
+        self,
+        private_key,
+        custom_nonce: Nonce = DEFAULT_NONCE,
+        aux_randomness: bool = True,
+        verify_rate: float = 1.0,
+        context: Optional[Context] = None,
+    ):
+        """
+        A long-lived signer bound to a single private key.
+
+        The secret, the Schnorr keypair, the x-only public key used for self-verification and all
+        output buffers are created once and reused by every signature. Because of the shared
+        buffers, a signer must not be used by multiple threads at the same time.
+
+        :param private_key: The private key, or its secret.
+        :type private_key: PrivateKey | bytes
+        :param custom_nonce: Custom nonce data in the form `(nonce_function, input_data)` used for
+                             ECDSA signatures. Refer to `PrivateKey.sign`.
+        :param aux_randomness: Whether or not to generate 32 bytes of fresh auxiliary randomness for
+                               every Schnorr signature.
+        :param verify_rate: The fraction of Schnorr signatures that are verified after signing,
+                            from `0` (never) to `1` (always, which is what `PrivateKey.sign_schnorr` does).
+        :param context: By default, the context of `private_key`, if any, is used.
+        :raises ValueError: If the secret was invalid.
+        """
+        if isinstance(private_key, PrivateKey):
+            context = context or private_key.context
+            private_key = private_key.secret
+
+        self.context: Context = context or GLOBAL_CONTEXT
+        self.custom_nonce = custom_nonce
+        self.aux_randomness = aux_randomness
+        self.verify_rate = verify_rate
+
+        self._secret = ffi.new('unsigned char [32]', validate_secret(private_key))
+
+        self._keypair = ffi.new('secp256k1_keypair *')
+        if not lib.secp256k1_keypair_create(self.context.ctx, self._keypair, self._secret):
+            raise ValueError('Secret was invalid')
+
+        self._xonly_pubkey = ffi.new('secp256k1_xonly_pubkey *')
+        lib.secp256k1_keypair_xonly_pub(self.context.ctx, self._xonly_pubkey, ffi.NULL, self._keypair)
+
+        self._signature = ffi.new('secp256k1_ecdsa_signature *')
+        self._recoverable_signature = ffi.new('secp256k1_ecdsa_recoverable_signature *')
+        self._der = ffi.new('unsigned char [%d]' % MAX_SIG_LENGTH)
+        self._der_length = ffi.new('size_t *')
+        self._compact = ffi.new('unsigned char [%d]' % CDATA_SIG_LENGTH)
+        self._recid = ffi.new('int *')
+        self._schnorr = ffi.new('unsigned char [64]')
+
+    def _should_verify(self) -> bool:
+        verify_rate = self.verify_rate
+        if verify_rate >= 1:
+            return True
+        if verify_rate <= 0:
+            return False
+        return random() < verify_rate  # noqa: S311
+
+    def sign(self, message: bytes, hasher: Hasher = sha256) -> bytes:
+        """
+        Create an ECDSA signature.
+
+        :param message: The message to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The ECDSA signature.
+        :raises ValueError: If the message hash was not 32 bytes long or the nonce generation function failed.
+        """
+        msg_hash = as_buffer(hasher(message) if hasher is not None else message)
+        if len(msg_hash) != 32:
+            raise ValueError('Message hash must be 32 bytes long.')
+
+        ctx = self.context.ctx
+        nonce_fn, nonce_data = self.custom_nonce
+
+        if not lib.secp256k1_ecdsa_sign(ctx, self._signature, msg_hash, self._secret, nonce_fn, nonce_data):
+            raise ValueError('The nonce generation function failed, or the private key was invalid.')
+
+        der_length = self._der_length
+        der_length[0] = MAX_SIG_LENGTH
+        lib.secp256k1_ecdsa_signature_serialize_der(ctx, self._der, der_length, self._signature)
+
+        return bytes(ffi.buffer(self._der, der_length[0]))
+
+    def sign_recoverable(self, message: bytes, hasher: Hasher = sha256) -> bytes:
+        """
+        Create a recoverable ECDSA signature.
+
+        :param message: The message to sign.
+        :param hasher: The hash function to use, which must return 32 bytes. By default,
+                       the `sha256` algorithm is used. If `None`, no hashing occurs.
+        :return: The recoverable ECDSA signature.
+        :raises ValueError: If the message hash was not 32 bytes long or the nonce generation function failed.
+        """
+        msg_hash = as_buffer(hasher(message) if hasher is not None else message)
+        if len(msg_hash) != 32:
+            raise ValueError('Message hash must be 32 bytes long.')
+
+        ctx = self.context.ctx
+        nonce_fn, nonce_data = self.custom_nonce
+
+        if not lib.secp256k1_ecdsa_sign_recoverable(
+            ctx, self._recoverable_signature, msg_hash, self._secret, nonce_fn, nonce_data
+        ):
+            raise ValueError('The nonce generation function failed, or the private key was invalid.')
+
+        lib.secp256k1_ecdsa_recoverable_signature_serialize_compact(
+            ctx, self._compact, self._recid, self._recoverable_signature
+        )
+
+        return bytes(ffi.buffer(self._compact, CDATA_SIG_LENGTH)) + int_to_bytes(self._recid[0])
+
+    def sign_schnorr(self, message: bytes) -> bytes:
+        """
+        Create a Schnorr signature.
+
+        :param message: The message to sign.
+        :return: The Schnorr signature.
+        :raises ValueError: If the message was not 32 bytes long, signing failed, or the signature
+                            was selected for verification and found invalid.
+        """
+        message = as_buffer(message)
+        if len(message) != 32:
+            raise ValueError('Message must be 32 bytes long.')
+
+        ctx = self.context.ctx
+        aux_randomness = os.urandom(32) if self.aux_randomness else ffi.NULL
+
+        if not lib.secp256k1_schnorrsig_sign32(ctx, self._schnorr, message, self._keypair, aux_randomness):
+            raise ValueError('Signing failed')
+
+        if self._should_verify() and not lib.secp256k1_schnorrsig_verify(
+            ctx, self._schnorr, message, 32, self._xonly_pubkey
+        ):
+            raise ValueError('Invalid signature')
+
+        return bytes(ffi.buffer(self._schnorr, 64))
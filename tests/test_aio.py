@@ -0,0 +1,146 @@
+import asyncio
+from os import urandom
+from threading import Event
+
+import pytest
+
+from coincurve import aio
+from coincurve.aio import AsyncEngine, MicroBatcher
+from coincurve.keys import PrivateKey
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestMicroBatcher:
+    def test_batches_concurrent_requests(self):
+        batches = []
+
+        def double(items):
+            batches.append(len(items))
+            return [x * 2 for (x,) in items]
+
+        async def main():
+            batcher = MicroBatcher(double, max_concurrency=1)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(40)))
+            return batcher, results
+
+        batcher, results = run(main())
+
+        assert results == [i * 2 for i in range(40)]
+        assert sum(batches) == 40
+        assert batches[0] == 16
+        assert len(batches) < 40
+        assert batcher.queue_depth == 0
+        assert batcher.metrics()['batches'] == len(batches)
+        assert batcher.mean_batch_size == 40 / len(batches)
+
+    def test_adapts_to_latency_budget(self):
+        batcher = MicroBatcher(lambda items: items, latency_budget=0.01, max_batch_size=100)
+
+        batcher._record(10, 0.001)
+        assert batcher.batch_size == 100
+
+        for _ in range(50):
+            batcher._record(10, 0.05)
+        assert batcher.batch_size == 2
+
+    def test_item_exceptions(self):
+        def check(items):
+            return [ValueError('odd') if x % 2 else x for (x,) in items]
+
+        async def main():
+            batcher = MicroBatcher(check)
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+        odd, even = run(main())
+
+        assert isinstance(odd, ValueError)
+        assert even == 2
+
+    def test_cancelled_batch_dispatches_queue(self):
+        release = Event()
+
+        def wait(items):
+            release.wait()
+            return [x for (x,) in items]
+
+        async def main():
+            batcher = MicroBatcher(wait, max_batch_size=1, max_concurrency=1)
+            first = asyncio.ensure_future(batcher.submit(1))
+            while not batcher._tasks:
+                await asyncio.sleep(0)
+
+            # The only batch slot is busy, so these requests are queued behind the first batch
+            queued = [asyncio.ensure_future(batcher.submit(i)) for i in (2, 3)]
+            while batcher.queue_depth < 2:
+                await asyncio.sleep(0)
+
+            (task,) = batcher._tasks
+            task.cancel()
+            release.set()
+
+            results = await asyncio.gather(*queued)
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+            return batcher, results
+
+        batcher, results = run(main())
+
+        assert results == [2, 3]
+        assert batcher.queue_depth == 0
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            MicroBatcher(list, latency_budget=0)
+
+        with pytest.raises(ValueError):
+            MicroBatcher(list, max_batch_size=0)
+
+
+class TestAsyncEngine:
+    def test_operations(self, samples):
+        private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
+        peer = PrivateKey()
+        message = urandom(32)
+
+        async def main():
+            engine = AsyncEngine()
+            results = await asyncio.gather(
+                engine.verify(samples['SIGNATURE'], samples['MESSAGE'], samples['PUBLIC_KEY_COMPRESSED']),
+                engine.verify(samples['SIGNATURE'], b'wrong', private_key.public_key),
+                engine.sign(private_key, samples['MESSAGE']),
+                engine.sign_schnorr(private_key, message),
+                engine.recover(samples['RECOVERABLE_SIGNATURE'], samples['MESSAGE']),
+                engine.ecdh(private_key, peer.public_key.format()),
+            )
+            return engine, results
+
+        engine, (valid, invalid, signature, schnorr, recovered, shared) = run(main())
+
+        assert valid
+        assert not invalid
+        assert signature == samples['SIGNATURE']
+        assert private_key.public_key_xonly.verify(schnorr, message)
+        assert recovered.format() == samples['PUBLIC_KEY_COMPRESSED']
+        assert shared == peer.ecdh(private_key.public_key.format())
+        assert engine.metrics()['verify']['items'] == 2
+
+    def test_errors_are_raised(self, samples):
+        async def main():
+            return await aio.verify(samples['SIGNATURE'], samples['MESSAGE'], b'\x00')
+
+        with pytest.raises(ValueError):
+            run(main())
+
+    def test_default_engine(self, samples):
+        async def main():
+            signature = await aio.sign(PrivateKey(samples['PRIVATE_KEY_BYTES']), samples['MESSAGE'])
+            return signature, aio.get_engine(), aio.get_engine()
+
+        signature, first, second = run(main())
+
+        assert signature == samples['SIGNATURE']
+        assert first is second
@@ -1,4 +1,23 @@
-from coincurve import PrivateKey, PublicKey, verify_signature
+import os
+import subprocess
+import sys
+
+import pytest
+
+from coincurve import (
+    PrivateKey,
+    PublicKey,
+    PublicKeyArray,
+    Signer,
+    recover_many,
+    verify_signature,
+    verify_signatures_batch,
+)
+from coincurve.bip32 import ExtendedPrivateKey
+from coincurve.cache import disable_public_key_cache, enable_public_key_cache
+from coincurve.ecdsa import der_to_compact_many
+from coincurve.parallel import ParallelEngine
+from coincurve.utils import convert_public_keys
 
 
 def test_verify_signature_util(benchmark, samples):
@@ -8,10 +27,51 @@ def test_verify_signature_util(benchmark, samples):
     benchmark(verify_signature, signature, message, public_key)
 
 
+def test_verify_signature_util_cached(benchmark, samples):
+    signature = samples['SIGNATURE']
+    message = samples['MESSAGE']
+    public_key = samples['PUBLIC_KEY_COMPRESSED']
+    enable_public_key_cache()
+    try:
+        benchmark(verify_signature, signature, message, public_key)
+    finally:
+        disable_public_key_cache()
+
+
+def test_verify_signatures_batch_util(benchmark, samples):
+    signatures = [samples['SIGNATURE']] * 100
+    messages = [samples['MESSAGE']] * 100
+    public_keys = samples['PUBLIC_KEY_COMPRESSED'] * 100
+    benchmark(verify_signatures_batch, signatures, messages, public_keys)
+
+
 def test_private_key_new(benchmark):
     benchmark(PrivateKey)
 
 
+def test_private_key_generate_many(benchmark):
+    benchmark(PrivateKey.generate_many, 1000, public_keys=True)
+
+
+def test_recover_many_util(benchmark, samples):
+    signatures = samples['RECOVERABLE_SIGNATURE'] * 100
+    messages = [samples['MESSAGE']] * 100
+    benchmark(recover_many, signatures, messages)
+
+
+def test_der_to_compact_many(benchmark, samples):
+    benchmark(der_to_compact_many, [samples['SIGNATURE']] * 1000, normalize=True)
+
+
+def test_private_key_from_der(benchmark, samples):
+    benchmark(PrivateKey.from_der, samples['PRIVATE_KEY_DER'])
+
+
+def test_private_key_to_der(benchmark, samples):
+    private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
+    benchmark(private_key.to_der)
+
+
 def test_private_key_load(benchmark, samples):
     benchmark(PrivateKey, samples['PRIVATE_KEY_BYTES'])
 
@@ -26,11 +86,31 @@ def test_private_key_sign_recoverable(benchmark, samples):
     benchmark(private_key.sign_recoverable, samples['MESSAGE'])
 
 
+def test_private_key_sign_schnorr(benchmark, samples):
+    private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
+    benchmark(private_key.sign_schnorr, samples['MESSAGE'][:32])
+
+
+def test_signer_sign(benchmark, samples):
+    signer = Signer(samples['PRIVATE_KEY_BYTES'])
+    benchmark(signer.sign, samples['MESSAGE'])
+
+
+def test_signer_sign_schnorr_unverified(benchmark, samples):
+    signer = Signer(samples['PRIVATE_KEY_BYTES'], verify_rate=0)
+    benchmark(signer.sign_schnorr, samples['MESSAGE'][:32])
+
+
 def test_private_key_ecdh(benchmark, samples):
     private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
     benchmark(private_key.ecdh, samples['PUBLIC_KEY_COMPRESSED'])
 
 
+def test_private_key_ecdh_many(benchmark, samples):
+    private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
+    benchmark(private_key.ecdh_many, [samples['PUBLIC_KEY_COMPRESSED']] * 100)
+
+
 def test_public_key_load(benchmark, samples):
     benchmark(PublicKey, samples['PUBLIC_KEY_COMPRESSED'])
 
@@ -44,6 +124,16 @@ def test_public_key_format(benchmark, samples):
     benchmark(public_key.format)
 
 
+def test_public_key_array_format(benchmark):
+    array = PublicKeyArray.from_packed(PrivateKey.generate_many(1000, public_keys=True)[1])
+    benchmark(array.format, compressed=False)
+
+
+def test_convert_public_keys(benchmark):
+    public_keys = PrivateKey.generate_many(1000, public_keys=True)[1]
+    benchmark(convert_public_keys, public_keys, 33, 65)
+
+
 def test_public_key_point(benchmark, samples):
     public_key = PublicKey(samples['PUBLIC_KEY_COMPRESSED'])
     benchmark(public_key.point)
@@ -54,7 +144,69 @@ def test_public_key_verify(benchmark, samples):
     benchmark(public_key.verify, samples['SIGNATURE'], samples['MESSAGE'])
 
 
-if __name__ == '__main__':
-    import pytest
+@pytest.mark.parametrize('workers', sorted({1, 2, 4, os.cpu_count() or 1}))
+def test_parallel_engine_verify_scaling(benchmark, samples, workers):
+    signatures = [samples['SIGNATURE']] * 4096
+    messages = [samples['MESSAGE']] * 4096
+    public_keys = [samples['PUBLIC_KEY_COMPRESSED']] * 4096
+    with ParallelEngine(workers=workers) as engine:
+        benchmark.extra_info['ops'] = len(signatures)
+        benchmark(engine.verify, signatures, messages, public_keys)
+
+
+def test_public_key_array_from_sequence(benchmark, samples):
+    benchmark(PublicKeyArray.from_sequence, samples['PRIVATE_KEY_BYTES'], 1000)
+
+
+@pytest.mark.parametrize('count', [256, 4096])
+def test_public_key_linear_combination(benchmark, count):
+    secrets, public_keys = PrivateKey.generate_many(count, public_keys=True)
+    scalars = [secrets[i : i + 32] for i in range(0, len(secrets), 32)]
+    benchmark(PublicKey.linear_combination, scalars, PublicKeyArray.from_packed(public_keys))
 
+
+def test_bip32_derive_range(benchmark):
+    xpub = ExtendedPrivateKey.from_seed(bytes(16)).derive_path("m/84'/0'/0'/0").to_public()
+    benchmark(xpub.derive_range, 0, 1000)
+
+
+# About 2.5x the ~20ms of the lazy import, well below the ~70ms of the eager one. The assertions
+# on what has been loaded are the main guards, as they do not depend on the machine.
+IMPORT_TIME_BUDGET = 0.05
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import coincurve
+from coincurve import PrivateKey
+elapsed = time.perf_counter() - start
+from coincurve import ecdh
+print(
+    elapsed,
+    'asn1crypto' in sys.modules,
+    coincurve.GLOBAL_CONTEXT._ctx is None,
+    ecdh._copy_compressed_point_callback is None,
+)
+"""
+
+
+def test_import_time():
+    timings = []
+    for _ in range(3):
+        output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT], text=True)  # noqa: S603
+        elapsed, asn1crypto_imported, context_lazy, callback_lazy = output.split()
+        timings.append(float(elapsed))
+
+        # Heavy dependencies, the global context and cffi callbacks are only initialized on first use
+        assert asn1crypto_imported == 'False'
+        assert context_lazy == 'True'
+        assert callback_lazy == 'True'
+
+    assert min(timings) < IMPORT_TIME_BUDGET
+
+
+def test_import_process(benchmark):
+    benchmark.pedantic(subprocess.check_call, args=([sys.executable, '-c', 'import coincurve'],), rounds=5)
+
+
+if __name__ == '__main__':
     pytest.main(['-s', __file__])
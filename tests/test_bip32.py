@@ -0,0 +1,213 @@
+import hashlib
+import os
+
+import pytest
+
+from coincurve.bip32 import (
+    HARDENED,
+    ExtendedKey,
+    ExtendedPrivateKey,
+    ExtendedPublicKey,
+    _ripemd160_python,
+    b58decode_check,
+    b58encode_check,
+    hash160,
+    parse_extended_key,
+    parse_path,
+)
+
+# https://github.com/bitcoin/bips/blob/master/bip-0032.mediawiki#test-vector-1
+SEED = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+VECTORS = [
+    (
+        'm',
+        'xpub661MyMwAqRbcFtXgS5sYJABqqG9YLmC4Q1Rdap9gSE8NqtwybGhePY2gZ29ESFjqJoCu1Rupje8YtGqsefD265TMg7usUDFdp6W1EGMcet8',
+        'xprv9s21ZrQH143K3QTDL4LXw2F7HEK3wJUD2nW2nRk4stbPy6cq3jPPqjiChkVvvNKmPGJxWUtg6LnF5kejMRNNU3TGtRBeJgk33yuGBxrMPHi',
+    ),
+    (
+        "m/0'",
+        'xpub68Gmy5EdvgibQVfPdqkBBCHxA5htiqg55crXYuXoQRKfDBFA1WEjWgP6LHhwBZeNK1VTsfTFUHCdrfp1bgwQ9xv5ski8PX9rL2dZXvgGDnw',
+        'xprv9uHRZZhk6KAJC1avXpDAp4MDc3sQKNxDiPvvkX8Br5ngLNv1TxvUxt4cV1rGL5hj6KCesnDYUhd7oWgT11eZG7XnxHrnYeSvkzY7d2bhkJ7',
+    ),
+    (
+        "m/0'/1",
+        'xpub6ASuArnXKPbfEwhqN6e3mwBcDTgzisQN1wXN9BJcM47sSikHjJf3UFHKkNAWbWMiGj7Wf5uMash7SyYq527Hqck2AxYysAA7xmALppuCkwQ',
+        'xprv9wTYmMFdV23N2TdNG573QoEsfRrWKQgWeibmLntzniatZvR9BmLnvSxqu53Kw1UmYPxLgboyZQaXwTCg8MSY3H2EU4pWcQDnRnrVA1xe8fs',
+    ),
+    (
+        "m/0'/1/2'",
+        'xpub6D4BDPcP2GT577Vvch3R8wDkScZWzQzMMUm3PWbmWvVJrZwQY4VUNgqFJPMM3No2dFDFGTsxxpG5uJh7n7epu4trkrX7x7DogT5Uv6fcLW5',
+        'xprv9z4pot5VBttmtdRTWfWQmoH1taj2axGVzFqSb8C9xaxKymcFzXBDptWmT7FwuEzG3ryjH4ktypQSAewRiNMjANTtpgP4mLTj34bhnZX7UiM',
+    ),
+]
+
+
+@pytest.fixture
+def master():
+    return ExtendedPrivateKey.from_seed(SEED)
+
+
+class TestExtendedKeys:
+    @pytest.mark.parametrize(('path', 'xpub', 'xprv'), VECTORS)
+    def test_vectors(self, master, path, xpub, xprv):
+        node = master.derive_path(path)
+        assert node.to_string() == xprv
+        assert str(node.to_public()) == xpub
+
+        assert parse_extended_key(xprv) == node
+        assert parse_extended_key(xpub) == node.to_public()
+        assert parse_extended_key(xpub).to_string() == xpub
+
+    def test_public_derivation(self, master):
+        account = master.derive_path("m/44'/0'/0'")
+        xpub = account.to_public()
+
+        assert xpub.derive_path('0/7') == account.derive_path('0/7').to_public()
+        assert xpub.child(3).public_key == account.child(3).public_key
+
+        with pytest.raises(ValueError, match='Hardened'):
+            xpub.child(HARDENED)
+
+    def test_derive_range(self, master):
+        account = master.derive_path("m/84'/0'/0'/0")
+        xpub = account.to_public()
+
+        public_keys = xpub.derive_range(5, 25)
+        secrets = account.derive_range(5, 25)
+        for i in range(20):
+            child = account.child(5 + i)
+            assert public_keys[33 * i : 33 * (i + 1)] == child.public_key
+            assert secrets[32 * i : 32 * (i + 1)] == child.secret
+
+        hardened = master.derive_range(0, 3, hardened=True)
+        assert hardened[:32] == master.child(HARDENED).secret
+        assert hardened[64:] == master.child(HARDENED + 2).secret
+
+        assert xpub.derive_range(0, 0) == b''
+
+    def test_invalid_range(self, master):
+        with pytest.raises(ValueError):
+            master.derive_range(2, 1)
+
+        with pytest.raises(ValueError):
+            master.to_public().derive_range(0, HARDENED + 1)
+
+        with pytest.raises(ValueError):
+            master.derive_range(0, HARDENED, hardened=True)
+
+    def test_cache(self, master):
+        node = master.derive_path("m/44'/0'/0'/0/1")
+        assert len(master._cache) == 5
+        assert master.derive_path("m/44'/0'/0'/0/1") is node
+        assert master.derive_path([44 | HARDENED, HARDENED, HARDENED, 0]) is master.derive_path("44h/0H/0'/0")
+
+        sibling = master.derive_path("m/44'/0'/0'/0/2")
+        assert sibling == master.child(44 | HARDENED).child(HARDENED).child(HARDENED).child(0).child(2)
+
+        uncached = ExtendedPrivateKey.from_seed(SEED, cache_size=0)
+        assert uncached.derive_path("m/44'/0'/0'/0/1") == node
+
+    def test_metadata(self, master):
+        child = master.derive_path("m/0'/1")
+        assert child.depth == 2
+        assert child.child_number == 1
+        assert child.parent_fingerprint == master.child(HARDENED).fingerprint
+        assert master.fingerprint == hash160(master.public_key)[:4]
+
+        testnet = ExtendedPrivateKey.from_seed(SEED, testnet=True)
+        assert testnet.to_string().startswith('tprv')
+        assert testnet.to_public().to_string().startswith('tpub')
+        assert parse_extended_key(testnet.to_string()).testnet
+
+    def test_invalid(self, master):
+        with pytest.raises(ValueError):
+            parse_extended_key(master.to_string()[:-1] + 'j')
+
+        with pytest.raises(ValueError):
+            parse_extended_key(b58encode_check(b'\x00' * 78))
+
+        with pytest.raises(ValueError):
+            parse_extended_key(b58encode_check(b'\x00' * 77))
+
+        data = bytearray(b58decode_check(master.to_string()))
+        data[9] = 1
+        with pytest.raises(ValueError, match='Master'):
+            parse_extended_key(b58encode_check(bytes(data)))
+
+        data = bytearray(b58decode_check(master.to_public().to_string()))
+        data[45] = 4
+        with pytest.raises(ValueError):
+            parse_extended_key(b58encode_check(bytes(data)))
+
+        with pytest.raises(ValueError):
+            ExtendedPublicKey(master.public_key, bytes(31))
+
+        with pytest.raises(ValueError):
+            master.child(2**32)
+
+    @pytest.mark.parametrize('path', ['m/x', "m/1''", 'm/2147483648', 'm//1'])
+    def test_invalid_path(self, path):
+        with pytest.raises(ValueError):
+            parse_path(path)
+
+    def test_abstract(self):
+        with pytest.raises(TypeError):
+            ExtendedKey(bytes(32))
+
+    def test_parse_path(self):
+        assert parse_path('m') == ()
+        assert parse_path("m/0'/1h/2H/3") == (HARDENED, HARDENED + 1, HARDENED + 2, 3)
+
+        with pytest.raises(ValueError):
+            parse_path([-1])
+
+
+class TestHelpers:
+    def test_base58(self):
+        # The P2PKH address of an all zero key hash
+        assert b58encode_check(bytes(21)) == '1111111111111111111114oLvT2'
+        assert b58decode_check('1111111111111111111114oLvT2') == bytes(21)
+
+        with pytest.raises(ValueError, match='character'):
+            b58decode_check('1111111111111111111114oLvT0')
+
+        with pytest.raises(ValueError, match='checksum'):
+            b58decode_check('1111111111111111111114oLvT3')
+
+    @pytest.mark.parametrize(
+        ('data', 'digest'),
+        [
+            # https://homes.esat.kuleuven.be/~bosselae/ripemd160.html
+            (b'', '9c1185a5c5e9fc54612808977ee8f548b2258d31'),
+            (b'a', '0bdc9d2d256b3ee9daae347be6f4dc835a467ffe'),
+            (b'abc', '8eb208f7e05d987a9b044a8e98c6b087f15a0bfc'),
+            (b'message digest', '5d0689ef49d2fae572b881b123a85ffa21595f36'),
+            (b'abcdefghijklmnopqrstuvwxyz', 'f71c27109c692c1b56bbdceb5b9d2865b3708dbc'),
+            (b'abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq', '12a053384a9c0c88e405a06c27dcf49ada62eb2b'),
+            (
+                b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789',
+                'b0e20b6e3116640286ed3a87a5713079b21f5189',
+            ),
+            (b'1234567890' * 8, '9b752e45573d4b39f4dbd3323cab82bf63326bfb'),
+        ],
+    )
+    def test_ripemd160_vectors(self, data, digest):
+        assert _ripemd160_python(data).hex() == digest
+
+    def test_ripemd160_fallback(self, monkeypatch):
+        def new(name, data=b''):
+            raise ValueError(f'unsupported hash type {name}')
+
+        expected = _ripemd160_python(hashlib.sha256(b'key').digest())
+        monkeypatch.setattr(hashlib, 'new', new)
+        assert hash160(b'key') == expected
+
+    @pytest.mark.parametrize('length', [0, 1, 55, 56, 64, 100])
+    def test_ripemd160(self, length):
+        data = os.urandom(length)
+        try:
+            expected = hashlib.new('ripemd160', data).digest()
+        except ValueError:  # no cov
+            pytest.skip('ripemd160 is unavailable')
+
+        assert _ripemd160_python(data) == expected
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from coincurve.cache import (
+    PublicKeyCache,
+    disable_public_key_cache,
+    enable_public_key_cache,
+    get_public_key_cache,
+)
+from coincurve.keys import PrivateKey, PublicKey
+from coincurve.utils import verify_signature, verify_signatures_batch
+
+
+@pytest.fixture
+def cache():
+    cache = enable_public_key_cache(maxsize=4)
+    yield cache
+    disable_public_key_cache()
+
+
+class TestPublicKeyCache:
+    def test_disabled_by_default(self):
+        assert get_public_key_cache() is None
+
+    def test_hits_and_misses(self, cache, samples):
+        first = PublicKey(samples['PUBLIC_KEY_COMPRESSED'])
+        second = PublicKey(samples['PUBLIC_KEY_COMPRESSED'])
+
+        assert first.public_key != second.public_key
+        assert first == second
+        assert first.format() == samples['PUBLIC_KEY_COMPRESSED']
+
+        info = cache.info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.currsize == 1
+
+    def test_hot_paths(self, cache, samples):
+        assert verify_signature(samples['SIGNATURE'], samples['MESSAGE'], samples['PUBLIC_KEY_COMPRESSED'])
+        assert verify_signatures_batch(
+            [samples['SIGNATURE']], [samples['MESSAGE']], [samples['PUBLIC_KEY_COMPRESSED']]
+        ) == ([True], [])
+
+        a = PrivateKey()
+        b = PrivateKey()
+        assert a.ecdh(b.public_key.format()) == a.ecdh(b.public_key.format())
+
+        assert cache.info().hits == 2
+
+    def test_invalid_keys_not_cached(self, cache):
+        with pytest.raises(ValueError):
+            PublicKey(b'\x02' + bytes(32))
+
+        assert len(cache) == 0
+        assert cache.info().misses == 1
+
+    def test_size_bound(self, cache):
+        keys = [PrivateKey().public_key.format() for _ in range(6)]
+        for key in keys:
+            PublicKey(key)
+
+        assert len(cache) == 4
+        assert cache.info().evictions == 2
+
+        # The least recently used entries were evicted.
+        PublicKey(keys[-1])
+        assert cache.info().hits == 1
+        PublicKey(keys[0])
+        assert cache.info().misses == 7
+
+    def test_memory_bound(self):
+        cache = PublicKeyCache(maxsize=100, max_bytes=1)
+        public_key = PrivateKey().public_key
+        assert cache.parse(public_key.public_key, public_key.format(), public_key.context)
+
+        info = cache.info()
+        assert info.currsize == 0
+        assert info.nbytes == 0
+        assert info.evictions == 1
+
+    def test_clear(self, cache, samples):
+        PublicKey(samples['PUBLIC_KEY_COMPRESSED'])
+        cache.clear()
+
+        assert tuple(cache.info())[:4] == (0, 0, 0, 0)
+
+    def test_thread_safety(self, cache):
+        keys = [PrivateKey().public_key.format() for _ in range(8)]
+
+        with ThreadPoolExecutor(4) as executor:
+            formatted = list(executor.map(lambda key: PublicKey(key).format(), keys * 50))
+
+        assert formatted == keys * 50
+        info = cache.info()
+        assert info.hits + info.misses == 400
+        assert info.currsize == 4
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            PublicKeyCache(maxsize=0)
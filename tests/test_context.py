@@ -0,0 +1,163 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from coincurve.context import STATIC_CONTEXT, Context, ContextPool
+from coincurve.flags import CONTEXT_NONE
+from coincurve.keys import PrivateKey, PublicKey
+from coincurve.utils import verify_signature
+
+
+class TestContext:
+    def test_lazy(self, samples):
+        context = Context()
+        assert context._ctx is None
+
+        private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'], context)
+        assert private_key.sign(samples['MESSAGE']) == samples['SIGNATURE']
+        assert context._ctx is not None
+        assert context.ctx is context._ctx
+
+    def test_reseed_before_use(self, samples):
+        context = Context()
+        context.reseed(samples['PRIVATE_KEY_BYTES'])
+        assert context._ctx is None
+
+        assert PrivateKey(samples['PRIVATE_KEY_BYTES'], context).sign(samples['MESSAGE']) == samples['SIGNATURE']
+        context.reseed()
+
+    def test_clone_unused(self):
+        context = Context(name='original')
+        clone = context.clone(name='clone')
+
+        assert context._ctx is not None
+        assert clone.ctx != context.ctx
+        assert repr(clone) == 'clone'
+
+    def test_invalid_flag(self):
+        with pytest.raises(ValueError):
+            Context(flag=CONTEXT_NONE + 12345)
+
+
+class TestStaticContext:
+    def test_verify_and_parse(self, samples):
+        public_key = PublicKey(samples['PUBLIC_KEY_COMPRESSED'], STATIC_CONTEXT)
+        assert public_key.format(compressed=False) == samples['PUBLIC_KEY_UNCOMPRESSED']
+        assert public_key.verify(samples['SIGNATURE'], samples['MESSAGE'])
+        assert verify_signature(samples['SIGNATURE'], samples['MESSAGE'], public_key.format(), context=STATIC_CONTEXT)
+
+    def test_read_only_operations(self, samples):
+        # Verification, parsing and serialization never create the context they are given
+        context = Context()
+        public_key = PublicKey(samples['PUBLIC_KEY_COMPRESSED'], context)
+        assert public_key.verify(samples['SIGNATURE'], samples['MESSAGE'])
+        assert public_key.format(compressed=False) == samples['PUBLIC_KEY_UNCOMPRESSED']
+        assert public_key.add(samples['PRIVATE_KEY_BYTES']) == PublicKey(public_key.format()).add(
+            samples['PRIVATE_KEY_BYTES']
+        )
+        assert context._ctx is None
+
+    def test_secret_operations_refused(self, samples):
+        with pytest.raises(ValueError, match='static context'):
+            PrivateKey(samples['PRIVATE_KEY_BYTES'], STATIC_CONTEXT).sign(samples['MESSAGE'])
+
+        with pytest.raises(ValueError, match='static context'):
+            PublicKey.from_secret(samples['PRIVATE_KEY_BYTES'], STATIC_CONTEXT)
+
+        with pytest.raises(ValueError, match='static context'):
+            PrivateKey(samples['PRIVATE_KEY_BYTES'], STATIC_CONTEXT).ecdh(samples['PUBLIC_KEY_COMPRESSED'])
+
+    def test_not_randomizable(self):
+        with pytest.raises(ValueError):
+            STATIC_CONTEXT.reseed()
+
+        with pytest.raises(ValueError):
+            STATIC_CONTEXT.clone()
+
+
+class TestContextPool:
+    def test_per_thread(self, samples):
+        pool = ContextPool(name='pool')
+        assert pool.context is pool.context
+
+        barrier = Barrier(4)
+
+        def get_context(_):
+            # Keep every worker busy so that each one gets a task
+            barrier.wait()
+            return pool.context
+
+        with ThreadPoolExecutor(4) as executor:
+            contexts = list(executor.map(get_context, range(4)))
+
+        assert len({id(context) for context in contexts}) == 4
+        assert all(context.ctx != pool.context.ctx for context in contexts)
+        assert repr(pool) == repr(pool.context) == 'pool'
+
+        private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'], pool.context)
+        assert private_key.sign(samples['MESSAGE']) == samples['SIGNATURE']
+
+    def test_reseed_swaps(self, samples):
+        pool = ContextPool()
+        previous = pool.context
+        pool.reseed()
+
+        assert pool.context is not previous
+        # The previous context remains usable by any operation that still holds it
+        assert PrivateKey(samples['PRIVATE_KEY_BYTES'], previous).sign(samples['MESSAGE']) == samples['SIGNATURE']
+
+    def test_background_reseed(self):
+        with ContextPool(reseed_interval=0.001) as pool:
+            previous = pool.context
+            while pool.context is previous:
+                time.sleep(0.001)
+
+        assert pool._thread is None
+
+    def test_signing_during_reseed(self, samples):
+        with ContextPool(reseed_interval=0.001) as pool:
+
+            def sign(_):
+                return PrivateKey(samples['PRIVATE_KEY_BYTES'], pool.context).sign(samples['MESSAGE'])
+
+            with ThreadPoolExecutor(4) as executor:
+                assert set(executor.map(sign, range(200))) == {samples['SIGNATURE']}
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requires fork')
+    def test_reseed_after_fork(self):
+        closed = ContextPool(reseed_interval=60)
+        closed.close()
+
+        with ContextPool(reseed_interval=60) as pool, ContextPool(reseed_interval=60) as stopping:
+            previous = pool.context
+            # Stopped but not yet joined, as if another thread was in the middle of `close`
+            stopping._stop.set()
+
+            read, write = os.pipe()
+            pid = os.fork()
+            if not pid:  # no cov
+                try:
+                    checks = (
+                        pool.context is not previous,
+                        pool._thread.is_alive(),
+                        stopping._thread.is_alive() and not stopping._stop.is_set(),
+                        closed._thread is None and closed._stop.is_set(),
+                    )
+                    os.write(write, bytes(checks))
+                finally:
+                    os._exit(0)
+
+            os.close(write)
+            with os.fdopen(read, 'rb') as f:
+                checks = f.read()
+            os.waitpid(pid, 0)
+
+        assert checks == bytes([True] * 4)
+        assert pool.context is previous
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            ContextPool(reseed_interval=0)
@@ -1,11 +1,209 @@
 import pytest
 
-from coincurve.ecdsa import cdata_to_der, der_to_cdata
+from coincurve.ecdsa import (
+    Signature,
+    cdata_to_der,
+    compact_to_der_many,
+    der_to_cdata,
+    der_to_compact_many,
+    deserialize_compact,
+    normalize_many,
+    parse_der_lax,
+    serialize_compact,
+    signature_normalize,
+)
+from coincurve.keys import PrivateKey, PublicKey
+from coincurve.utils import GROUP_ORDER_INT, verify_signature, verify_signatures_batch
+
+
+def high_s(compact: bytes) -> bytes:
+    return compact[:32] + (GROUP_ORDER_INT - int.from_bytes(compact[32:], 'big')).to_bytes(32, 'big')
 
 
 def test_der(samples):
     assert cdata_to_der(der_to_cdata(samples['SIGNATURE'])) == samples['SIGNATURE']
 
 
+def test_compact(samples):
+    compact = serialize_compact(der_to_cdata(samples['SIGNATURE']))
+    assert len(compact) == 64
+    assert cdata_to_der(deserialize_compact(compact)) == samples['SIGNATURE']
+
+    with pytest.raises(ValueError):
+        deserialize_compact(compact[:-1])
+
+
+def test_normalize(samples):
+    compact = serialize_compact(der_to_cdata(samples['SIGNATURE']))
+
+    normalized, cdata = signature_normalize(deserialize_compact(high_s(compact)))
+    assert normalized
+    assert serialize_compact(cdata) == compact
+
+    normalized, _ = signature_normalize(deserialize_compact(compact))
+    assert not normalized
+
+
+class TestSignature:
+    def test_der(self, samples):
+        signature = Signature(samples['SIGNATURE'])
+
+        assert signature.to_der() == samples['SIGNATURE']
+        assert bytes(signature) == samples['SIGNATURE']
+        assert signature.recovery_id is None
+
+    def test_lazy_parsing(self, samples):
+        signature = Signature(b'\x30\x00')
+        assert signature.to_der() == b'\x30\x00'
+
+        with pytest.raises(ValueError):
+            _ = signature.cdata
+
+        cdata = Signature(samples['SIGNATURE']).cdata
+        signature = Signature(samples['SIGNATURE'])
+        assert signature.cdata is signature.cdata
+        assert cdata_to_der(signature.cdata) == cdata_to_der(cdata)
+
+    def test_compact(self, samples):
+        compact = Signature(samples['SIGNATURE']).to_compact()
+        signature = Signature.from_compact(bytearray(compact))
+
+        assert signature.to_compact() == compact
+        assert signature.to_der() == samples['SIGNATURE']
+        assert signature == Signature(samples['SIGNATURE'])
+
+        with pytest.raises(ValueError):
+            Signature.from_compact(compact + b'\x00')
+
+    def test_recoverable(self, samples):
+        signature = Signature.from_recoverable(samples['RECOVERABLE_SIGNATURE'])
+
+        assert signature.to_recoverable() == samples['RECOVERABLE_SIGNATURE']
+        assert signature.recovery_id == samples['RECOVERABLE_SIGNATURE'][64]
+        assert signature.to_compact() == samples['RECOVERABLE_SIGNATURE'][:64]
+        assert PublicKey.from_signature_and_message(signature, samples['MESSAGE']).format() == samples.get(
+            'PUBLIC_KEY_COMPRESSED'
+        )
+
+        with pytest.raises(ValueError):
+            Signature(samples['SIGNATURE']).to_recoverable()
+
+        with pytest.raises(ValueError):
+            PublicKey.from_signature_and_message(Signature(samples['SIGNATURE']), samples['MESSAGE'])
+
+    def test_low_s(self, samples):
+        signature = Signature(samples['SIGNATURE'])
+        assert signature.is_low_s
+        assert signature.normalize() is signature
+
+        malleated = Signature.from_compact(high_s(signature.to_compact()))
+        assert not malleated.is_low_s
+        assert malleated.normalize() == signature
+        assert malleated.normalize().is_low_s
+
+        # libsecp256k1 only accepts signatures in lower-S form.
+        assert not PublicKey(samples['PUBLIC_KEY_COMPRESSED']).verify(malleated, samples['MESSAGE'])
+
+    def test_verify_apis(self, samples):
+        signature = Signature(samples['SIGNATURE'])
+        public_key = PublicKey(samples['PUBLIC_KEY_COMPRESSED'])
+
+        assert public_key.verify(signature, samples['MESSAGE'])
+        assert not PrivateKey().public_key.verify(signature, samples['MESSAGE'])
+        assert verify_signature(signature, samples['MESSAGE'], samples['PUBLIC_KEY_COMPRESSED'])
+        assert verify_signatures_batch(
+            [signature, Signature(b'\x30\x00'), samples['SIGNATURE']],
+            [samples['MESSAGE']] * 3,
+            [samples['PUBLIC_KEY_COMPRESSED']] * 3,
+        ) == ([True, False, True], [1])
+
+        with pytest.raises(ValueError):
+            public_key.verify(Signature(b'\x30\x00'), samples['MESSAGE'])
+
+
+class TestParseDerLax:
+    def test_strict(self, samples):
+        assert parse_der_lax(samples['SIGNATURE']) == Signature(samples['SIGNATURE']).to_compact()
+
+    def test_non_strict(self, samples):
+        compact = Signature(samples['SIGNATURE']).to_compact()
+        r, s = compact[:32], compact[32:]
+
+        # Long form lengths, superfluous zero padding and trailing data
+        der = b'\x30\x81\x46\x02\x22\x00\x00' + r + b'\x02\x81\x22\x00\x00' + s + b'\x01'
+        assert parse_der_lax(der) == compact
+        assert parse_der_lax(memoryview(der)) == compact
+
+        # Values without padding
+        der = b'\x30\x06\x02\x01\x01\x02\x01\x02'
+        assert parse_der_lax(der) == (b'\x01'.rjust(32, b'\x00') + b'\x02'.rjust(32, b'\x00'))
+
+    def test_out_of_range(self):
+        assert parse_der_lax(b'\x30\x00\x02\x21\x01' + bytes(32) + b'\x02\x01\x01') == bytes(64)
+        assert parse_der_lax(b'\x30\x00\x02\x20' + GROUP_ORDER_INT.to_bytes(32, 'big') + b'\x02\x01\x01') == bytes(64)
+
+    @pytest.mark.parametrize(
+        'der',
+        [
+            b'',
+            b'\x31',
+            b'\x30',
+            b'\x30\x85\x00',
+            b'\x30\x06\x03\x01\x01\x02\x01\x02',
+            b'\x30\x06\x02',
+            b'\x30\x06\x02\x84\x01\x00\x00\x00\x01',
+            b'\x30\x06\x02\x05\x01',
+            b'\x30\x06\x02\x01\x01\x02\x05\x02',
+        ],
+    )
+    def test_invalid(self, der):
+        assert parse_der_lax(der) is None
+
+
+class TestTranscoding:
+    def test_roundtrip(self):
+        signatures = [PrivateKey().sign(b'foo') for _ in range(5)]
+
+        compact, failed = der_to_compact_many(signatures)
+        assert failed == []
+        assert compact == b''.join(Signature(signature).to_compact() for signature in signatures)
+
+        assert compact_to_der_many(bytearray(compact)) == (signatures, [])
+
+    def test_failures(self, samples):
+        compact, failed = der_to_compact_many([samples['SIGNATURE'], b'\x30\x00', samples['SIGNATURE']])
+        assert failed == [1]
+        assert compact[64:128] == bytes(64)
+
+        signatures, failed = compact_to_der_many(b'\xff' * 64 + compact[:64])
+        assert failed == [0]
+        assert signatures == [b'', samples['SIGNATURE']]
+
+        with pytest.raises(ValueError):
+            compact_to_der_many(compact[:-1])
+
+    def test_lax(self, samples):
+        compact = Signature(samples['SIGNATURE']).to_compact()
+        der = b'\x30\x00\x02\x21\x00' + compact[:32] + b'\x02\x20' + compact[32:]
+
+        assert der_to_compact_many([der])[1] == [0]
+        assert der_to_compact_many([der], lax=True) == (compact, [])
+
+    def test_normalize(self, samples):
+        compact = Signature(samples['SIGNATURE']).to_compact()
+        malleated = high_s(compact)
+
+        assert der_to_compact_many([Signature.from_compact(malleated).to_der()], normalize=True) == (compact, [])
+
+        data = compact + malleated + b'\xff' * 64
+        normalized, changed, failed = normalize_many(data)
+        assert normalized == compact * 2 + b'\xff' * 64
+        assert changed == [1]
+        assert failed == [2]
+
+        with pytest.raises(ValueError):
+            normalize_many(data[:-1])
+
+
 if __name__ == '__main__':
     pytest.main(['-s', __file__])
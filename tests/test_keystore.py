@@ -0,0 +1,147 @@
+import os
+import stat
+
+import pytest
+
+from coincurve.keys import PrivateKey, PublicKey, PublicKeyXOnly
+from coincurve.keystore import HEADER, INDEX_ENTRY, RECORD_LENGTH, KeyStore
+from coincurve.utils import GROUP_ORDER_INT, int_to_bytes_padded
+
+
+@pytest.fixture
+def keystore(tmp_path, samples):
+    secrets, _ = PrivateKey.generate_many(99)
+    with KeyStore.create(tmp_path / 'keys.ccks', samples['PRIVATE_KEY_BYTES'] + secrets) as keystore:
+        yield keystore
+
+
+class TestKeyStore:
+    def test_lookup(self, keystore, samples):
+        assert len(keystore) == 100
+        for public_key in (
+            samples['PUBLIC_KEY_COMPRESSED'],
+            samples['PUBLIC_KEY_UNCOMPRESSED'],
+            samples['PUBLIC_KEY_COMPRESSED'][1:],
+        ):
+            assert keystore.find(public_key) == 0
+            assert public_key in keystore
+
+        assert keystore.secret(0) == samples['PRIVATE_KEY_BYTES']
+        assert keystore.public_key(0) == samples['PUBLIC_KEY_COMPRESSED']
+        assert keystore.public_key_xonly(0) == samples['PUBLIC_KEY_COMPRESSED'][1:]
+
+    def test_every_key(self, keystore):
+        for position in range(len(keystore)):
+            private_key = PrivateKey(keystore.secret(position))
+            assert keystore.public_key(position) == private_key.public_key.format()
+            assert keystore.find(private_key.public_key.format(compressed=False)) == position
+            assert keystore.find(private_key.public_key_xonly.format()) == position
+
+    def test_missing(self, keystore, samples):
+        public_key = PrivateKey().public_key
+        assert keystore.find(public_key.format()) is None
+        assert public_key.format(compressed=False) not in keystore
+        assert keystore.find(b'\x00' * 20) is None
+
+        # Same x coordinate, other parity
+        flipped = bytes([samples['PUBLIC_KEY_COMPRESSED'][0] ^ 1]) + samples['PUBLIC_KEY_COMPRESSED'][1:]
+        assert flipped not in keystore
+
+        with pytest.raises(KeyError):
+            keystore.private_key(public_key.format())
+
+        with pytest.raises(IndexError):
+            keystore.secret(100)
+
+    def test_negated_secret(self, tmp_path, samples):
+        negated = int_to_bytes_padded(GROUP_ORDER_INT - PrivateKey(samples['PRIVATE_KEY_BYTES']).to_int())
+        with KeyStore.create(tmp_path / 'keys.ccks', samples['PRIVATE_KEY_BYTES'] + negated) as keystore:
+            assert keystore.find(PrivateKey(negated).public_key.format()) == 1
+            assert keystore.find(samples['PUBLIC_KEY_COMPRESSED']) == 0
+
+    def test_sign(self, keystore, samples):
+        assert keystore.sign(samples['PUBLIC_KEY_COMPRESSED'], samples['MESSAGE']) == samples['SIGNATURE']
+        assert keystore.private_key(samples['PUBLIC_KEY_UNCOMPRESSED']).secret == samples['PRIVATE_KEY_BYTES']
+
+        public_key = keystore.public_key_xonly(42)
+        message = bytes(32)
+        signature = keystore.sign_schnorr(public_key, message)
+        assert PublicKeyXOnly(public_key).verify(signature, message)
+
+        signature = keystore.sign(keystore.public_key(42), message, hasher=None)
+        assert PublicKey(keystore.public_key(42)).verify(signature, message, hasher=None)
+
+    def test_reopen(self, keystore, samples):
+        reopened = KeyStore(keystore.path)
+        assert len(reopened) == 100
+        assert reopened.find(samples['PUBLIC_KEY_COMPRESSED']) == 0
+        reopened.close()
+
+    def test_empty(self, tmp_path):
+        with KeyStore.create(tmp_path / 'keys.ccks', b'') as keystore:
+            assert len(keystore) == 0
+            assert keystore.find(PrivateKey().public_key.format()) is None
+
+    def test_invalid_secrets(self, tmp_path, samples):
+        with pytest.raises(ValueError, match='concatenated'):
+            KeyStore.create(tmp_path / 'keys.ccks', bytes(31))
+
+        with pytest.raises(ValueError, match='index 1 is invalid'):
+            KeyStore.create(tmp_path / 'keys.ccks', samples['PRIVATE_KEY_BYTES'] + bytes(32))
+
+        with pytest.raises(ValueError, match='index 1 is a duplicate'):
+            KeyStore.create(tmp_path / 'keys.ccks', samples['PRIVATE_KEY_BYTES'] * 2)
+
+    def test_failed_create_keeps_existing(self, keystore, samples):
+        data = keystore.path.read_bytes()
+        with pytest.raises(ValueError, match='duplicate'):
+            KeyStore.create(keystore.path, samples['PRIVATE_KEY_BYTES'] * 2)
+
+        assert keystore.path.read_bytes() == data
+        assert list(keystore.path.parent.iterdir()) == [keystore.path]
+
+    @pytest.mark.skipif(os.name == 'nt', reason='POSIX permissions')
+    def test_private_file(self, keystore):
+        assert stat.S_IMODE(keystore.path.stat().st_mode) == 0o600
+
+    def test_invalid_file(self, tmp_path, keystore):
+        path = tmp_path / 'invalid'
+        path.write_bytes(b'not a key store' * 4)
+        with pytest.raises(ValueError, match='not a key store'):
+            KeyStore(path)
+
+        data = bytearray(keystore.path.read_bytes())
+        path.write_bytes(data[:-1])
+        with pytest.raises(ValueError, match='truncated'):
+            KeyStore(path)
+
+        data[4] = 2
+        path.write_bytes(data)
+        with pytest.raises(ValueError, match='version'):
+            KeyStore(path)
+
+        path.write_bytes(data[: HEADER.size - 1])
+        with pytest.raises(ValueError, match='not a key store'):
+            KeyStore(path)
+
+    def test_corrupt_index(self, tmp_path, keystore, samples):
+        data = bytearray(keystore.path.read_bytes())
+        index_offset = HEADER.size + len(keystore) * RECORD_LENGTH
+        slots = (len(data) - index_offset) // INDEX_ENTRY.size
+        path = tmp_path / 'corrupt'
+
+        # Too few index slots for the number of records
+        path.write_bytes(HEADER.pack(b'CCKS', 1, len(keystore), 128) + data[HEADER.size : index_offset] + bytes(512))
+        with pytest.raises(ValueError, match='corrupt'):
+            KeyStore(path)
+
+        # An index without any empty slot
+        path.write_bytes(data[:index_offset] + INDEX_ENTRY.pack(1) * slots)
+        with KeyStore(path) as corrupt:
+            assert corrupt.find(samples['PUBLIC_KEY_COMPRESSED']) == 0
+            assert corrupt.find(PrivateKey().public_key.format()) is None
+
+        # An index entry past the last record
+        path.write_bytes(data[:index_offset] + INDEX_ENTRY.pack(len(keystore) + 1) * slots)
+        with KeyStore(path) as corrupt, pytest.raises(ValueError, match='index is corrupt'):
+            corrupt.find(samples['PUBLIC_KEY_COMPRESSED'])
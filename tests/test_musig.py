@@ -0,0 +1,154 @@
+from os import urandom
+
+import pytest
+
+from coincurve._libsecp256k1 import lib
+from coincurve.keys import PrivateKey, PublicKeyXOnly
+from coincurve.musig import KeyAggregation, SecretNonce, Session, aggregate_nonces
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(lib, 'secp256k1_musig_pubkey_agg'), reason='libsecp256k1 was built without the musig module'
+)
+
+
+@pytest.fixture
+def signers():
+    return [PrivateKey() for _ in range(3)]
+
+
+def sign(key_aggregation, signers, message, nonces=None):
+    nonces = nonces or [SecretNonce.generate(signer) for signer in signers]
+    session = Session(key_aggregation, aggregate_nonces([nonce.public_nonce for nonce in nonces]), message)
+    partial_signatures = [session.sign(signer, nonce) for signer, nonce in zip(signers, nonces)]
+
+    for signer, nonce, partial_signature in zip(signers, nonces, partial_signatures):
+        assert session.verify(partial_signature, nonce.public_nonce, signer.public_key)
+
+    return session, partial_signatures, session.aggregate(partial_signatures)
+
+
+class TestMuSig:
+    def test_sign(self, signers):
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+        message = urandom(32)
+
+        _, _, signature = sign(key_aggregation, signers, message)
+        assert key_aggregation.public_key_xonly.verify(signature, message)
+
+        # The aggregate is an ordinary BIP340 public key
+        xonly = PublicKeyXOnly(key_aggregation.public_key_xonly.format())
+        assert xonly.verify(signature, message)
+        assert not xonly.verify(signature, urandom(32))
+
+    def test_reuse_key_aggregation(self, signers):
+        key_aggregation = KeyAggregation([signer.public_key.format() for signer in signers])
+        for _ in range(3):
+            message = urandom(32)
+            _, _, signature = sign(key_aggregation, signers, message)
+            assert key_aggregation.public_key_xonly.verify(signature, message)
+
+    def test_pregenerated_nonces(self, signers):
+        nonces = [[SecretNonce.generate(signer) for signer in signers] for _ in range(2)]
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+
+        for batch in reversed(nonces):
+            message = urandom(32)
+            _, _, signature = sign(key_aggregation, signers, message, batch)
+            assert key_aggregation.public_key_xonly.verify(signature, message)
+            assert all(nonce.used for nonce in batch)
+
+    def test_nonce_inputs(self, signers):
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+        message = urandom(32)
+        nonces = [
+            SecretNonce.generate(signer, message=message, key_aggregation=key_aggregation, extra_input=bytes(32))
+            for signer in signers
+        ]
+
+        _, _, signature = sign(key_aggregation, signers, message, nonces)
+        assert key_aggregation.public_key_xonly.verify(signature, message)
+
+        with pytest.raises(ValueError):
+            SecretNonce.generate(signers[0], message=bytes(31))
+
+        with pytest.raises(ValueError):
+            SecretNonce.generate(signers[0], extra_input=bytes(33))
+
+    def test_nonce_single_use(self, signers):
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+        nonces = [SecretNonce.generate(signer) for signer in signers]
+        session = Session(key_aggregation, aggregate_nonces([nonce.public_nonce for nonce in nonces]), urandom(32))
+
+        with pytest.raises(ValueError, match='another key'):
+            session.sign(signers[1], nonces[0])
+        assert not nonces[0].used
+
+        session.sign(signers[0], nonces[0])
+        with pytest.raises(ValueError, match='already used'):
+            session.sign(signers[0], nonces[0])
+
+    def test_invalid_partial_signature(self, signers):
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+        message = urandom(32)
+        session, partial_signatures, _ = sign(key_aggregation, signers, message)
+        nonces = [SecretNonce.generate(signer) for signer in signers]
+
+        # A partial signature from another session
+        _, other, _ = sign(key_aggregation, signers, message, nonces)
+        assert not session.verify(other[0], nonces[0].public_nonce, signers[0].public_key)
+
+        signature = session.aggregate([other[0], *partial_signatures[1:]])
+        assert not key_aggregation.public_key_xonly.verify(signature, message)
+
+        with pytest.raises(ValueError):
+            session.aggregate([])
+
+        with pytest.raises(ValueError):
+            session.aggregate([b'\xff' * 32])
+
+        with pytest.raises(ValueError):
+            session.verify(partial_signatures[0], bytes(66), signers[0].public_key)
+
+    def test_sort(self, signers):
+        public_keys = [signer.public_key.format() for signer in signers]
+        ordered = KeyAggregation(sorted(public_keys))
+        assert KeyAggregation(public_keys[::-1], sort=True).public_key == ordered.public_key
+        assert KeyAggregation(public_keys[::-1], sort=True).public_keys == ordered.public_keys
+
+    def test_tweak(self, signers):
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+        tweak = urandom(32)
+
+        tweaked = key_aggregation.tweak_add(tweak)
+        assert tweaked.public_key == key_aggregation.public_key.add(tweak)
+        assert key_aggregation.public_key != tweaked.public_key
+
+        taproot = key_aggregation.tweak_add(tweak, xonly=True)
+        for aggregate in (tweaked, taproot):
+            message = urandom(32)
+            _, _, signature = sign(aggregate, signers, message)
+            assert aggregate.public_key_xonly.verify(signature, message)
+
+        with pytest.raises(ValueError):
+            key_aggregation.tweak_add(bytes(31))
+
+    def test_invalid(self, signers):
+        with pytest.raises(ValueError):
+            KeyAggregation([])
+
+        with pytest.raises(ValueError, match='index 1'):
+            KeyAggregation([signers[0].public_key.format(), b'\x02' + bytes(32)])
+
+        with pytest.raises(ValueError):
+            aggregate_nonces([])
+
+        with pytest.raises(ValueError):
+            aggregate_nonces([bytes(65)])
+
+        key_aggregation = KeyAggregation([signer.public_key for signer in signers])
+        nonce = SecretNonce.generate(signers[0])
+        with pytest.raises(ValueError):
+            Session(key_aggregation, aggregate_nonces([nonce.public_nonce]), bytes(31))
+
+        with pytest.raises(ValueError):
+            Session(key_aggregation, b'\x05' * 66, bytes(32))
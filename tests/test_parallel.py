@@ -0,0 +1,187 @@
+import os
+from hashlib import sha256
+from multiprocessing import shared_memory
+from os import urandom
+
+import pytest
+
+from coincurve.context import GLOBAL_CONTEXT, Context
+from coincurve.ecdsa import Signature
+from coincurve.keys import PrivateKey
+from coincurve.parallel import ParallelEngine, ProcessEngine
+from coincurve.utils import verify_signature
+
+
+@pytest.fixture(scope='module')
+def engine():
+    with ParallelEngine(workers=4, chunk_size=3) as engine:
+        yield engine
+
+
+def test_clone_context(samples):
+    context = GLOBAL_CONTEXT.clone(name='clone')
+    assert context.ctx != GLOBAL_CONTEXT.ctx
+    assert repr(context) == 'clone'
+    assert PrivateKey(samples['PRIVATE_KEY_BYTES'], context).sign(samples['MESSAGE']) == samples['SIGNATURE']
+
+
+def test_worker_contexts_reseeded(samples, monkeypatch):
+    reseeded = []
+    reseed = Context.reseed
+
+    def spy(self, seed=None):
+        reseeded.append(self)
+        reseed(self, seed)
+
+    monkeypatch.setattr(Context, 'reseed', spy)
+    with ParallelEngine(workers=2, chunk_size=1) as engine:
+        engine.sign([samples['PRIVATE_KEY_BYTES']] * 8, [samples['MESSAGE']] * 8)
+        workers = {id(context) for context in reseeded}
+
+    assert reseeded
+    assert all(repr(context) == 'worker' for context in reseeded)
+    assert len(workers) == len(reseeded)
+
+
+def test_verify(engine, samples):
+    signatures = [samples['SIGNATURE']] * 10
+    messages = [samples['MESSAGE']] * 10
+    public_keys = [samples['PUBLIC_KEY_COMPRESSED']] * 10
+    messages[4] = b'wrong'
+    signatures[7] = b'\x00'
+
+    results, failed = engine.verify(signatures, messages, public_keys)
+
+    assert results == [True] * 4 + [False] + [True] * 2 + [False] + [True] * 2
+    assert failed == [7]
+
+
+def test_sign(engine):
+    private_keys = [PrivateKey() for _ in range(10)]
+    messages = [urandom(50) for _ in range(10)]
+
+    signatures = engine.sign(private_keys, messages)
+
+    assert signatures == [pk.sign(msg) for pk, msg in zip(private_keys, messages)]
+    assert engine.sign([pk.secret for pk in private_keys], messages) == signatures
+    assert (
+        engine.sign([bytearray(pk.secret) for pk in private_keys], [memoryview(msg) for msg in messages]) == signatures
+    )
+    assert engine.sign(private_keys, [memoryview(sha256(msg).digest()) for msg in messages], hasher=None) == signatures
+    for private_key, message, signature in zip(private_keys, messages, signatures):
+        assert verify_signature(signature, message, private_key.public_key.format())
+
+
+def test_recover(engine):
+    private_keys = [PrivateKey() for _ in range(10)]
+    messages = [urandom(50) for _ in range(10)]
+    signatures = [pk.sign_recoverable(msg) for pk, msg in zip(private_keys, messages)]
+
+    public_keys = engine.recover(signatures, messages)
+
+    assert [pk.format() for pk in public_keys] == [pk.public_key.format() for pk in private_keys]
+
+
+def test_ecdh(engine):
+    a = [PrivateKey() for _ in range(10)]
+    b = [PrivateKey() for _ in range(10)]
+
+    shared = engine.ecdh(a, [pk.public_key.format() for pk in b])
+
+    assert shared == engine.ecdh(b, [pk.public_key for pk in a])
+    assert shared == [x.ecdh(y.public_key.format()) for x, y in zip(a, b)]
+
+
+def test_length_mismatch(engine):
+    with pytest.raises(ValueError):
+        engine.sign([PrivateKey()], [])
+
+
+@pytest.fixture(scope='module')
+def process_engine():
+    with ProcessEngine(workers=2, chunk_size=3) as engine:
+        yield engine
+
+
+class TestProcessEngine:
+    def test_verify(self, process_engine, samples):
+        signatures = [samples['SIGNATURE']] * 10
+        messages = [samples['MESSAGE']] * 10
+        public_keys = [samples['PUBLIC_KEY_COMPRESSED']] * 5 + [samples['PUBLIC_KEY_UNCOMPRESSED']] * 5
+        messages[4] = b'wrong'
+        signatures[6] = Signature(samples['SIGNATURE'])
+        signatures[7] = b'\x00'
+        public_keys[8] = bytes(100)
+
+        results, failed = process_engine.verify(signatures, messages, public_keys)
+
+        assert results == [True] * 4 + [False] + [True] * 2 + [False] * 2 + [True]
+        assert failed == [7, 8]
+
+    def test_sign(self, process_engine):
+        private_keys = [PrivateKey() for _ in range(10)]
+        messages = [urandom(50) for _ in range(10)]
+
+        signatures = process_engine.sign(private_keys, messages)
+
+        assert signatures == [pk.sign(msg) for pk, msg in zip(private_keys, messages)]
+
+    def test_sign_failure_clears_secrets(self, process_engine, monkeypatch):
+        snapshots = []
+
+        class SharedMemory(shared_memory.SharedMemory):
+            def close(self):
+                if self.buf is not None:
+                    snapshots.append(bytes(self.buf))
+                super().close()
+
+        def fail(*args):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(shared_memory, 'SharedMemory', SharedMemory)
+        monkeypatch.setattr(process_engine, '_run', fail)
+
+        private_keys = [PrivateKey() for _ in range(3)]
+        with pytest.raises(KeyboardInterrupt):
+            process_engine.sign(private_keys, [urandom(50) for _ in range(3)])
+
+        assert len(snapshots) == 1
+        assert all(pk.secret not in snapshots[0] for pk in private_keys)
+
+    def test_recover(self, process_engine):
+        private_keys = [PrivateKey() for _ in range(10)]
+        messages = [urandom(50) for _ in range(10)]
+        signatures = [pk.sign_recoverable(msg) for pk, msg in zip(private_keys, messages)]
+
+        public_keys = process_engine.recover(signatures, messages)
+
+        assert [pk.format() for pk in public_keys] == [pk.public_key.format() for pk in private_keys]
+
+        signatures[3] = signatures[3][:64] + b'\x04'
+        with pytest.raises(ValueError):
+            process_engine.recover(signatures, messages)
+
+    def test_empty(self, process_engine):
+        assert process_engine.verify([], [], []) == ([], [])
+        assert process_engine.sign([], []) == []
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+def test_reseed_after_fork(samples):
+    parent_lock = GLOBAL_CONTEXT._lock
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if not pid:  # no cov
+        os.close(read_end)
+        reseeded = GLOBAL_CONTEXT._lock is not parent_lock
+        signature = PrivateKey(samples['PRIVATE_KEY_BYTES']).sign(samples['MESSAGE'])
+        os.write(write_end, bytes([reseeded]) + signature)
+        os._exit(0)
+
+    os.close(write_end)
+    with os.fdopen(read_end, 'rb') as f:
+        output = f.read()
+    os.waitpid(pid, 0)
+
+    assert output[0] == 1
+    assert output[1:] == samples['SIGNATURE']
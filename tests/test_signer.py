@@ -0,0 +1,74 @@
+from os import urandom
+from unittest import mock
+
+import pytest
+
+from coincurve.keys import PrivateKey
+from coincurve.signer import Signer
+from coincurve.utils import GROUP_ORDER
+
+
+class TestSigner:
+    def test_sign(self, samples):
+        signer = Signer(samples['PRIVATE_KEY_BYTES'])
+        assert signer.sign(samples['MESSAGE']) == samples['SIGNATURE']
+        assert signer.sign(samples['MESSAGE']) == samples['SIGNATURE']
+
+    def test_sign_recoverable(self, samples):
+        private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
+        assert Signer(private_key).sign_recoverable(samples['MESSAGE']) == private_key.sign_recoverable(
+            samples['MESSAGE']
+        )
+
+    def test_sign_schnorr(self):
+        private_key = PrivateKey()
+        signer = Signer(private_key)
+        message = urandom(32)
+
+        assert private_key.public_key_xonly.verify(signer.sign_schnorr(message), message)
+
+        with pytest.raises(ValueError):
+            signer.sign_schnorr(message + b'\x01')
+
+    def test_buffer_inputs(self, samples):
+        private_key = PrivateKey(samples['PRIVATE_KEY_BYTES'])
+        signer = Signer(private_key, aux_randomness=False)
+        message = urandom(32)
+
+        assert signer.sign(memoryview(message), hasher=None) == private_key.sign(message, hasher=None)
+        assert signer.sign(bytearray(samples['MESSAGE'])) == samples['SIGNATURE']
+        assert signer.sign_recoverable(bytearray(message), hasher=None) == private_key.sign_recoverable(
+            message, hasher=None
+        )
+        assert signer.sign_schnorr(memoryview(message)) == private_key.sign_schnorr(message, None)
+
+    def test_sign_schnorr_without_aux_randomness(self):
+        private_key = PrivateKey()
+        signer = Signer(private_key, aux_randomness=False)
+        message = urandom(32)
+
+        assert signer.sign_schnorr(message) == private_key.sign_schnorr(message, None)
+
+    def test_verify_rate(self):
+        signer = Signer(PrivateKey(), verify_rate=0.5)
+
+        with mock.patch('coincurve.signer.random', return_value=0.9):
+            assert not signer._should_verify()
+        with mock.patch('coincurve.signer.random', return_value=0.1):
+            assert signer._should_verify()
+
+        signer.verify_rate = 0
+        assert not signer._should_verify()
+        signer.verify_rate = 1
+        assert signer._should_verify()
+
+    def test_invalid_hasher(self, samples):
+        with pytest.raises(ValueError):
+            Signer(samples['PRIVATE_KEY_BYTES']).sign(samples['MESSAGE'], hasher=None)
+
+        with pytest.raises(ValueError):
+            Signer(samples['PRIVATE_KEY_BYTES']).sign_recoverable(samples['MESSAGE'], hasher=None)
+
+    def test_invalid_secret(self):
+        with pytest.raises(ValueError):
+            Signer(GROUP_ORDER)
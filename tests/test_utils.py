@@ -1,20 +1,38 @@
+from hashlib import sha256 as _sha256
 from os import urandom
 
 import pytest
 
+from coincurve._libsecp256k1 import ffi
+from coincurve.keys import PrivateKey, PublicKey, PublicKeyArray
 from coincurve.utils import (
     GROUP_ORDER,
+    GROUP_ORDER_INT,
     ZERO,
+    _linear_combination_pippenger,
+    _linear_combination_terms,
     bytes_to_int,
     chunk_data,
+    convert_public_keys,
     der_to_pem,
     get_valid_secret,
+    get_valid_secrets,
+    hash_many,
     int_to_bytes,
     int_to_bytes_padded,
+    iter_pem_blocks,
+    linear_combination,
     pad_scalar,
     pem_to_der,
+    recover_many,
+    sha256,
+    sha256d,
+    tagged_hasher,
+    tagged_sha256,
     validate_secret,
+    validate_secrets,
     verify_signature,
+    verify_signatures_batch,
 )
 
 
@@ -35,6 +53,27 @@ def test_get_valid_secret():
     assert len(secret) == 32 and ZERO < secret < GROUP_ORDER
 
 
+def test_get_valid_secrets():
+    secrets = get_valid_secrets(100)
+    assert len(secrets) == 3200
+    assert len(set(chunk_data(secrets, 32))) == 100
+    assert validate_secrets(secrets) == []
+
+    assert get_valid_secrets(0) == b''
+
+
+def test_validate_secrets():
+    secrets = bytearray(get_valid_secrets(5))
+    secrets[32:64] = ZERO * 32
+    secrets[128:160] = GROUP_ORDER
+
+    assert validate_secrets(secrets) == [1, 4]
+    assert validate_secrets(memoryview(secrets)[:32]) == []
+
+    with pytest.raises(ValueError):
+        validate_secrets(secrets[:-1])
+
+
 class TestValidateSecret:
     def test_valid(self):
         secret = validate_secret(b'\x01')
@@ -77,6 +116,64 @@ def test_verify_signature(samples):
     assert verify_signature(samples['SIGNATURE'], samples['MESSAGE'], samples['PUBLIC_KEY_UNCOMPRESSED'])
 
 
+class TestVerifySignaturesBatch:
+    def test_valid(self, samples):
+        results, failed = verify_signatures_batch(
+            [samples['SIGNATURE']] * 2,
+            [samples['MESSAGE']] * 2,
+            [samples['PUBLIC_KEY_COMPRESSED'], samples['PUBLIC_KEY_UNCOMPRESSED']],
+        )
+        assert results == [True, True]
+        assert failed == []
+
+    def test_invalid_and_unparsable(self, samples):
+        results, failed = verify_signatures_batch(
+            [samples['SIGNATURE'], samples['SIGNATURE'], b'\x00', samples['SIGNATURE']],
+            [samples['MESSAGE'], b'wrong', samples['MESSAGE'], samples['MESSAGE']],
+            [samples['PUBLIC_KEY_COMPRESSED']] * 3 + [b'\x02'],
+        )
+        assert results == [True, False, False, False]
+        assert failed == [2, 3]
+
+    def test_packed(self, samples):
+        msg_hash = sha256(samples['MESSAGE'])
+        results, failed = verify_signatures_batch(
+            [samples['SIGNATURE']] * 3, msg_hash * 3, samples['PUBLIC_KEY_COMPRESSED'] * 3, hasher=None
+        )
+        assert results == [True, True, True]
+        assert failed == []
+
+    def test_buffer_inputs(self, samples):
+        msg_hash = sha256(samples['MESSAGE'])
+        results, failed = verify_signatures_batch(
+            [bytearray(samples['SIGNATURE']), memoryview(samples['SIGNATURE'])],
+            [memoryview(msg_hash), bytearray(msg_hash)],
+            [bytearray(samples['PUBLIC_KEY_COMPRESSED'])] * 2,
+            hasher=None,
+        )
+        assert results == [True, True]
+        assert failed == []
+
+    def test_empty(self):
+        assert verify_signatures_batch([], [], []) == ([], [])
+        assert verify_signatures_batch([], b'', b'', hasher=None) == ([], [])
+        assert verify_signatures_batch([], [], b'') == ([], [])
+
+    def test_length_mismatch(self, samples):
+        with pytest.raises(ValueError):
+            verify_signatures_batch([samples['SIGNATURE']], [], [samples['PUBLIC_KEY_COMPRESSED']])
+
+        with pytest.raises(ValueError):
+            verify_signatures_batch([], [], samples['PUBLIC_KEY_COMPRESSED'])
+
+        with pytest.raises(ValueError):
+            verify_signatures_batch([samples['SIGNATURE']], [samples['MESSAGE']], samples['PUBLIC_KEY_COMPRESSED'][:-1])
+
+    def test_invalid_hasher(self, samples):
+        with pytest.raises(ValueError):
+            verify_signatures_batch([samples['SIGNATURE']], [b'short'], [samples['PUBLIC_KEY_COMPRESSED']], hasher=None)
+
+
 def test_chunk_data():
     assert list(chunk_data('4fadd1977328c11efc1c1d8a781aa6b9677984d3e0b', 2)) == [
         '4f',
@@ -106,3 +203,188 @@ def test_chunk_data():
 
 if __name__ == '__main__':
     pytest.main(['-v', __file__])
+
+
+class TestConvertPublicKeys:
+    def test_roundtrip(self):
+        secrets, compressed = PrivateKey.generate_many(10, public_keys=True)
+        uncompressed = b''.join(
+            PrivateKey(secret).public_key.format(compressed=False) for secret in chunk_data(secrets, 32)
+        )
+        xonly = b''.join(key[1:] for key in chunk_data(compressed, 33))
+
+        assert convert_public_keys(compressed, 33, 65) == (uncompressed, [])
+        assert convert_public_keys(uncompressed, 65, 33) == (compressed, [])
+        assert convert_public_keys(memoryview(compressed), 33, 32) == (xonly, [])
+
+        even = b''.join(b'\x02' + key for key in chunk_data(xonly, 32))
+        assert convert_public_keys(bytearray(xonly), 32, 33) == (even, [])
+        assert convert_public_keys(xonly, 32, 32) == (xonly, [])
+
+    def test_invalid_keys(self, samples):
+        data = samples['PUBLIC_KEY_COMPRESSED'] + b'\x02' + bytes(32) + b'\x05' * 33 + samples['PUBLIC_KEY_COMPRESSED']
+        converted, invalid = convert_public_keys(data, 33, 65)
+
+        assert invalid == [1, 2]
+        assert converted == samples['PUBLIC_KEY_UNCOMPRESSED'] + bytes(130) + samples['PUBLIC_KEY_UNCOMPRESSED']
+
+    def test_invalid_lengths(self, samples):
+        with pytest.raises(ValueError):
+            convert_public_keys(samples['PUBLIC_KEY_COMPRESSED'], 34, 65)
+
+        with pytest.raises(ValueError):
+            convert_public_keys(samples['PUBLIC_KEY_COMPRESSED'], 33, 64)
+
+        with pytest.raises(ValueError):
+            convert_public_keys(samples['PUBLIC_KEY_COMPRESSED'], 65, 33)
+
+
+class TestLinearCombination:
+    @staticmethod
+    def compute(method, scalars, public_keys):
+        public_key = PublicKey.__new__(PublicKey)
+        public_key.public_key = ffi.new('secp256k1_pubkey *')
+        public_key.context = public_keys.context
+        valid = method(public_key.public_key, b''.join(scalars), public_keys._public_keys, public_keys.context)
+        return public_key if valid else None
+
+    def test_methods_agree(self):
+        secrets = [bytes_to_int(PrivateKey().secret) for _ in range(40)]
+        # Repeated and negated points, small and large digits, and a zero scalar
+        secrets += [secrets[0], GROUP_ORDER_INT - secrets[1]]
+        public_keys = PublicKeyArray([PublicKey.from_secret(int_to_bytes_padded(secret)) for secret in secrets])
+        scalars = [urandom(31).rjust(32, b'\x00') for _ in range(len(secrets))]
+        scalars[3] = bytes(32)
+        scalars[4] = int_to_bytes_padded(GROUP_ORDER_INT - 1)
+        scalars[5] = int_to_bytes_padded(1)
+
+        expected_secret = sum(a * bytes_to_int(k) for a, k in zip(secrets, scalars)) % GROUP_ORDER_INT
+        expected = PublicKey.from_secret(int_to_bytes_padded(expected_secret))
+
+        assert self.compute(_linear_combination_terms, scalars, public_keys) == expected
+        assert self.compute(_linear_combination_pippenger, scalars, public_keys) == expected
+
+    def test_infinity(self):
+        secret = bytes_to_int(PrivateKey().secret)
+        public_keys = PublicKeyArray(
+            [
+                PublicKey.from_secret(int_to_bytes_padded(secret)),
+                PublicKey.from_secret(int_to_bytes_padded(secret * 2 % GROUP_ORDER_INT)),
+            ]
+        )
+        # 2 * P - 1 * (2P) cancels out, within a single window bucket as well as across windows
+        for scalars in (
+            [int_to_bytes_padded(2), int_to_bytes_padded(GROUP_ORDER_INT - 1)],
+            [int_to_bytes_padded(2 << 200), int_to_bytes_padded(GROUP_ORDER_INT - (1 << 200))],
+        ):
+            assert self.compute(_linear_combination_terms, scalars, public_keys) is None
+            assert self.compute(_linear_combination_pippenger, scalars, public_keys) is None
+
+        assert self.compute(_linear_combination_pippenger, [bytes(32)] * 2, public_keys) is None
+
+    def test_invalid_scalars(self):
+        public_keys = PublicKeyArray([PrivateKey().public_key for _ in range(2)])
+
+        with pytest.raises(ValueError, match='2 concatenated'):
+            self.compute(linear_combination, [int_to_bytes_padded(1)], public_keys)
+
+        # Rejected rather than dropped from the sum or reduced modulo the group order
+        for scalar in (GROUP_ORDER, b'\xff' * 32):
+            with pytest.raises(ValueError, match='index 1'):
+                self.compute(linear_combination, [int_to_bytes_padded(1), scalar], public_keys)
+
+
+class TestRecoverMany:
+    def test_recover(self):
+        private_keys = [PrivateKey() for _ in range(5)]
+        messages = [urandom(20) for _ in range(5)]
+        signatures = b''.join(pk.sign_recoverable(m) for pk, m in zip(private_keys, messages))
+
+        public_keys, failed = recover_many(signatures, messages)
+        assert failed == []
+        assert public_keys == b''.join(pk.public_key.format() for pk in private_keys)
+
+        public_keys, failed = recover_many(memoryview(signatures), messages, output_length=65)
+        assert public_keys == b''.join(pk.public_key.format(compressed=False) for pk in private_keys)
+
+    def test_packed_message_hashes(self, samples):
+        signatures = samples['RECOVERABLE_SIGNATURE'] * 3
+        msg_hashes = sha256(samples['MESSAGE']) * 3
+
+        public_keys, failed = recover_many(signatures, msg_hashes, hasher=None, output_length=32)
+        assert failed == []
+        assert public_keys == samples['PUBLIC_KEY_COMPRESSED'][1:] * 3
+
+        with pytest.raises(ValueError):
+            recover_many(signatures, msg_hashes)
+
+        with pytest.raises(ValueError):
+            recover_many(signatures, msg_hashes[:-1], hasher=None)
+
+    def test_failures(self, samples):
+        signature = samples['RECOVERABLE_SIGNATURE']
+        signatures = signature + signature[:64] + b'\x04' + bytes(65) + signature
+
+        public_keys, failed = recover_many(signatures, [samples['MESSAGE']] * 4)
+        assert failed == [1, 2]
+        assert public_keys == samples['PUBLIC_KEY_COMPRESSED'] + bytes(66) + samples['PUBLIC_KEY_COMPRESSED']
+
+    def test_invalid_inputs(self, samples):
+        with pytest.raises(ValueError):
+            recover_many(samples['RECOVERABLE_SIGNATURE'][:-1], [samples['MESSAGE']])
+
+        with pytest.raises(ValueError):
+            recover_many(samples['RECOVERABLE_SIGNATURE'], [])
+
+        with pytest.raises(ValueError):
+            recover_many(samples['RECOVERABLE_SIGNATURE'], [samples['MESSAGE']], hasher=lambda m: m)
+
+
+class TestHashers:
+    def test_sha256d(self):
+        assert sha256d(b'foo') == _sha256(_sha256(b'foo').digest()).digest()
+
+    def test_tagged_sha256(self):
+        tag_hash = _sha256(b'BIP0340/challenge').digest()
+        expected = _sha256(tag_hash + tag_hash + b'foo').digest()
+
+        assert tagged_sha256(b'BIP0340/challenge', b'foo') == expected
+        assert tagged_sha256(bytearray(b'BIP0340/challenge'), memoryview(b'foo')) == expected
+        assert tagged_hasher(b'BIP0340/challenge')(b'foo') == expected
+
+    def test_tagged_hasher_is_reusable(self):
+        hasher = tagged_hasher(b'TapLeaf')
+        messages = [urandom(40) for _ in range(3)]
+
+        assert [hasher(message) for message in messages] == [tagged_sha256(b'TapLeaf', m) for m in messages]
+
+    def test_tagged_hasher_signing(self):
+        hasher = tagged_hasher(b'my-protocol/message')
+        private_key = PrivateKey()
+
+        signature = private_key.sign(b'foo', hasher=hasher)
+        assert private_key.public_key.verify(signature, b'foo', hasher=hasher)
+        assert not private_key.public_key.verify(signature, b'foo')
+
+    def test_hash_many(self, samples):
+        messages = [urandom(50) for _ in range(4)]
+
+        assert hash_many(messages) == b''.join(map(sha256, messages))
+        assert hash_many(messages, sha256d) == b''.join(map(sha256d, messages))
+        assert hash_many([]) == b''
+
+        msg_hashes = hash_many([samples['MESSAGE']] * 2)
+        signatures = [samples['SIGNATURE']] * 2
+        public_keys = [samples['PUBLIC_KEY_COMPRESSED']] * 2
+        assert verify_signatures_batch(signatures, msg_hashes, public_keys, hasher=None) == ([True, True], [])
+
+        with pytest.raises(ValueError):
+            hash_many(messages, hasher=lambda m: m)
+
+
+def test_iter_pem_blocks(samples):
+    other = b'-----BEGIN PUBLIC KEY-----\nAAAA\n-----END PUBLIC KEY-----\n'
+    stream = (other + samples['PRIVATE_KEY_PEM'] * 2).splitlines(keepends=True)
+
+    assert list(iter_pem_blocks(stream)) == [samples['PRIVATE_KEY_DER']] * 2
+    assert list(iter_pem_blocks(stream, b'PUBLIC KEY')) == [b'\x00\x00\x00']